@@ -0,0 +1,33 @@
+"""Benchmarks for the hot paths of the levelup server
+
+Run them from the project root as modules, e.g.
+
+    python -m benchmarks.report_grouping
+"""
+import os
+import tempfile
+from contextlib import contextmanager
+
+import django
+
+
+def setup_django():
+    """Configure Django so benchmarks can import the project's modules"""
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'levelup.settings')
+    django.setup()
+
+
+@contextmanager
+def temporary_database():
+    """Point the default database at a new, empty SQLite file for the
+    length of the block. Nothing is migrated yet.
+    """
+    from django.db import connection  # pylint: disable=import-outside-toplevel
+
+    with tempfile.TemporaryDirectory() as directory:
+        connection.close()
+        connection.settings_dict['NAME'] = os.path.join(directory, 'bench.sqlite3')
+        try:
+            yield connection
+        finally:
+            connection.close()
@@ -0,0 +1,73 @@
+"""Compare loading games with loaddata vs the streaming import command
+
+    python -m benchmarks.bulk_import [--games 100000]
+
+Writes the same games as a JSON fixture and as a CSV file, loads each
+into a throwaway, fully migrated SQLite database and reports the time
+taken and the peak Python memory traced while loading.
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks import setup_django, temporary_database
+
+setup_django()
+
+# pylint: disable=wrong-import-position
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from levelupapi.models import Game, Gamer, GameType
+
+
+def timed(label, count, func):
+    tracemalloc.start()
+    start = time.perf_counter()
+    func()
+    seconds = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"  {label:<24} {seconds:7.2f}s {count / seconds:10.0f} rows/s "
+          f"{peak / 2**20:8.1f} MiB peak")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--games', type=int, default=100_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory, temporary_database():
+        call_command('migrate', verbosity=0)
+        user = User.objects.create_user(username='bench', password='bench')
+        gamer = Gamer.objects.create(user=user, bio='')
+        game_type = GameType.objects.create(label='Board game')
+
+        fixture = os.path.join(directory, 'games.json')
+        with open(fixture, 'w', encoding='utf-8') as file:
+            json.dump([
+                {"model": "levelupapi.game", "fields": {
+                    "title": f"Game {i}", "maker": "Maker", "number_of_players": 4,
+                    "skill_level": 2, "game_type": game_type.id, "gamer": gamer.id,
+                }}
+                for i in range(args.games)
+            ], file)
+
+        csv_path = os.path.join(directory, 'games.csv')
+        with open(csv_path, 'w', encoding='utf-8') as file:
+            file.write('title,maker,number_of_players,skill_level,game_type_label,gamer_username\n')
+            for i in range(args.games):
+                file.write(f'Game {i},Maker,4,2,Board game,bench\n')
+
+        print(f'{args.games} games')
+        timed('loaddata', args.games,
+              lambda: call_command('loaddata', fixture, verbosity=0))
+        Game.objects.all().delete()
+        timed('import_levelup', args.games,
+              lambda: call_command('import_levelup', 'games', csv_path, stdout=open(os.devnull, 'w')))
+
+
+if __name__ == '__main__':
+    main()
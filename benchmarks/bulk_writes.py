@@ -0,0 +1,89 @@
+"""Compare creating and updating games one request at a time vs in bulk
+
+    python -m benchmarks.bulk_writes [--games 2000]
+
+Runs against a throwaway, fully migrated SQLite database through the
+API test client, so authentication, validation, serialization and the
+signal receivers are all included.
+"""
+import argparse
+import time
+
+from benchmarks import setup_django, temporary_database
+
+setup_django()
+
+# pylint: disable=wrong-import-position
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test.utils import setup_test_environment
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+from levelupapi.models import Game, Gamer, GameType
+
+
+def make_games(count, offset=0):
+    return [
+        {
+            "title": f"Game {offset + i}",
+            "maker": "Maker",
+            "skill_level": 3,
+            "number_of_players": 4,
+            "game_type": GameType.objects.first().id,
+        }
+        for i in range(count)
+    ]
+
+
+def timed(label, count, func):
+    start = time.perf_counter()
+    func()
+    seconds = time.perf_counter() - start
+    print(f"  {label:<32} {seconds:7.2f}s {count / seconds:10.0f} rows/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--games', type=int, default=2_000)
+    args = parser.parse_args()
+
+    setup_test_environment()
+    with temporary_database():
+        call_command('migrate', verbosity=0)
+        user = User.objects.create_user(username='bench', password='bench')
+        Gamer.objects.create(user=user, bio='')
+        GameType.objects.create(label='Board game')
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Token {Token.objects.create(user=user).key}")
+
+        def create_one_by_one():
+            for game in make_games(args.games):
+                client.post('/games', game, format='json')
+
+        def create_in_bulk():
+            client.post('/games/bulk', make_games(args.games, args.games), format='json')
+
+        def update_one_by_one():
+            for game in Game.objects.order_by('id')[:args.games]:
+                client.put(f'/games/{game.id}', {
+                    "title": f"{game.title} updated", "maker": game.maker,
+                    "skill_level": game.skill_level,
+                    "number_of_players": game.number_of_players,
+                    "game_type": game.game_type_id,
+                }, format='json')
+
+        def update_in_bulk():
+            ids = Game.objects.order_by('-id').values_list('id', flat=True)[:args.games]
+            client.patch('/games/bulk', [
+                {"id": pk, "title": f"Game {pk} updated"} for pk in ids
+            ], format='json')
+
+        print(f'{args.games} games')
+        timed('create, one request each', args.games, create_one_by_one)
+        timed('create, one bulk request', args.games, create_in_bulk)
+        timed('update, one request each', args.games, update_one_by_one)
+        timed('update, one bulk request', args.games, update_in_bulk)
+
+
+if __name__ == '__main__':
+    main()
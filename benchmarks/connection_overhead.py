@@ -0,0 +1,100 @@
+"""Compare per request database connection overhead with and without reuse
+
+    python -m benchmarks.connection_overhead [--requests 2000]
+
+Runs GET /games/<id> through the WSGI handler against a throwaway, fully
+migrated SQLite database, with the connection settings levelup.database
+builds from the environment: a new connection per request with Django's
+own backend, the same with the WAL pragmas, kept connections
+(CONN_MAX_AGE) and a shared pool.
+"""
+import argparse
+import io
+from sqlite3 import dbapi2
+import time
+from unittest import mock
+
+from benchmarks import setup_django, temporary_database
+
+setup_django()
+
+# pylint: disable=wrong-import-position
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.wsgi import get_wsgi_application
+from django.db import connections
+from rest_framework.authtoken.models import Token
+from levelup.database import database_from_env
+from levelupapi.models import Game, Gamer, GameType
+
+SETUPS = {
+    "new connection, Django's backend": {
+        'DATABASE_ENGINE': 'django.db.backends.sqlite3', 'DATABASE_CONN_MAX_AGE': '0'},
+    'new connection, WAL pragmas': {'DATABASE_CONN_MAX_AGE': '0'},
+    'kept connection': {'DATABASE_CONN_MAX_AGE': '60'},
+    'kept connection, health checks': {
+        'DATABASE_CONN_MAX_AGE': '60', 'DATABASE_HEALTH_CHECKS': '1'},
+    'pool of 4': {'DATABASE_POOL_SIZE': '4'},
+}
+
+
+def use_database(environ):
+    """Point the default connection at settings from environ"""
+    connections.close_all()
+    connections.settings['default'] = database_from_env(environ, settings.BASE_DIR)
+    del connections['default']
+
+
+def seed():
+    user = User.objects.create_user(username='bench', password='bench')
+    gamer = Gamer.objects.create(user=user, bio='')
+    game = Game.objects.create(
+        game_type=GameType.objects.create(label='Board game'), title='Monopoly',
+        maker='Hasbro', gamer=gamer, number_of_players=4, skill_level=2)
+    return Token.objects.create(user=user).key, game.id
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--requests', type=int, default=2_000)
+    args = parser.parse_args()
+
+    application = get_wsgi_application()
+
+    with temporary_database() as connection:
+        name = connection.settings_dict['NAME']
+        call_command('migrate', verbosity=0)
+        key, game_id = seed()
+
+        def request():
+            environ = {
+                'REQUEST_METHOD': 'GET', 'PATH_INFO': f'/games/{game_id}', 'QUERY_STRING': '',
+                'SERVER_NAME': 'localhost', 'SERVER_PORT': '80', 'SERVER_PROTOCOL': 'HTTP/1.1',
+                'HTTP_AUTHORIZATION': f'Token {key}',
+                'wsgi.input': io.BytesIO(), 'wsgi.url_scheme': 'http',
+            }
+            statuses = []
+            body = application(environ, lambda status, headers: statuses.append(status))
+            b''.join(body)
+            body.close()
+            assert statuses[0].startswith('200'), statuses[0]
+
+        print(f'{args.requests} requests to GET /games/{game_id}')
+        for label, environ in SETUPS.items():
+            use_database({'DATABASE_NAME': name, **environ})
+            request()
+            # Counts the SQLite connections really opened, which
+            # connection_created can't: it is sent for pooled ones too
+            with mock.patch('sqlite3.dbapi2.connect', wraps=dbapi2.connect) as connect:
+                start = time.perf_counter()
+                for _ in range(args.requests):
+                    request()
+                mean = (time.perf_counter() - start) / args.requests
+            print(f"  {label:<34} {mean * 1e6:8.0f}us per request"
+                  f"  {connect.call_count:6} connections opened")
+        connections.close_all()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,113 @@
+"""Compare the JSON renderers on large /events responses
+
+    python -m benchmarks.json_rendering [--events 2000] [--attendees 5]
+
+Seeds a throwaway, fully migrated SQLite database and times GET /events
+end to end through the API test client with DRF's JSONRenderer, with
+FastJSONRenderer on orjson and with FastJSONRenderer falling back to the
+standard library. It also times rendering the same data on its own.
+"""
+import argparse
+import gc
+import time
+from unittest import mock
+
+from benchmarks import setup_django, temporary_database
+
+setup_django()
+
+# pylint: disable=wrong-import-position
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import override_settings
+from django.test.utils import setup_test_environment
+from rest_framework.authtoken.models import Token
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+from rest_framework.views import APIView
+from levelupapi import fastjson
+from levelupapi.models import Event, EventGamer, Game, Gamer, GameType
+
+# DRF's defaults. Views read their renderers when APIView is defined, so
+# those are patched on the class rather than through the settings.
+DRF_SETTINGS = {
+    **settings.REST_FRAMEWORK,
+    'DATE_FORMAT': 'iso-8601',
+    'TIME_FORMAT': 'iso-8601',
+}
+
+
+def seed(sizes):
+    users = User.objects.bulk_create([
+        User(username=f'gamer{i}', password='', first_name='First', last_name='Last')
+        for i in range(sizes.attendees)
+    ])
+    gamers = Gamer.objects.bulk_create([Gamer(user=user, bio='Likes games') for user in users])
+    game = Game.objects.create(
+        game_type=GameType.objects.create(label='Board game'), title='Monopoly',
+        maker='Hasbro', gamer=gamers[0], number_of_players=4, skill_level=2)
+    events = Event.objects.bulk_create([
+        Event(game=game, description=f"Let's play some classic Monopoly, round {i}",
+              organizer=gamers[0])
+        for i in range(sizes.events)
+    ])
+    EventGamer.objects.bulk_create([
+        EventGamer(event=event, gamer=gamer) for event in events for gamer in gamers
+    ])
+    return Token.objects.create(user=users[0])
+
+
+def timed(label, runs, func):
+    """Print the fastest and median of runs calls to func"""
+    func()
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    times.sort()
+    print(f"  {label:<36} {times[0] * 1000:8.1f}ms fastest {times[len(times) // 2] * 1000:8.1f}ms median")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--events', type=int, default=2_000)
+    parser.add_argument('--attendees', type=int, default=5)
+    parser.add_argument('--runs', type=int, default=10)
+    sizes = parser.parse_args()
+
+    # Collections during a run would swamp the difference in rendering time
+    gc.disable()
+    setup_test_environment()
+    with temporary_database():
+        call_command('migrate', verbosity=0)
+        token = seed(sizes)
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+
+        def get_events():
+            response = client.get('/events')
+            assert response.status_code == 200, response.status_code
+            return response
+
+        print(f'GET /events, {sizes.events} events with {sizes.attendees} attendees each')
+        with override_settings(REST_FRAMEWORK=DRF_SETTINGS), \
+                mock.patch.object(APIView, 'renderer_classes', [JSONRenderer]):
+            timed('JSONRenderer', sizes.runs, get_events)
+            drf_data = get_events().data
+        if fastjson.orjson is not None:
+            timed('FastJSONRenderer, orjson', sizes.runs, get_events)
+        with mock.patch.object(fastjson, 'orjson', None):
+            timed('FastJSONRenderer, standard library', sizes.runs, get_events)
+        data = get_events().data
+
+        print('Rendering the response data only')
+        timed('JSONRenderer', sizes.runs, lambda: JSONRenderer().render(drf_data))
+        if fastjson.orjson is not None:
+            timed('FastJSONRenderer, orjson', sizes.runs,
+                  lambda: fastjson.FastJSONRenderer().render(data))
+
+
+if __name__ == '__main__':
+    main()
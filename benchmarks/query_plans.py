@@ -0,0 +1,125 @@
+"""Compare query plans and timings before and after the 0004_indexes migration
+
+    python -m benchmarks.query_plans [--events 100000] [--signups 500000]
+
+Builds a throwaway SQLite database migrated up to levelupapi 0003, seeds
+it, and runs the hot lookups of the API: the `joined` check, the events
+a gamer joined and the paginated ?game= / ?type= filters. It then
+applies the remaining migrations and runs them again on the same rows.
+"""
+import argparse
+import random
+import time
+
+from benchmarks import setup_django, temporary_database
+
+setup_django()
+
+# pylint: disable=wrong-import-position
+from django.core.management import call_command
+from django.db import connection, transaction
+
+QUERIES = {
+    'joined check': (
+        "SELECT EXISTS(SELECT 1 FROM levelupapi_eventgamer"
+        " WHERE event_id = %s AND gamer_id = %s)",
+        lambda sizes: (random.randint(1, sizes.events), random.randint(1, sizes.gamers)),
+    ),
+    'events a gamer joined': (
+        "SELECT event_id FROM levelupapi_eventgamer WHERE gamer_id = %s",
+        lambda sizes: (random.randint(1, sizes.gamers),),
+    ),
+    'events of a game, next page': (
+        "SELECT id FROM levelupapi_event WHERE game_id = %s AND id > %s"
+        " ORDER BY id LIMIT 50",
+        lambda sizes: (random.randint(1, sizes.games), random.randint(1, sizes.events)),
+    ),
+    'games of a type, next page': (
+        "SELECT id FROM levelupapi_game WHERE game_type_id = %s AND id > %s"
+        " ORDER BY id LIMIT 50",
+        lambda sizes: (random.randint(1, sizes.game_types), random.randint(1, sizes.games)),
+    ),
+}
+
+
+def seed(db_cursor, sizes):
+    """Fill the tables with generated rows, straight through SQL"""
+    db_cursor.executemany(
+        "INSERT INTO auth_user (id, password, is_superuser, username, first_name,"
+        " last_name, email, is_staff, is_active, date_joined)"
+        " VALUES (%s, '', 0, %s, 'First', 'Last', '', 0, 1, '2022-05-01')",
+        [(i, f'gamer{i}') for i in range(1, sizes.gamers + 1)])
+    db_cursor.executemany(
+        "INSERT INTO levelupapi_gamer (id, user_id, bio) VALUES (%s, %s, '')",
+        [(i, i) for i in range(1, sizes.gamers + 1)])
+    db_cursor.executemany(
+        "INSERT INTO levelupapi_gametype (id, label) VALUES (%s, %s)",
+        [(i, f'Type {i}') for i in range(1, sizes.game_types + 1)])
+    db_cursor.executemany(
+        "INSERT INTO levelupapi_game (id, game_type_id, title, maker, gamer_id,"
+        " number_of_players, skill_level) VALUES (%s, %s, %s, 'Maker', %s, 4, 3)",
+        [(i, random.randint(1, sizes.game_types), f'Game {i}', random.randint(1, sizes.gamers))
+         for i in range(1, sizes.games + 1)])
+    db_cursor.executemany(
+        "INSERT INTO levelupapi_event (id, game_id, description, date, time, organizer_id)"
+        " VALUES (%s, %s, 'Event', '2022-05-01', '12:00', %s)",
+        [(i, random.randint(1, sizes.games), random.randint(1, sizes.gamers))
+         for i in range(1, sizes.events + 1)])
+    signups = set()
+    while len(signups) < sizes.signups:
+        signups.add((random.randint(1, sizes.events), random.randint(1, sizes.gamers)))
+    db_cursor.executemany(
+        "INSERT INTO levelupapi_eventgamer (event_id, gamer_id) VALUES (%s, %s)",
+        sorted(signups))
+
+
+def report(db_cursor, sizes, runs):
+    """Print the plan and mean time of each query"""
+    for name, (sql, make_params) in QUERIES.items():
+        db_cursor.execute(f"EXPLAIN QUERY PLAN {sql}", make_params(sizes))
+        plan = '; '.join(row[-1] for row in db_cursor.fetchall())
+
+        random.seed(name)
+        params = [make_params(sizes) for _ in range(runs)]
+        start = time.perf_counter()
+        for values in params:
+            db_cursor.execute(sql, values)
+            db_cursor.fetchall()
+        mean = (time.perf_counter() - start) / runs
+
+        print(f"  {name:<28} {mean * 1e6:9.1f}us  {plan}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--gamers', type=int, default=5_000)
+    parser.add_argument('--game-types', type=int, default=20)
+    parser.add_argument('--games', type=int, default=20_000)
+    parser.add_argument('--events', type=int, default=100_000)
+    parser.add_argument('--signups', type=int, default=500_000)
+    parser.add_argument('--runs', type=int, default=2_000)
+    sizes = parser.parse_args()
+
+    with temporary_database():
+        call_command('migrate', 'auth', verbosity=0)
+        call_command('migrate', 'levelupapi', '0003', verbosity=0)
+
+        random.seed(0)
+        with transaction.atomic(), connection.cursor() as db_cursor:
+            seed(db_cursor, sizes)
+
+        with connection.cursor() as db_cursor:
+            db_cursor.execute("ANALYZE")
+            print('Before 0004_indexes')
+            report(db_cursor, sizes, sizes.runs)
+
+        call_command('migrate', verbosity=0)
+
+        with connection.cursor() as db_cursor:
+            db_cursor.execute("ANALYZE")
+            print('After 0004_indexes')
+            report(db_cursor, sizes, sizes.runs)
+
+
+if __name__ == '__main__':
+    main()
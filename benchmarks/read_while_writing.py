@@ -0,0 +1,164 @@
+"""Measure how long reads of /events wait while events are being created
+
+    python -m benchmarks.read_while_writing [--seconds 5] [--readers 4] [--writers 2]
+
+Seeds a throwaway, fully migrated SQLite database, then drives the WSGI
+handler from worker processes, like a pre-forking WSGI server: readers GET /events
+while writers POST batches of new events to /events/bulk, for a few seconds per setup. The setups
+are SQLite's rollback journal with its default pragmas, WAL with the
+pragmas levelup.database sets, and that again with the read database
+from levelup.routers.
+"""
+import argparse
+import io
+import json
+import logging
+import multiprocessing
+import statistics
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from benchmarks import setup_django, temporary_database
+
+setup_django()
+
+# pylint: disable=wrong-import-position
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.wsgi import get_wsgi_application
+from django.db import connection, connections
+from rest_framework.authtoken.models import Token
+from levelup.database import databases_from_env
+from levelupapi.models import Event, Game, Gamer, GameType
+
+SETUPS = {
+    "Django's defaults: rollback journal, deferred transactions": {
+        'SQLITE_JOURNAL_MODE': 'DELETE', 'SQLITE_SYNCHRONOUS': 'FULL',
+        'SQLITE_CACHE_SIZE': '2000', 'SQLITE_MMAP_SIZE': '0',
+        'SQLITE_TRANSACTION_MODE': 'DEFERRED',
+    },
+    'WAL, tuned pragmas, deferred transactions': {'SQLITE_TRANSACTION_MODE': 'DEFERRED'},
+    'WAL, tuned pragmas': {},
+    'WAL, tuned pragmas, read database': {'DATABASE_READ_CONNECTION': '1'},
+}
+
+APPLICATION = get_wsgi_application()
+# Failed requests are counted, not logged
+logging.getLogger('django.request').setLevel(logging.CRITICAL)
+
+
+def use_databases(environ):
+    """Point default, and read when environ has it, at settings from environ"""
+    connections.close_all()
+    connections.settings.pop('read', None)
+    connections.settings.update(databases_from_env(environ, settings.BASE_DIR))
+    del connections['default']
+    # Switching the journal mode needs the only connection to the file
+    connection.ensure_connection()
+    connection.close()
+
+
+def seed(events):
+    user = User.objects.create_user(username='bench', password='bench')
+    gamer = Gamer.objects.create(user=user, bio='')
+    game = Game.objects.create(
+        game_type=GameType.objects.create(label='Board game'), title='Monopoly',
+        maker='Hasbro', gamer=gamer, number_of_players=4, skill_level=2)
+    Event.objects.bulk_create([
+        Event(game=game, description=f'Event {i}', organizer=gamer) for i in range(events)
+    ])
+    return Token.objects.create(user=user).key, gamer.id, game.id
+
+
+def request(method, path, key, query='', data=b''):
+    environ = {
+        'REQUEST_METHOD': method, 'PATH_INFO': path, 'QUERY_STRING': query,
+        'SERVER_NAME': 'localhost', 'SERVER_PORT': '80', 'SERVER_PROTOCOL': 'HTTP/1.1',
+        'HTTP_AUTHORIZATION': f'Token {key}', 'CONTENT_TYPE': 'application/json',
+        'CONTENT_LENGTH': str(len(data)),
+        'wsgi.input': io.BytesIO(data), 'wsgi.url_scheme': 'http',
+    }
+    statuses = []
+    response = APPLICATION(environ, lambda status, headers: statuses.append(status))
+    b''.join(response)
+    response.close()
+    return statuses[0][:3] in ('200', '201')
+
+
+def run(until, key, body=None):
+    """Read, or write body when there is one, until until; the timings
+    of the requests that succeeded and how many failed
+    """
+    timings, failed = [], 0
+    # Untimed, it pays for opening the connection and the first queries
+    request('GET', '/events', key, 'page_size=20')
+    try:
+        while time.time() < until:
+            start = time.perf_counter()
+            if body is None:
+                ok = request('GET', '/events', key, 'page_size=20')
+            else:
+                ok = request('POST', '/events/bulk', key, data=body)
+            if ok:
+                timings.append(time.perf_counter() - start)
+            else:
+                failed += 1
+    finally:
+        connections.close_all()
+    return timings, failed
+
+
+def percentile(values, fraction):
+    return sorted(values)[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--seconds', type=float, default=5)
+    parser.add_argument('--readers', type=int, default=4)
+    parser.add_argument('--writers', type=int, default=2)
+    parser.add_argument('--events', type=int, default=500)
+    parser.add_argument('--batch', type=int, default=200)
+    args = parser.parse_args()
+
+    with temporary_database() as default:
+        name = default.settings_dict['NAME']
+        call_command('migrate', verbosity=0)
+        key, gamer_id, game_id = seed(args.events)
+        body = json.dumps([{
+            'game': game_id, 'organizer': gamer_id, 'attendees': [], 'description': 'Game night',
+            'date': '2026-01-01', 'time': '19:00:00',
+        }] * args.batch).encode()
+
+        print(f'{args.readers} processes reading GET /events?page_size=20, '
+              f'{args.writers} creating {args.batch} events at a time, {args.seconds:g}s each')
+        for label, environ in SETUPS.items():
+            use_databases({'DATABASE_NAME': name, **environ})
+            # Forked workers start with the settings above and no connections
+            workers = ProcessPoolExecutor(
+                args.readers + args.writers, mp_context=multiprocessing.get_context('fork'))
+            with workers:
+                until = time.time() + args.seconds
+                reading = [workers.submit(run, until, key) for _ in range(args.readers)]
+                writing = [workers.submit(run, until, key, body) for _ in range(args.writers)]
+                results = {
+                    'reads': [future.result() for future in reading],
+                    'writes': [future.result() for future in writing],
+                }
+
+            print(f'  {label}')
+            for kind, done in results.items():
+                timings = [timing for worker_timings, _ in done for timing in worker_timings]
+                failed = sum(worker_failed for _, worker_failed in done)
+                if not timings:
+                    print(f'    {kind:<6}       0/s  {failed} failed')
+                    continue
+                print(f'    {kind:<6} {len(timings) / args.seconds:7.0f}/s'
+                      f'  median {statistics.median(timings) * 1e3:6.1f}ms'
+                      f'  p99 {percentile(timings, 0.99) * 1e3:7.1f}ms'
+                      f'  max {max(timings) * 1e3:7.1f}ms  {failed} failed')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+"""Benchmark the report grouping stage against the old nested scan
+
+    python -m benchmarks.report_grouping [--sizes 10000 100000 1000000]
+
+Rows are spread over one user per ten rows, which is roughly what the
+production games and events tables look like. The old implementation
+scans every user for every row, so it is only run up to --quadratic-limit
+rows; past that it takes minutes.
+"""
+import argparse
+import gc
+import random
+import time
+
+from benchmarks import setup_django
+
+setup_django()
+
+# pylint: disable=wrong-import-position
+from levelupreports.views.helpers import group_by_user, row_type
+
+
+def quadratic_group(rows, key, items_name):
+    """The grouping the report views did before group_by_user"""
+    users = []
+    for row in rows:
+        user_dict = None
+        for user in users:
+            if user[key] == getattr(row, key):
+                user_dict = user
+        if user_dict:
+            user_dict[items_name].append(row)
+        else:
+            users.append({
+                key: getattr(row, key),
+                "full_name": row.full_name,
+                items_name: [row]
+            })
+    return users
+
+
+def make_rows(count):
+    """Fake report rows, shuffled so users are not contiguous"""
+    users = max(count // 10, 1)
+    Row = row_type(('id', 'title', 'gamer_id', 'full_name'))
+    rows = [Row(i, f'Game {i}', i % users, f'Gamer {i % users}') for i in range(count)]
+    random.Random(count).shuffle(rows)
+    return rows
+
+
+def best_of(repeat, func, *args):
+    """Fastest wall clock time of repeat calls to func, like timeit
+    the garbage collector is off while timing
+    """
+    timings = []
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func(*args)
+            timings.append(time.perf_counter() - start)
+    finally:
+        gc.enable()
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+    parser.add_argument('--quadratic-limit', type=int, default=10_000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'rows':>10} {'single pass':>14} {'per row':>10} {'nested scan':>14}")
+    for size in args.sizes:
+        rows = make_rows(size)
+        grouped = best_of(args.repeat, group_by_user, rows, 'gamer_id', 'games')
+        if size <= args.quadratic_limit:
+            nested = f"{best_of(1, quadratic_group, rows, 'gamer_id', 'games'):13.3f}s"
+        else:
+            nested = 'skipped'
+        print(f"{size:>10} {grouped:13.3f}s {grouped / size * 1e9:8.0f}ns {nested:>14}")
+
+
+if __name__ == '__main__':
+    main()
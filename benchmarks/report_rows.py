@@ -0,0 +1,91 @@
+"""Benchmark building report rows: namedtuples vs dicts and model instances
+
+    python -m benchmarks.report_rows [--rows 100000]
+
+The reports used to turn every row into a dictionary with dict_fetch_all
+and then into an unsaved Game model instance for the template. They now
+use the namedtuple rows from row_fetch_all. This measures construction
+time and the memory each row keeps alive, for the rows of the usergames
+report query.
+"""
+import argparse
+import gc
+import time
+import tracemalloc
+
+from benchmarks import setup_django
+
+setup_django()
+
+# pylint: disable=wrong-import-position
+from levelupapi.models import Game
+from levelupreports.views.helpers import row_type
+
+COLUMNS = ('id', 'title', 'maker', 'number_of_players', 'skill_level',
+           'game_type_id', 'gamer_id', 'full_name')
+
+
+def model_rows(rows):
+    """What the report views used to build for each row"""
+    built = []
+    for row in rows:
+        row = dict(zip(COLUMNS, row))
+        built.append(Game(
+            id=row['id'], title=row['title'], maker=row['maker'],
+            number_of_players=row['number_of_players'],
+            skill_level=row['skill_level'], game_type_id=row['game_type_id'],
+            gamer_id=row['gamer_id']))
+    return built
+
+
+def dict_rows(rows):
+    """dict_fetch_all on its own"""
+    return [dict(zip(COLUMNS, row)) for row in rows]
+
+
+def namedtuple_rows(rows):
+    """What row_fetch_all builds"""
+    return list(map(row_type(COLUMNS)._make, rows))
+
+
+def measure(func, rows):
+    """Seconds and bytes per row that func takes to build and hold rows"""
+    gc.collect()
+    gc.disable()
+    try:
+        start = time.perf_counter()
+        built = func(rows)
+        seconds = time.perf_counter() - start
+    finally:
+        gc.enable()
+    del built
+
+    gc.collect()
+    tracemalloc.start()
+    built = func(rows)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del built
+    return seconds / len(rows), size / len(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=100_000)
+    args = parser.parse_args()
+
+    rows = [
+        (i, f'Game {i}', 'Maker', 4, 3, 1, i % 1000, f'Gamer {i % 1000}')
+        for i in range(args.rows)
+    ]
+
+    print(f"{'row type':>22} {'build':>10} {'memory':>10}")
+    for name, func in [('Game model instance', model_rows),
+                       ('dict', dict_rows),
+                       ('namedtuple', namedtuple_rows)]:
+        seconds, size = measure(func, rows)
+        print(f"{name:>22} {seconds * 1e9:8.0f}ns {size:8.0f}B")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,160 @@
+"""Compare concurrent request throughput under WSGI and ASGI
+
+    python -m benchmarks.wsgi_vs_asgi [--requests 400] [--concurrency 16]
+
+Seeds a throwaway, fully migrated SQLite database and drives the Django
+applications in process, without a server in front: the WSGI handler
+from a pool of threads, like a threaded WSGI server, and the ASGI
+handler levelup/asgi.py uses from concurrent tasks on one event loop.
+"""
+import argparse
+import asyncio
+import io
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks import setup_django, temporary_database
+
+setup_django()
+
+# pylint: disable=wrong-import-position
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.wsgi import get_wsgi_application
+from django.db import connections
+from rest_framework.authtoken.models import Token
+from levelup.handlers import StreamingASGIHandler
+from levelupapi.models import Event, EventGamer, Game, Gamer, GameType
+
+URLS = [
+    '/events?page_size=50',
+    '/games?page_size=50',
+    '/gametypes',
+    '/reports/usergames?format=ndjson',
+]
+
+
+def seed(sizes):
+    users = User.objects.bulk_create([
+        User(username=f'gamer{i}', password='', first_name='First', last_name='Last')
+        for i in range(sizes.gamers)
+    ])
+    gamers = Gamer.objects.bulk_create([Gamer(user=user, bio='') for user in users])
+    game_type = GameType.objects.create(label='Board game')
+    games = Game.objects.bulk_create([
+        Game(game_type=game_type, title=f'Game {i}', maker='Maker', gamer=gamers[i % len(gamers)],
+             number_of_players=4, skill_level=2)
+        for i in range(sizes.games)
+    ])
+    events = Event.objects.bulk_create([
+        Event(game=games[i % len(games)], description=f'Event {i}',
+              organizer=gamers[i % len(gamers)])
+        for i in range(sizes.events)
+    ])
+    EventGamer.objects.bulk_create([
+        EventGamer(event=event, gamer=gamers[(event.id + j) % len(gamers)])
+        for event in events for j in range(3)
+    ])
+    return Token.objects.create(user=users[0]).key
+
+
+def split(url):
+    path, _, query = url.partition('?')
+    return path, query
+
+
+def run_wsgi(urls, key, concurrency):
+    application = get_wsgi_application()
+
+    def request(url):
+        path, query = split(url)
+        environ = {
+            'REQUEST_METHOD': 'GET', 'PATH_INFO': path, 'QUERY_STRING': query,
+            'SERVER_NAME': 'localhost', 'SERVER_PORT': '80', 'SERVER_PROTOCOL': 'HTTP/1.1',
+            'HTTP_AUTHORIZATION': f'Token {key}',
+            'wsgi.input': io.BytesIO(), 'wsgi.url_scheme': 'http',
+        }
+        statuses = []
+        body = application(environ, lambda status, headers: statuses.append(status))
+        try:
+            for _ in body:
+                pass
+        finally:
+            body.close()
+        return statuses[0].startswith('200')
+
+    with ThreadPoolExecutor(concurrency) as pool:
+        results = list(pool.map(request, urls))
+    connections.close_all()
+    return results
+
+
+def run_asgi(urls, key, concurrency):
+    application = StreamingASGIHandler()
+
+    async def request(url):
+        path, query = split(url)
+        scope = {
+            'type': 'http', 'method': 'GET', 'path': path, 'query_string': query.encode(),
+            'headers': [(b'authorization', f'Token {key}'.encode())],
+            'http_version': '1.1', 'scheme': 'http',
+            'server': ('localhost', 80), 'client': ('127.0.0.1', 0),
+        }
+        statuses = []
+
+        async def receive():
+            return {'type': 'http.request', 'body': b''}
+
+        async def send(message):
+            if message['type'] == 'http.response.start':
+                statuses.append(message['status'])
+
+        try:
+            await application(scope, receive, send)
+        except Exception:  # pylint: disable=broad-except
+            return False
+        return statuses[0] == 200
+
+    async def main():
+        queue = list(reversed(urls))
+        results = []
+
+        async def worker():
+            while queue:
+                results.append(await request(queue.pop()))
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return results
+
+    return asyncio.run(main())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--gamers', type=int, default=50)
+    parser.add_argument('--games', type=int, default=500)
+    parser.add_argument('--events', type=int, default=2_000)
+    parser.add_argument('--requests', type=int, default=400)
+    parser.add_argument('--concurrency', type=int, default=16)
+    sizes = parser.parse_args()
+
+    with temporary_database():
+        call_command('migrate', verbosity=0)
+        key = seed(sizes)
+        connections.close_all()
+
+        print(f'{sizes.requests} requests per endpoint, {sizes.concurrency} at a time')
+        for url in URLS:
+            print(url)
+            urls = [url] * sizes.requests
+            for label, run in [('WSGI, threads', run_wsgi), ('ASGI', run_asgi)]:
+                start = time.perf_counter()
+                results = run(urls, key, sizes.concurrency)
+                seconds = time.perf_counter() - start
+                failed = results.count(False)
+                print(f"  {label:<20} {len(urls) / seconds:8.0f} requests/s"
+                      + (f"  {failed} failed" if failed else ''))
+
+
+if __name__ == '__main__':
+    main()
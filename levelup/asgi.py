@@ -9,8 +9,12 @@ https://docs.djangoproject.com/en/4.0/howto/deployment/asgi/
 
 import os
 
-from django.core.asgi import get_asgi_application
+import django
+
+from levelup.handlers import StreamingASGIHandler
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'levelup.settings')
 
-application = get_asgi_application()
+# What get_asgi_application() does, with a handler that can stream reports
+django.setup(set_prefix=False)
+application = StreamingASGIHandler()
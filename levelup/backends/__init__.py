@@ -0,0 +1,4 @@
+"""Database backends adding connection pooling and health checks to Django's
+
+Set them up through the environment, see levelup.database.
+"""
@@ -0,0 +1,89 @@
+"""What the levelup backends add to Django's DatabaseWrapper"""
+from django.db import DatabaseError
+
+from levelup.backends.pool import get_pool
+
+
+class ConnectionManagementMixin:
+    """Pooling and health checks for a DatabaseWrapper
+
+    settings_dict['POOL'] = {'SIZE': n, 'TIMEOUT': seconds, 'MAX_AGE': seconds}
+    takes connections from a pool shared by the whole process instead of
+    opening one per thread; closing puts them back. Use CONN_MAX_AGE = 0
+    with it, the pool does the reusing.
+
+    settings_dict['CONN_HEALTH_CHECKS'] checks a reused connection still
+    works before a request uses it, so one the database server dropped
+    is replaced instead of failing the request. Like Django 4.1, which
+    does this itself under the same name, that is once per request, just
+    before its first query.
+    """
+
+    health_check_done = False
+
+    @property
+    def pool(self):
+        if not self.settings_dict.get('POOL'):
+            return None
+        return get_pool(self.alias, self.settings_dict)
+
+    def open_connection(self, conn_params):
+        """Really connect to the database, rather than take from the pool"""
+        return super().get_new_connection(conn_params)
+
+    def get_new_connection(self, conn_params):
+        if self.pool is None:
+            return self.open_connection(conn_params)
+        is_usable = self.raw_is_usable if self.settings_dict.get('CONN_HEALTH_CHECKS') else None
+        return self.pool.checkout(lambda: self.open_connection(conn_params), is_usable)
+
+    def _close(self):
+        if self.pool is None or self.connection is None:
+            return super()._close()
+        try:
+            with self.wrap_database_errors:
+                # Nothing from this thread's transaction may leak to the next one
+                self.connection.rollback()
+        except DatabaseError:
+            # The server dropped it; its slot goes back either way
+            self.pool.checkin(self.connection, usable=False)
+        else:
+            self.pool.checkin(self.connection)
+        return None
+
+    def raw_is_usable(self, raw):
+        try:
+            cursor = raw.cursor()
+            try:
+                cursor.execute('SELECT 1')
+            finally:
+                cursor.close()
+        except Exception:  # pylint: disable=broad-except
+            return False
+        return True
+
+    def connect(self):
+        super().connect()
+        # A connection that was just opened works
+        self.health_check_done = True
+
+    def close_if_unusable_or_obsolete(self):
+        """Django calls this at the start and end of every request"""
+        super().close_if_unusable_or_obsolete()
+        self.health_check_done = False
+
+    def close_if_health_check_failed(self):
+        """Replace a kept connection that stopped working, once per request
+
+        The pool checks the connections it hands out itself.
+        """
+        if (self.connection is None or self.health_check_done or self.pool is not None or
+                not self.settings_dict.get('CONN_HEALTH_CHECKS')):
+            return
+        if not self.in_atomic_block and not self.raw_is_usable(self.connection):
+            self.close()
+        self.health_check_done = True
+
+    def _cursor(self, name=None):
+        self.close_if_health_check_failed()
+        return super()._cursor(name)
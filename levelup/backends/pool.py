@@ -0,0 +1,91 @@
+"""A per process pool of database connections shared by every thread"""
+import queue
+import threading
+import time
+
+from django.db import OperationalError
+
+
+class ConnectionPool:
+    """Hands out at most `size` raw DB-API connections at a time
+
+    Returned connections are kept for the next thread that asks, up to
+    `size` of them, until they are `max_age` seconds old. Asking for one
+    while all of them are in use waits up to `timeout` seconds.
+    """
+
+    def __init__(self, size, timeout=10, max_age=None):
+        self.size = size
+        self.timeout = timeout
+        self.max_age = max_age
+        self.slots = threading.BoundedSemaphore(size)
+        self.idle = queue.LifoQueue()
+        self.created = {}
+
+    def checkout(self, connect, is_usable=None):
+        """An idle connection that passes is_usable, or a new one from connect()"""
+        if not self.slots.acquire(timeout=self.timeout):
+            raise OperationalError(
+                f'All {self.size} pooled database connections are in use')
+        try:
+            while True:
+                try:
+                    raw = self.idle.get_nowait()
+                except queue.Empty:
+                    break
+                if self.expired(raw) or (is_usable is not None and not is_usable(raw)):
+                    self.discard(raw)
+                    continue
+                return raw
+            raw = connect()
+            self.created[id(raw)] = time.monotonic()
+            return raw
+        except BaseException:
+            self.slots.release()
+            raise
+
+    def checkin(self, raw, usable=True):
+        """Give back a connection from checkout(), closing it when it is
+        no longer usable
+        """
+        try:
+            if not usable or self.expired(raw):
+                self.discard(raw)
+            else:
+                self.idle.put(raw)
+        finally:
+            self.slots.release()
+
+    def expired(self, raw):
+        if self.max_age is None:
+            return False
+        return time.monotonic() - self.created.get(id(raw), 0) > self.max_age
+
+    def discard(self, raw):
+        self.created.pop(id(raw), None)
+        try:
+            raw.close()
+        except Exception:  # pylint: disable=broad-except
+            pass
+
+    def close_all(self):
+        """Close every idle connection"""
+        while True:
+            try:
+                self.discard(self.idle.get_nowait())
+            except queue.Empty:
+                return
+
+
+# One pool per database alias, made on first use
+POOLS = {}
+POOLS_LOCK = threading.Lock()
+
+
+def get_pool(alias, settings_dict):
+    with POOLS_LOCK:
+        if alias not in POOLS:
+            options = settings_dict['POOL']
+            POOLS[alias] = ConnectionPool(
+                options['SIZE'], options.get('TIMEOUT', 10), options.get('MAX_AGE'))
+        return POOLS[alias]
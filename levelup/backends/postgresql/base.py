@@ -0,0 +1,8 @@
+"""PostgreSQL with the levelup connection management"""
+from django.db.backends.postgresql import base
+
+from levelup.backends.mixins import ConnectionManagementMixin
+
+
+class DatabaseWrapper(ConnectionManagementMixin, base.DatabaseWrapper):
+    pass
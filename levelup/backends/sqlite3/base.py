@@ -0,0 +1,32 @@
+"""SQLite with WAL journaling, a busy timeout and the levelup connection management"""
+from django.db.backends.sqlite3 import base
+
+from levelup.backends.mixins import ConnectionManagementMixin
+
+
+class DatabaseWrapper(ConnectionManagementMixin, base.DatabaseWrapper):
+    """settings_dict['PRAGMAS'] are run on every new connection, in order,
+    e.g. {'journal_mode': 'WAL', 'busy_timeout': 5000}
+
+    settings_dict['TRANSACTION_MODE'] = 'IMMEDIATE' starts transactions
+    with BEGIN IMMEDIATE, taking the write lock straight away. A deferred
+    transaction that reads before it writes can't wait for the lock once
+    another connection has written: it fails with "database is locked"
+    whatever the busy timeout. (Django 5.1 has this as
+    OPTIONS['transaction_mode'].) Code that only reads can set
+    transaction_mode to 'DEFERRED' for its transaction instead.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.transaction_mode = self.settings_dict.get('TRANSACTION_MODE')
+
+    def open_connection(self, conn_params):
+        conn = super().open_connection(conn_params)
+        for name, value in self.settings_dict.get('PRAGMAS', {}).items():
+            conn.execute(f'PRAGMA {name} = {value}')
+        return conn
+
+    def _start_transaction_under_autocommit(self):
+        mode = self.transaction_mode
+        self.cursor().execute(f'BEGIN {mode}' if mode else 'BEGIN')
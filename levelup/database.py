@@ -0,0 +1,106 @@
+"""DATABASES from the environment
+
+    DATABASE_ENGINE          sqlite3 (default), postgresql or a full backend path
+    DATABASE_NAME            the SQLite file, db.sqlite3 by default, or database name
+    DATABASE_USER, DATABASE_PASSWORD, DATABASE_HOST, DATABASE_PORT
+    DATABASE_CONN_MAX_AGE    seconds a thread keeps its connection open, 60 by
+                             default, 0 to close it after every request and
+                             "none" to never close it
+    DATABASE_HEALTH_CHECKS   1 to check a kept connection still works before
+                             each request uses it
+    DATABASE_POOL_SIZE       connections in the pool shared by every thread of
+                             the process, 0 (the default) for no pool
+    DATABASE_POOL_TIMEOUT    seconds to wait for a pooled connection, 10
+    DATABASE_POOL_MAX_AGE    seconds before a pooled connection is replaced
+    DATABASE_READ_CONNECTION 1 to add the "read" database, which GET requests
+                             read from, see levelup.routers
+    DATABASE_READ_HOST, DATABASE_READ_PORT
+                             where the read database is, the same server
+                             by default. SQLite always reads the same file
+    SQLITE_JOURNAL_MODE      WAL by default, so reads don't wait for writes
+    SQLITE_BUSY_TIMEOUT      seconds a write waits for another to finish, 5
+    SQLITE_TRANSACTION_MODE  IMMEDIATE by default, so transactions queue for
+                             the write lock rather than fail to get it
+    SQLITE_SYNCHRONOUS       NORMAL by default, which is safe with WAL: a
+                             power cut can lose the last commits but
+                             never corrupts the file
+    SQLITE_CACHE_SIZE        page cache of each connection in KiB, 20000
+    SQLITE_MMAP_SIZE         bytes of the file read through mmap, 256MiB
+
+With a pool, connections go back to it at the end of every request, so
+CONN_MAX_AGE is 0 whatever DATABASE_CONN_MAX_AGE says.
+"""
+from django.core.exceptions import ImproperlyConfigured
+
+READ_DATABASE = 'read'
+
+ENGINES = {
+    'sqlite3': 'levelup.backends.sqlite3',
+    'postgresql': 'levelup.backends.postgresql',
+}
+
+
+def seconds(value):
+    return None if value.lower() == 'none' else int(value)
+
+
+def database_from_env(environ, base_dir):
+    engine = environ.get('DATABASE_ENGINE', 'sqlite3')
+    database = {
+        'ENGINE': ENGINES.get(engine, engine),
+        'NAME': environ.get('DATABASE_NAME', base_dir / 'db.sqlite3'),
+        'CONN_MAX_AGE': seconds(environ.get('DATABASE_CONN_MAX_AGE', '60')),
+        'CONN_HEALTH_CHECKS': environ.get('DATABASE_HEALTH_CHECKS') == '1',
+    }
+    for name in ('USER', 'PASSWORD', 'HOST', 'PORT'):
+        if f'DATABASE_{name}' in environ:
+            database[name] = environ[f'DATABASE_{name}']
+
+    pool_size = int(environ.get('DATABASE_POOL_SIZE', '0'))
+    if pool_size:
+        if not database['ENGINE'].startswith('levelup.backends.'):
+            raise ImproperlyConfigured(
+                f'DATABASE_POOL_SIZE needs one of the {", ".join(ENGINES)} engines')
+        database['POOL'] = {
+            'SIZE': pool_size,
+            'TIMEOUT': int(environ.get('DATABASE_POOL_TIMEOUT', '10')),
+            'MAX_AGE': seconds(environ.get('DATABASE_POOL_MAX_AGE', 'none')),
+        }
+        database['CONN_MAX_AGE'] = 0
+
+    if database['ENGINE'] == ENGINES['sqlite3']:
+        database['OPTIONS'] = {'timeout': int(environ.get('SQLITE_BUSY_TIMEOUT', '5'))}
+        database['TRANSACTION_MODE'] = environ.get('SQLITE_TRANSACTION_MODE', 'IMMEDIATE')
+        database['PRAGMAS'] = {
+            'journal_mode': environ.get('SQLITE_JOURNAL_MODE', 'WAL'),
+            'synchronous': environ.get('SQLITE_SYNCHRONOUS', 'NORMAL'),
+            # Negative sizes are in KiB rather than pages
+            'cache_size': -int(environ.get('SQLITE_CACHE_SIZE', '20000')),
+            'mmap_size': int(environ.get('SQLITE_MMAP_SIZE', str(256 * 1024 * 1024))),
+            'temp_store': 'MEMORY',
+        }
+    return database
+
+
+def read_database_from_env(default, environ):
+    """The read database: default again, on its own connections
+
+    Tests read from default instead, so they see their own writes.
+    """
+    database = {**default, 'TEST': {'MIRROR': 'default'}}
+    for name in ('HOST', 'PORT'):
+        if f'DATABASE_READ_{name}' in environ:
+            database[name] = environ[f'DATABASE_READ_{name}']
+    if 'PRAGMAS' in database:
+        # Anything trying to write through it fails instead of waiting for
+        # the write lock
+        database['PRAGMAS'] = {**database['PRAGMAS'], 'query_only': 1}
+        database['TRANSACTION_MODE'] = 'DEFERRED'
+    return database
+
+
+def databases_from_env(environ, base_dir):
+    databases = {'default': database_from_env(environ, base_dir)}
+    if environ.get('DATABASE_READ_CONNECTION') == '1':
+        databases[READ_DATABASE] = read_database_from_env(databases['default'], environ)
+    return databases
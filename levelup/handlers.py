@@ -0,0 +1,60 @@
+"""The ASGI handler levelup/asgi.py serves the project with
+
+Django 4.0's ASGIHandler iterates a StreamingHttpResponse on the event
+loop, where the ORM refuses to run, so the streamed reports and their
+?format= downloads fail under ASGI. StreamingASGIHandler makes their
+content with sync_to_async instead, in the thread the view ran in, and
+sends each chunk before making the next, so a report is never held in
+memory whole. (Django 4.2 streams async iterators itself.)
+"""
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIHandler
+
+
+def read_chunk(parts, size):
+    """The next parts joined, up to about size bytes; b'' when there are none left
+
+    One trip to the thread per chunk rather than per part, which for the
+    reports is per row.
+    """
+    chunk = bytearray()
+    for part in parts:
+        chunk += part
+        if len(chunk) >= size:
+            break
+    return bytes(chunk)
+
+
+class StreamingASGIHandler(ASGIHandler):
+
+    async def send_response(self, response, send):
+        if not response.streaming:
+            return await super().send_response(response, send)
+
+        # The start of the response the way Django sends it
+        headers = []
+        for header, value in response.items():
+            if isinstance(header, str):
+                header = header.encode('ascii')
+            if isinstance(value, str):
+                value = value.encode('latin1')
+            headers.append((bytes(header), bytes(value)))
+        for cookie in response.cookies.values():
+            headers.append((b'Set-Cookie', cookie.output(header='').encode('ascii').strip()))
+        await send({
+            'type': 'http.response.start',
+            'status': response.status_code,
+            'headers': headers,
+        })
+
+        # Access __iter__ and not streaming_content, like Django does
+        parts = iter(response)
+        read = sync_to_async(read_chunk, thread_sensitive=True)
+        while True:
+            chunk = await read(parts, self.chunk_size)
+            if not chunk:
+                break
+            await send({'type': 'http.response.body', 'body': chunk, 'more_body': True})
+        await send({'type': 'http.response.body'})
+        await sync_to_async(response.close, thread_sensitive=True)()
+        return None
@@ -0,0 +1,113 @@
+"""Reads of GET requests go to the read database
+
+With DATABASE_READ_CONNECTION=1 (see levelup.database) there is a second
+database, "read". ReadDatabaseMiddleware marks GET, HEAD and OPTIONS
+requests, which only list, retrieve, search and report, and while one
+is running ReadDatabaseRouter sends the ORM's reads to "read". Writes,
+and every query of the other requests, stay on default.
+
+On SQLite both are the same file. In WAL mode a reader sees the last
+commit and never waits for the writer, so keeping reads on connections
+of their own means a slow signup or create doesn't hold up /events.
+"""
+import asyncio
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.db import connections
+from rest_framework.permissions import SAFE_METHODS
+
+from levelup.database import READ_DATABASE
+
+try:
+    from asgiref.sync import markcoroutinefunction
+except ImportError:
+    # asgiref < 3.6, marked the way Django 4.0's own middleware is
+    def markcoroutinefunction(func):
+        func._is_coroutine = asyncio.coroutines._is_coroutine  # pylint: disable=protected-access
+        return func
+
+read_only = ContextVar('read_only', default=False)
+
+
+@contextmanager
+def reading():
+    """Read from the read database, when there is one, inside the block"""
+    token = read_only.set(True)
+    try:
+        yield
+    finally:
+        read_only.reset(token)
+
+
+def read_each(chunks):
+    """Iterate chunks, a streamed response's content, reading() each one
+
+    The response is iterated after the middleware has returned, possibly
+    in another context, so reading() can't simply be kept on around it.
+    """
+    chunks = iter(chunks)
+    while True:
+        with reading():
+            chunk = next(chunks, None)
+        if chunk is None:
+            return
+        yield chunk
+
+
+class ReadDatabaseRouter:
+
+    def db_for_read(self, model, **hints):
+        if read_only.get() and READ_DATABASE in connections:
+            return READ_DATABASE
+        return None
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Both databases have the same rows
+        if {obj1._state.db, obj2._state.db} <= {'default', READ_DATABASE}:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Migrating default migrates it
+        if db == READ_DATABASE:
+            return False
+        return None
+
+
+class ReadDatabaseMiddleware:
+    """Runs the way the rest of the stack does, so under ASGI requests
+    don't take an extra trip through a thread to get past it
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = asyncio.iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        if request.method not in SAFE_METHODS:
+            return self.get_response(request)
+
+        with reading():
+            response = self.get_response(request)
+        return self.read_streamed(response)
+
+    async def __acall__(self, request):
+        if request.method not in SAFE_METHODS:
+            return await self.get_response(request)
+
+        with reading():
+            response = await self.get_response(request)
+        return self.read_streamed(response)
+
+    def read_streamed(self, response):
+        if response.streaming:
+            response.streaming_content = read_each(response.streaming_content)
+        return response
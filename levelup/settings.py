@@ -10,8 +10,11 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/4.0/ref/settings/
 """
 
+import os
 from pathlib import Path
 
+from levelup.database import databases_from_env
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -46,11 +49,25 @@ INSTALLED_APPS = [
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework.authentication.TokenAuthentication',
+        'levelupapi.authentication.GamerTokenAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
+    # orjson when it is installed, the standard json module otherwise
+    'DEFAULT_RENDERER_CLASSES': [
+        'levelupapi.fastjson.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'levelupapi.fastjson.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
+    # Serializers pass dates and times through and the renderer writes
+    # them, the same ISO 8601 strings DRF would have made
+    'DATE_FORMAT': None,
+    'TIME_FORMAT': None,
 }
 
 CORS_ORIGIN_WHITELIST = (
@@ -60,6 +77,7 @@ CORS_ORIGIN_WHITELIST = (
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'levelup.routers.ReadDatabaseMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -93,13 +111,40 @@ WSGI_APPLICATION = 'levelup.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/4.0/ref/settings/#databases
 
-DATABASES = {
+# Connections, pooling, SQLite tuning and the read database come from
+# the environment, see levelup.database for the variables
+DATABASES = databases_from_env(os.environ, BASE_DIR)
+
+DATABASE_ROUTERS = ['levelup.routers.ReadDatabaseRouter']
+
+
+# Caches
+# https://docs.djangoproject.com/en/4.0/topics/cache/
+
+CACHES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
     }
 }
 
+# Responses cached by levelupapi.cache.cache_response. CACHE is the alias
+# in CACHES to keep them in, TIMEOUT how many seconds they live at most.
+# ETags are only sent when CACHE is shared by every worker process, so
+# not with the local memory cache above.
+LEVELUP_RESPONSE_CACHE = {
+    'CACHE': 'default',
+    'TIMEOUT': 300,
+}
+
+# Tokens cached by levelupapi.authentication.GamerTokenAuthentication,
+# with their user and gamer. A TIMEOUT of 0 looks them up on every request,
+# and so does a CACHE that isn't shared by every worker process, like the
+# local memory cache above: a deleted token has to be forgotten by all of them.
+LEVELUP_TOKEN_CACHE = {
+    'CACHE': 'default',
+    'TIMEOUT': 60,
+}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.0/ref/settings/#auth-password-validators
@@ -1,7 +1,7 @@
 from django.contrib import admin
 from django.conf.urls import include
 from django.urls import path
-from levelupapi.views import register_user, login_user
+from levelupapi.views import register_user, login_user, cache_stats_view
 from rest_framework import routers
 from levelupapi.views import GameTypeView
 from levelupapi.views.EventView import EventView
@@ -16,6 +16,7 @@ router.register(r'games', GameView, 'game')
 urlpatterns = [
     path('register', register_user),
     path('login', login_user),
+    path('cachestats', cache_stats_view),
     path('admin/', admin.site.urls),
     path('', include(router.urls)),
     path('', include('levelupreports.urls')),
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class LevelupapiConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'levelupapi'
+
+    def ready(self):
+        # Connect the receivers that invalidate cached responses
+        from levelupapi import signals  # pylint: disable=unused-import,import-outside-toplevel
@@ -0,0 +1,84 @@
+"""Token authentication that also finds the gamer making the request"""
+import hashlib
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.translation import gettext_lazy as _
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+from levelupapi.cache import LOCAL_CACHES
+
+DEFAULTS = {
+    'CACHE': 'default',
+    'TIMEOUT': 60,
+}
+
+
+def token_cache_setting(name):
+    return getattr(settings, 'LEVELUP_TOKEN_CACHE', {}).get(name, DEFAULTS[name])
+
+
+def token_cache_key(key):
+    """Cache key for a token, without putting the token itself in the cache"""
+    return f'levelup:token:{hashlib.sha256(key.encode()).hexdigest()}'
+
+
+def get_token_cache():
+    return caches[token_cache_setting('CACHE')]
+
+
+def tokens_cached():
+    """Whether tokens are cached: for TIMEOUT seconds, and only in a cache
+    every process shares
+
+    forget_tokens can only reach the cache of its own process, so with the
+    local memory cache a deleted token would go on working in the others.
+    """
+    return bool(token_cache_setting('TIMEOUT')) and not isinstance(get_token_cache(), LOCAL_CACHES)
+
+
+def forget_tokens(keys):
+    """Drop cached tokens, so the next request with them is checked again"""
+    if tokens_cached():
+        get_token_cache().delete_many([token_cache_key(key) for key in keys])
+
+
+class GamerTokenAuthentication(TokenAuthentication):
+    """DRF's token authentication, with the token, user and gamer loaded
+    in one joined query and the gamer put on the request as request.gamer
+
+    The loaded token is kept in the cache for
+    settings.LEVELUP_TOKEN_CACHE['TIMEOUT'] seconds (0 turns this off),
+    when that cache is shared by every process.
+    Deleting the token or saving its user or gamer drops it from the cache
+    straight away, see levelupapi.signals.
+    """
+
+    def authenticate(self, request):
+        result = super().authenticate(request)
+        if result is not None:
+            user, _token = result
+            # A user without a gamer, like a superuser, has no request.gamer
+            request.gamer = getattr(user, 'gamer', None)
+        return result
+
+    def authenticate_credentials(self, key):
+        cached = tokens_cached()
+        cache = get_token_cache()
+
+        token = cache.get(token_cache_key(key)) if cached else None
+        if token is None:
+            try:
+                token = Token.objects.select_related('user__gamer').get(key=key)
+            except Token.DoesNotExist as ex:
+                raise exceptions.AuthenticationFailed(_('Invalid token.')) from ex
+            # Look the gamer up now, so a missing one is remembered too
+            getattr(token.user, 'gamer', None)
+            if cached:
+                cache.set(token_cache_key(key), token, token_cache_setting('TIMEOUT'))
+
+        if not token.user.is_active:
+            raise exceptions.AuthenticationFailed(_('User inactive or deleted.'))
+
+        return (token.user, token)
@@ -0,0 +1,202 @@
+"""Response caching and ETags for the read heavy endpoints
+
+Cached responses and ETags are keyed on the version of every table they
+were built from. Writing to a table bumps its version (see
+levelupapi.signals), which makes every cached response built from it
+unreachable and changes its ETag, without having to find and delete them.
+
+The cache used is settings.LEVELUP_RESPONSE_CACHE['CACHE'], one of the
+aliases in settings.CACHES. With the local memory default every worker
+process counts its own versions and misses the bumps of the others. A
+cached response outlives a write in another process by TIMEOUT at most,
+but an ETag never would, so ETags are only sent when the cache is one
+all the processes share, like Redis, Memcached or the database.
+"""
+import hashlib
+import time
+from functools import wraps
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import transaction
+from django.utils.http import parse_etags
+from rest_framework import status
+from rest_framework.response import Response
+
+DEFAULTS = {
+    'CACHE': 'default',
+    'TIMEOUT': 300,
+}
+
+
+def cache_setting(name):
+    return getattr(settings, 'LEVELUP_RESPONSE_CACHE', {}).get(name, DEFAULTS[name])
+
+
+def get_cache():
+    """The cache backend responses and table versions are kept in"""
+    return caches[cache_setting('CACHE')]
+
+
+# Backends that keep what they hold to the process
+LOCAL_CACHES = (LocMemCache, DummyCache)
+
+
+def versions_shared():
+    """Whether every process sees the same table versions"""
+    return not isinstance(get_cache(), LOCAL_CACHES)
+
+
+def version_key(table):
+    return f'levelup:version:{table}'
+
+
+def table_versions(*tables):
+    """The current version of each table
+
+    A table the cache has never seen, or has evicted, starts at the
+    current time in nanoseconds rather than zero, so a version number is
+    never handed out twice for different data.
+    """
+    cache = get_cache()
+    keys = [version_key(table) for table in tables]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            cache.add(key, time.time_ns(), timeout=None)
+            versions[key] = cache.get(key)
+    return [versions[key] for key in keys]
+
+
+def bump_table_versions(*tables):
+    """Move the given tables to a new version, invalidating every
+    response cached from them
+
+    The bump happens right away, so the rest of the current transaction
+    sees fresh data, and again once the transaction commits, so a
+    response cached by another request in between is thrown away too.
+    """
+    def bump():
+        cache = get_cache()
+        for table in tables:
+            try:
+                cache.incr(version_key(table))
+            except ValueError:
+                cache.add(version_key(table), time.time_ns(), timeout=None)
+
+    bump()
+    transaction.on_commit(bump)
+
+
+def count(endpoint, outcome):
+    """Add one to the hit or miss counter of an endpoint"""
+    cache = get_cache()
+    key = f'levelup:stats:{endpoint}:{outcome}'
+    if not cache.add(key, 1, timeout=None):
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.add(key, 1, timeout=None)
+
+
+def cache_stats(endpoints):
+    """Hit and miss counts for each of the endpoints"""
+    keys = {
+        (endpoint, outcome): f'levelup:stats:{endpoint}:{outcome}'
+        for endpoint in endpoints
+        for outcome in ('hits', 'misses')
+    }
+    counts = get_cache().get_many(keys.values())
+    return {
+        endpoint: {
+            outcome: counts.get(keys[(endpoint, outcome)], 0)
+            for outcome in ('hits', 'misses')
+        }
+        for endpoint in endpoints
+    }
+
+
+# Every endpoint that caches its responses, for the stats view
+CACHED_ENDPOINTS = []
+
+
+def cache_response(endpoint, tables, per_user=False):
+    """Cache the data of successful responses from a viewset method
+
+    Arguments:
+      endpoint -- name for the cache keys and hit/miss counters
+      tables -- the tables the response is built from
+      per_user -- set when the response differs between users
+    """
+    CACHED_ENDPOINTS.append(endpoint)
+
+    def decorator(method):
+        @wraps(method)
+        def wrapper(self, request, *args, **kwargs):
+            versions = '.'.join(str(version) for version in table_versions(*tables))
+            user = request.user.pk if per_user else ''
+            params = sorted(
+                (name, value)
+                for name, values in request.query_params.lists()
+                for value in values
+            )
+            query = hashlib.md5(urlencode(params).encode(), usedforsecurity=False).hexdigest()
+            key = f'levelup:response:{endpoint}:{versions}:{user}:{query}'
+
+            cache = get_cache()
+            data = cache.get(key)
+            if data is not None:
+                count(endpoint, 'hits')
+                return Response(data)
+
+            count(endpoint, 'misses')
+            response = method(self, request, *args, **kwargs)
+            if response.status_code == 200:
+                cache.set(key, response.data, cache_setting('TIMEOUT'))
+            return response
+        return wrapper
+    return decorator
+
+
+def conditional_response(tables, per_user=False):
+    """Answer GET requests with 304 Not Modified when the client already
+    has the current version, and tag every other response with an ETag
+
+    The ETag comes from the versions of the tables the response is built
+    from, so checking it costs one cache lookup instead of running the
+    queries and serializing the response to hash it. Without a shared
+    cache (see versions_shared) there are no ETags and no 304s.
+
+    Arguments:
+      tables -- the tables the response is built from
+      per_user -- set when the response differs between users
+    """
+    def decorator(method):
+        @wraps(method)
+        def wrapper(self, request, *args, **kwargs):
+            if not versions_shared():
+                return method(self, request, *args, **kwargs)
+
+            versions = '.'.join(str(version) for version in table_versions(*tables))
+            user = request.user.pk if per_user else ''
+            tag = hashlib.sha1(
+                f'{request.get_full_path()}:{versions}:{user}'.encode(),
+                usedforsecurity=False
+            ).hexdigest()
+            etag = f'"{tag}"'
+
+            if_none_match = request.headers.get('If-None-Match')
+            if if_none_match is not None:
+                client_etags = parse_etags(if_none_match)
+                if '*' in client_etags or etag in client_etags:
+                    return Response(status=status.HTTP_304_NOT_MODIFIED, headers={'ETag': etag})
+
+            response = method(self, request, *args, **kwargs)
+            if response.status_code == status.HTTP_200_OK:
+                response['ETag'] = etag
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,63 @@
+"""JSON renderer and parser for the REST API built on orjson
+
+orjson is optional. When it isn't installed both classes behave exactly
+like DRF's JSONRenderer and JSONParser, so the settings don't change
+between environments.
+
+orjson writes dates, times and datetimes itself, which is why settings
+turns off DRF's own formatting of them: serializers hand the date and
+time of an Event straight through instead of building strings in Python.
+"""
+from django.conf import settings
+from rest_framework import renderers
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.utils import encoders
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Like DRF's encoder, datetimes in UTC end in Z instead of +00:00
+ORJSON_OPTIONS = orjson.OPT_UTC_Z if orjson is not None else 0
+
+
+# Everything orjson can't write itself: Decimal, lazy strings, querysets...
+default = encoders.JSONEncoder().default
+
+
+class FastJSONRenderer(renderers.JSONRenderer):
+    """JSONRenderer that uses orjson when it can
+
+    Indented output, from the browsable API or an `indent` media type
+    parameter, and ensure_ascii go through the standard renderer.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or not self.compact or self.ensure_ascii:
+            return super().render(data, accepted_media_type, renderer_context)
+        if data is None:
+            return b''
+        if self.get_indent(accepted_media_type or '', renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+        return orjson.dumps(data, default=default, option=ORJSON_OPTIONS)
+
+
+class FastJSONParser(JSONParser):
+    """JSONParser that uses orjson when it can"""
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        if orjson is None:
+            return super().parse(stream, media_type, parser_context)
+
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        try:
+            content = stream.read()
+            if encoding.lower().replace('-', '') != 'utf8':
+                content = content.decode(encoding)
+            return orjson.loads(content)
+        except (ValueError, UnicodeDecodeError) as exc:
+            raise ParseError(f'JSON parse error - {exc}') from exc
@@ -0,0 +1,118 @@
+"""Stream the levelupapi tables out to NDJSON or CSV files from one snapshot"""
+import csv
+import gzip
+import os
+from contextlib import contextmanager
+
+from django.core.management.base import BaseCommand, CommandError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection, transaction
+from levelupapi.models import Event, EventGamer, Game, Gamer, GameType
+
+# What can be exported, in the order the files are written, with the model
+# and the columns written for it. Gamers, game types and games use the
+# same columns the import command reads.
+EXPORTS = {
+    'gametypes': (GameType, ['id', 'label']),
+    'gamers': (Gamer, ['id', 'user', 'user__username', 'bio']),
+    'games': (Game, ['id', 'title', 'maker', 'number_of_players', 'skill_level',
+                     'game_type', 'gamer']),
+    'events': (Event, ['id', 'game', 'description', 'date', 'time', 'organizer']),
+    'eventgamers': (EventGamer, ['id', 'event', 'gamer']),
+}
+
+
+def open_output(path, compress):
+    if compress:
+        return gzip.open(path, 'wt', encoding='utf-8', newline='')
+    return open(path, 'w', encoding='utf-8', newline='')
+
+
+@contextmanager
+def read_transaction():
+    """transaction.atomic() for reading only
+
+    The levelup SQLite backend starts transactions with BEGIN IMMEDIATE,
+    which would keep every writer waiting until the export is done.
+    """
+    mode = getattr(connection, 'transaction_mode', None)
+    if mode is not None:
+        connection.transaction_mode = 'DEFERRED'
+    try:
+        with transaction.atomic():
+            yield
+    finally:
+        if mode is not None:
+            connection.transaction_mode = mode
+
+
+def use_snapshot():
+    """Make every query in the current transaction see the same data
+
+    Has to run before anything else in the transaction. PostgreSQL needs
+    REPEATABLE READ for it; its default READ COMMITTED takes a new snapshot
+    for every statement. SQLite reads inside one transaction always see a
+    single snapshot.
+    """
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as db_cursor:
+            db_cursor.execute('SET TRANSACTION ISOLATION LEVEL REPEATABLE READ, READ ONLY')
+
+
+class Command(BaseCommand):
+    help = (
+        'Export the levelupapi tables to one NDJSON or CSV file each, optionally '
+        'gzipped. Rows are streamed from the database in chunks and every file '
+        'comes from the same read transaction, so they are consistent with each '
+        'other while the site keeps writing.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('directory')
+        parser.add_argument('--only', nargs='+', choices=EXPORTS,
+                            help='Tables to export, all of them by default')
+        parser.add_argument('--format', choices=['ndjson', 'csv'], default='ndjson')
+        parser.add_argument('--gzip', action='store_true')
+        parser.add_argument('--chunk-size', type=int, default=2000,
+                            help='Rows fetched from the database at a time')
+
+    def handle(self, *args, **options):
+        if options['chunk_size'] < 1:
+            raise CommandError('--chunk-size must be at least 1')
+        os.makedirs(options['directory'], exist_ok=True)
+        kinds = [kind for kind in EXPORTS if kind in (options['only'] or EXPORTS)]
+
+        with read_transaction():
+            use_snapshot()
+            for kind in kinds:
+                count = self.export(kind, options)
+                self.stdout.write(f'Exported {count} {kind}')
+            # Nothing was written, so there is nothing to commit
+            transaction.set_rollback(True)
+
+    def export(self, kind, options):
+        model, columns = EXPORTS[kind]
+        names = [column.replace('user__', '') for column in columns]
+        filename = f'{kind}.{options["format"]}' + ('.gz' if options['gzip'] else '')
+        rows = (
+            model.objects.order_by('id')
+            .values_list(*columns)
+            .iterator(chunk_size=options['chunk_size'])
+        )
+
+        count = 0
+        path = os.path.join(options['directory'], filename)
+        with open_output(path, options['gzip']) as file:
+            if options['format'] == 'csv':
+                writer = csv.writer(file)
+                writer.writerow(names)
+                for row in rows:
+                    writer.writerow(row)
+                    count += 1
+            else:
+                encoder = DjangoJSONEncoder()
+                for row in rows:
+                    file.write(encoder.encode(dict(zip(names, row))))
+                    file.write('\n')
+                    count += 1
+        return count
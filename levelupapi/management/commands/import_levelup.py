@@ -0,0 +1,229 @@
+"""Stream game types, games or events from a CSV or NDJSON file into the database"""
+import csv
+import gzip
+import json
+from itertools import islice
+
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from levelupapi.models import Event, Game, Gamer, GameType
+from levelupapi.signals import bulk_changed
+
+
+class RowError(ValueError):
+    pass
+
+
+def open_text(path):
+    """Open a file for reading as text, unzipping it if it ends in .gz"""
+    if path.endswith('.gz'):
+        return gzip.open(path, 'rt', encoding='utf-8', newline='')
+    return open(path, 'r', encoding='utf-8', newline='')
+
+
+def file_format(path):
+    name = path[:-3] if path.endswith('.gz') else path
+    if name.endswith('.csv'):
+        return 'csv'
+    if name.endswith(('.ndjson', '.jsonl')):
+        return 'ndjson'
+    return None
+
+
+def read_rows(file, fmt):
+    """Yield (line number, row dictionary) for each row of the file"""
+    if fmt == 'csv':
+        reader = csv.DictReader(file)
+        for row in reader:
+            yield reader.line_num, row
+    else:
+        for line_number, line in enumerate(file, start=1):
+            if line.strip():
+                try:
+                    yield line_number, json.loads(line)
+                except json.JSONDecodeError as ex:
+                    yield line_number, RowError(f'invalid JSON: {ex}')
+
+
+def integer(row, column, required=True):
+    value = row.get(column)
+    if value in (None, ''):
+        if required:
+            raise RowError(f'{column} is required')
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError) as ex:
+        raise RowError(f'{column} must be a whole number, not {value!r}') from ex
+
+
+def text(row, column, max_length):
+    value = row.get(column)
+    if value in (None, ''):
+        raise RowError(f'{column} is required')
+    value = str(value)
+    if len(value) > max_length:
+        raise RowError(f'{column} is longer than {max_length} characters')
+    return value
+
+
+class Lookups:
+    """In memory tables for resolving foreign keys without a query per row"""
+
+    def __init__(self):
+        self._game_types = None
+        self._gamers = None
+
+    @property
+    def game_types(self):
+        """Game type label -> id, and id -> id"""
+        if self._game_types is None:
+            self._game_types = {}
+            for pk, label in GameType.objects.values_list('id', 'label').iterator():
+                self._game_types[label] = pk
+                self._game_types[pk] = pk
+        return self._game_types
+
+    @property
+    def gamers(self):
+        """Username -> gamer id, and gamer id -> gamer id"""
+        if self._gamers is None:
+            self._gamers = {}
+            for pk, username in Gamer.objects.values_list('id', 'user__username').iterator():
+                self._gamers[username] = pk
+                self._gamers[pk] = pk
+        return self._gamers
+
+    def game_type(self, row):
+        key = integer(row, 'game_type', required=False)
+        if key is None:
+            key = text(row, 'game_type_label', 50)
+        if key not in self.game_types:
+            raise RowError(f'no game type {key!r}')
+        return self.game_types[key]
+
+    def gamer(self, row, column):
+        key = integer(row, column, required=False)
+        if key is None:
+            key = text(row, f'{column}_username', 150)
+        if key not in self.gamers:
+            raise RowError(f'no gamer {key!r}')
+        return self.gamers[key]
+
+
+def build_game_type(row, lookups):
+    return GameType(id=integer(row, 'id', required=False), label=text(row, 'label', 50))
+
+
+def build_game(row, lookups):
+    return Game(
+        id=integer(row, 'id', required=False),
+        title=text(row, 'title', 50),
+        maker=text(row, 'maker', 50),
+        number_of_players=integer(row, 'number_of_players'),
+        skill_level=integer(row, 'skill_level'),
+        game_type_id=lookups.game_type(row),
+        gamer_id=lookups.gamer(row, 'gamer'),
+    )
+
+
+def build_event(row, lookups):
+    return Event(
+        id=integer(row, 'id', required=False),
+        game_id=integer(row, 'game'),
+        description=text(row, 'description', 90),
+        organizer_id=lookups.gamer(row, 'organizer'),
+    )
+
+
+# What can be imported, the model and how to build one from a row
+IMPORTS = {
+    'gametypes': (GameType, build_game_type),
+    'games': (Game, build_game),
+    'events': (Event, build_event),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        'Import game types, games or events from a CSV or NDJSON file (optionally '
+        'gzipped), streaming it in batches written with bulk inserts. Foreign keys '
+        'are given as ids, or as game_type_label, gamer_username and '
+        'organizer_username columns.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('kind', choices=IMPORTS)
+        parser.add_argument('path')
+        parser.add_argument('--format', choices=['csv', 'ndjson'],
+                            help='Defaults to the file extension')
+        parser.add_argument('--batch-size', type=int, default=5000,
+                            help='Rows read and inserted at a time')
+        parser.add_argument('--skip-invalid', action='store_true',
+                            help='Report and skip invalid rows instead of stopping')
+
+    def invalid(self, line_number, error, imported, options):
+        """Skip the row if asked to, otherwise stop the import"""
+        if not options['skip_invalid']:
+            raise CommandError(
+                f'Line {line_number}: {error}. {imported} rows were imported before it.')
+        self.stderr.write(f'Skipped line {line_number}: {error}')
+
+    def handle(self, *args, **options):
+        model, build = IMPORTS[options['kind']]
+        fmt = options['format'] or file_format(options['path'])
+        if fmt is None:
+            raise CommandError('Use a .csv or .ndjson file, or pass --format')
+
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be at least 1')
+
+        lookups = Lookups()
+        imported = skipped = 0
+        with open_text(options['path']) as file:
+            rows = read_rows(file, fmt)
+            while True:
+                batch = list(islice(rows, options['batch_size']))
+                if not batch:
+                    break
+
+                built = []
+                for line_number, row in batch:
+                    try:
+                        if isinstance(row, RowError):
+                            raise row
+                        if not isinstance(row, dict):
+                            raise RowError('expected an object')
+                        obj = build(row, lookups)
+                    except RowError as ex:
+                        self.invalid(line_number, ex, imported, options)
+                        skipped += 1
+                    else:
+                        built.append((line_number, obj))
+
+                if model is Event:
+                    # Games are too many to hold in memory, so check each batch's at once
+                    found = set(Game.objects.filter(
+                        id__in={obj.game_id for _, obj in built}).values_list('id', flat=True))
+                    for line_number, obj in built:
+                        if obj.game_id not in found:
+                            self.invalid(line_number, RowError(f'no game {obj.game_id}'),
+                                         imported, options)
+                            skipped += 1
+                    built = [(n, obj) for n, obj in built if obj.game_id in found]
+
+                objs = [obj for _, obj in built]
+
+                with transaction.atomic():
+                    model.objects.bulk_create(objs)
+                    bulk_changed.send(sender=model, instances=objs)
+                imported += len(objs)
+
+        # Rows imported with their ids leave sequences behind on some databases
+        with connection.cursor() as db_cursor:
+            for sql in connection.ops.sequence_reset_sql(no_style(), [model]):
+                db_cursor.execute(sql)
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Imported {imported} {options["kind"]}' + (f', skipped {skipped}' if skipped else '')))
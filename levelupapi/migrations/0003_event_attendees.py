@@ -0,0 +1,18 @@
+# Generated by Django 4.0.4 on 2026-10-18 14:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('levelupapi', '0002_gametype_label'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='attendees',
+            field=models.ManyToManyField(related_name='events', through='levelupapi.EventGamer', to='levelupapi.gamer'),
+        ),
+    ]
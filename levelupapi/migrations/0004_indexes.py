@@ -0,0 +1,63 @@
+# Generated by Django 4.0.4 on 2026-10-18 14:59
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('levelupapi', '0003_event_attendees'),
+    ]
+
+    operations = [
+        # Drop duplicate signups, keeping the first, so the unique
+        # constraint below can be created
+        migrations.RunSQL(
+            sql="""
+                DELETE FROM levelupapi_eventgamer
+                WHERE id NOT IN (
+                    SELECT MIN(id)
+                    FROM levelupapi_eventgamer
+                    GROUP BY event_id, gamer_id
+                )
+            """,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+        migrations.AlterField(
+            model_name='event',
+            name='game',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to='levelupapi.game'),
+        ),
+        migrations.AlterField(
+            model_name='eventgamer',
+            name='event',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to='levelupapi.event'),
+        ),
+        migrations.AlterField(
+            model_name='eventgamer',
+            name='gamer',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to='levelupapi.gamer'),
+        ),
+        migrations.AlterField(
+            model_name='game',
+            name='game_type',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to='levelupapi.gametype'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['game', 'id'], name='event_game_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='eventgamer',
+            index=models.Index(fields=['gamer', 'event'], name='eventgamer_gamer_event_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='game',
+            index=models.Index(fields=['game_type', 'id'], name='game_game_type_id_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='eventgamer',
+            constraint=models.UniqueConstraint(fields=('event', 'gamer'), name='unique_event_gamer'),
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 4.0.4 on 2026-10-18 15:11
+
+from django.db import migrations, models
+import django.db.models.functions.text
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('levelupapi', '0004_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['date'], name='event_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(django.db.models.functions.text.Lower('description'), name='event_description_lower_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='game',
+            index=models.Index(fields=['skill_level'], name='game_skill_level_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='game',
+            index=models.Index(fields=['number_of_players'], name='game_players_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='game',
+            index=models.Index(fields=['maker'], name='game_maker_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='game',
+            index=models.Index(django.db.models.functions.text.Lower('title'), name='game_title_lower_idx'),
+        ),
+    ]
@@ -0,0 +1,89 @@
+# Generated by Django 4.0.4 on 2026-10-18 15:12
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+# External content FTS5 tables: they index the game and event rows
+# without keeping a second copy, and the triggers keep them in step with
+# every insert, update and delete, bulk and raw SQL writes included.
+FTS_TABLES = {
+    # Title matches count ten times as much as maker matches
+    'levelupapi_game': ('levelupapi_game_fts', ['title', 'maker'], 'bm25(10.0, 1.0)'),
+    'levelupapi_event': ('levelupapi_event_fts', ['description'], 'bm25()'),
+}
+
+
+def fts_sql(table, fts, columns, rank):
+    names = ', '.join(columns)
+    new = ', '.join(f'new.{column}' for column in columns)
+    old = ', '.join(f'old.{column}' for column in columns)
+    return [
+        f"""CREATE VIRTUAL TABLE {fts} USING fts5(
+            {names}, content='{table}', content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2', prefix='2 3')""",
+        f"INSERT INTO {fts}({fts}, rank) VALUES ('rank', '{rank}')",
+        f"""CREATE TRIGGER {fts}_insert AFTER INSERT ON {table} BEGIN
+            INSERT INTO {fts}(rowid, {names}) VALUES (new.id, {new});
+        END""",
+        f"""CREATE TRIGGER {fts}_delete AFTER DELETE ON {table} BEGIN
+            INSERT INTO {fts}({fts}, rowid, {names}) VALUES ('delete', old.id, {old});
+        END""",
+        f"""CREATE TRIGGER {fts}_update AFTER UPDATE OF {names} ON {table} BEGIN
+            INSERT INTO {fts}({fts}, rowid, {names}) VALUES ('delete', old.id, {old});
+            INSERT INTO {fts}(rowid, {names}) VALUES (new.id, {new});
+        END""",
+        f"INSERT INTO {fts}({fts}) VALUES ('rebuild')",
+    ]
+
+
+def create_fts(apps, schema_editor):
+    """Only SQLite has FTS5, other databases search with the fallback"""
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for table, (fts, columns, rank) in FTS_TABLES.items():
+        for sql in fts_sql(table, fts, columns, rank):
+            schema_editor.execute(sql)
+
+
+def drop_fts(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for fts, _, _ in FTS_TABLES.values():
+        for trigger in ('insert', 'delete', 'update'):
+            schema_editor.execute(f'DROP TRIGGER IF EXISTS {fts}_{trigger}')
+        schema_editor.execute(f'DROP TABLE IF EXISTS {fts}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('levelupapi', '0005_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EventSearch',
+            fields=[
+                ('event', models.OneToOneField(db_column='rowid', db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, primary_key=True, related_name='fts', serialize=False, to='levelupapi.event')),
+                ('match', models.TextField(db_column='levelupapi_event_fts')),
+                ('rank', models.FloatField()),
+            ],
+            options={
+                'db_table': 'levelupapi_event_fts',
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='GameSearch',
+            fields=[
+                ('game', models.OneToOneField(db_column='rowid', db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, primary_key=True, related_name='fts', serialize=False, to='levelupapi.game')),
+                ('match', models.TextField(db_column='levelupapi_game_fts')),
+                ('rank', models.FloatField()),
+            ],
+            options={
+                'db_table': 'levelupapi_game_fts',
+                'managed': False,
+            },
+        ),
+        migrations.RunPython(create_fts, drop_fts),
+    ]
@@ -0,0 +1,52 @@
+# Generated by Django 4.0.4 on 2026-10-18 15:36
+
+from importlib import import_module
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+search = import_module('levelupapi.migrations.0006_search')
+
+
+def count_attendees(apps, schema_editor):
+    Event = apps.get_model('levelupapi', 'Event')
+    EventGamer = apps.get_model('levelupapi', 'EventGamer')
+    counts = EventGamer.objects.filter(
+        event=OuterRef('pk')
+    ).values('event').annotate(count=Count('pk')).values('count')
+    Event.objects.update(attendee_count=Coalesce(Subquery(counts), 0))
+
+
+def create_event_fts_triggers(apps, schema_editor):
+    """Adding or removing a column rebuilds the event table on SQLite,
+    dropping the triggers 0006_search put on it
+    """
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    fts, columns, rank = search.FTS_TABLES['levelupapi_event']
+    sql = search.fts_sql('levelupapi_event', fts, columns, rank)
+    for trigger in ('insert', 'delete', 'update'):
+        schema_editor.execute(f'DROP TRIGGER IF EXISTS {fts}_{trigger}')
+    # The triggers and the rebuild, not the table and its rank setting
+    for statement in sql[2:]:
+        schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('levelupapi', '0006_search'),
+    ]
+
+    operations = [
+        # Undoing AddField rebuilds the table too
+        migrations.RunPython(migrations.RunPython.noop, create_event_fts_triggers),
+        migrations.AddField(
+            model_name='event',
+            name='attendee_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(count_attendees, migrations.RunPython.noop),
+        migrations.RunPython(create_event_fts_triggers, migrations.RunPython.noop),
+    ]
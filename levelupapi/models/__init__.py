@@ -2,4 +2,5 @@ from .gamer import Gamer
 from .game_type import GameType
 from .game import Game
 from .event import Event
-from .event_gamer import EventGamer
\ No newline at end of file
+from .event_gamer import EventGamer
+from .search import GameSearch, EventSearch
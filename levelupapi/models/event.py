@@ -1,14 +1,31 @@
 from django.db import models
+from django.db.models.functions import Lower
 
 #inheritance Event is inheriting properties of models.Model
 class Event(models.Model):
-    game = models.ForeignKey("Game", on_delete=models.CASCADE)
+    # Indexed together with id below
+    game = models.ForeignKey("Game", on_delete=models.CASCADE, db_index=False)
     description = models.CharField(max_length=90)
     date = models.DateField(auto_now=True)
     time = models.TimeField(auto_now=True)
     organizer = models.ForeignKey("Gamer", on_delete=models.CASCADE)
     attendees = models.ManyToManyField('Gamer', through='EventGamer', related_name='events')
+    # How many attendees there are, so nothing has to count the join rows.
+    # levelupapi.signups keeps it up to date with the same statements that
+    # sign gamers up and take them off, levelupapi.signals recounts it
+    # after any other change to the attendees.
+    attendee_count = models.PositiveIntegerField(default=0, editable=False)
     
+    def save(self, *args, **kwargs):
+        # An event loaded before someone signed up must not write its
+        # stale attendee_count back over theirs
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name != 'attendee_count'
+            ]
+        super().save(*args, **kwargs)
+
     #saying joined is a property, this is the get | @property we put on a get
     @property
     def joined(self):
@@ -21,6 +38,17 @@ class Event(models.Model):
         self.__joined = value
         
         
+    class Meta:
+        indexes = [
+            # ?game= filtering walked in primary key order by the list
+            # pagination, without a sort
+            models.Index(fields=['game', 'id'], name='event_game_id_idx'),
+            # ?date_after=, ?date_before= and ?ordering=date
+            models.Index(fields=['date'], name='event_date_idx'),
+            # ?search=, a range over the lower cased description
+            models.Index(Lower('description'), name='event_description_lower_idx'),
+        ]
+
     #on delete - if the organizer gets deleted, this event will also get deleted
     #if this game gets deleted, then this event will be deleted too
     
\ No newline at end of file
@@ -2,8 +2,20 @@ from django.db import models
 
 
 class EventGamer(models.Model):
-    gamer = models.ForeignKey("Gamer", on_delete=models.CASCADE)
-    event = models.ForeignKey("Event", on_delete=models.CASCADE)
+    # Both foreign keys are covered by the composite indexes below, so
+    # they don't get an index of their own
+    gamer = models.ForeignKey("Gamer", on_delete=models.CASCADE, db_index=False)
+    event = models.ForeignKey("Event", on_delete=models.CASCADE, db_index=False)
     
     #many to many relationship
-    
\ No newline at end of file
+
+    class Meta:
+        constraints = [
+            # A gamer can only sign up for an event once. This is also the
+            # index the `joined` check and the attendee lists use.
+            models.UniqueConstraint(fields=['event', 'gamer'], name='unique_event_gamer'),
+        ]
+        indexes = [
+            # The other way around, for the events a gamer has joined
+            models.Index(fields=['gamer', 'event'], name='eventgamer_gamer_event_idx'),
+        ]
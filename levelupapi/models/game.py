@@ -1,10 +1,25 @@
 from django.db import models
+from django.db.models.functions import Lower
 
 
 class Game(models.Model):
-    game_type = models.ForeignKey("GameType", on_delete=models.CASCADE )
+    # Indexed together with id below
+    game_type = models.ForeignKey("GameType", on_delete=models.CASCADE, db_index=False)
     title = models.CharField(max_length=50)
     maker = models.CharField(max_length=50)
     gamer = models.ForeignKey("Gamer", on_delete=models.CASCADE)
     number_of_players = models.IntegerField()
-    skill_level = models.IntegerField()
\ No newline at end of file
+    skill_level = models.IntegerField()
+
+    class Meta:
+        indexes = [
+            # ?type= filtering walked in primary key order by the list
+            # pagination, without a sort
+            models.Index(fields=['game_type', 'id'], name='game_game_type_id_idx'),
+            # The other /games filters and orderings
+            models.Index(fields=['skill_level'], name='game_skill_level_idx'),
+            models.Index(fields=['number_of_players'], name='game_players_idx'),
+            models.Index(fields=['maker'], name='game_maker_idx'),
+            # ?search=, a range over the lower cased title
+            models.Index(Lower('title'), name='game_title_lower_idx'),
+        ]
@@ -0,0 +1,34 @@
+from django.db import models
+
+# The FTS5 tables behind /games/search and /events/search. They only
+# exist on SQLite, where migration 0006_search creates them along with
+# the triggers that keep them in step with every write to the game and
+# event tables. Django never writes to them.
+#
+# SQLite migrations that rebuild levelupapi_game or levelupapi_event drop
+# those triggers with the old table, so they have to create them again.
+
+
+class GameSearch(models.Model):
+    game = models.OneToOneField(
+        "Game", primary_key=True, db_column='rowid', related_name='fts',
+        on_delete=models.DO_NOTHING, db_constraint=False)
+    # The hidden column named after the table, `= %s` on it is a MATCH
+    match = models.TextField(db_column='levelupapi_game_fts')
+    rank = models.FloatField()
+
+    class Meta:
+        managed = False
+        db_table = 'levelupapi_game_fts'
+
+
+class EventSearch(models.Model):
+    event = models.OneToOneField(
+        "Event", primary_key=True, db_column='rowid', related_name='fts',
+        on_delete=models.DO_NOTHING, db_constraint=False)
+    match = models.TextField(db_column='levelupapi_event_fts')
+    rank = models.FloatField()
+
+    class Meta:
+        managed = False
+        db_table = 'levelupapi_event_fts'
@@ -0,0 +1,66 @@
+"""Full text search over games and events
+
+On SQLite the FTS5 tables from migration 0006_search find and rank the
+matches. Other databases fall back to case insensitive substring
+matching, which works without extra tables but scans.
+"""
+import re
+
+from django.db import connection
+from django.db.models import Case, IntegerField, Q, Value, When
+
+WORD = re.compile(r'\w+')
+
+
+def search_terms(text):
+    """The words of a search, at most ten of them"""
+    return WORD.findall(text.lower())[:10]
+
+
+def fts_query(terms):
+    """An FTS5 query matching rows with every term, the last one as a prefix
+    so results show up while the user is still typing
+
+    Each term is quoted, so nothing the user types is read as FTS5 syntax.
+    """
+    quoted = [f'"{term}"' for term in terms]
+    quoted[-1] += '*'
+    return ' '.join(quoted)
+
+
+def use_fts():
+    return connection.vendor == 'sqlite'
+
+
+def search_games(games, text):
+    """games matching text in the title or maker, best matches first"""
+    terms = search_terms(text)
+    if not terms:
+        return games.none()
+    if use_fts():
+        return games.filter(fts__match=fts_query(terms)).order_by('fts__rank', 'id')
+
+    matches = Q()
+    for term in terms:
+        matches &= Q(title__icontains=term) | Q(maker__icontains=term)
+    return games.filter(matches).annotate(
+        title_match=Case(
+            When(title__istartswith=terms[0], then=Value(0)),
+            default=Value(1),
+            output_field=IntegerField(),
+        )
+    ).order_by('title_match', 'id')
+
+
+def search_events(events, text):
+    """events matching text in the description, best matches first"""
+    terms = search_terms(text)
+    if not terms:
+        return events.none()
+    if use_fts():
+        return events.filter(fts__match=fts_query(terms)).order_by('fts__rank', 'id')
+
+    matches = Q()
+    for term in terms:
+        matches &= Q(description__icontains=term)
+    return events.filter(matches).order_by('id')
@@ -0,0 +1,149 @@
+"""Signal receivers that keep derived data in step with the models"""
+import weakref
+
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import Signal, receiver
+from rest_framework.authtoken.models import Token
+from levelupapi.authentication import forget_tokens
+from levelupapi.cache import bump_table_versions
+from levelupapi.models import Event, EventGamer, Game, Gamer, GameType
+
+# Sent after bulk writes, which skip the model save and delete signals,
+# with the instances that were created, updated or deleted
+bulk_changed = Signal()
+
+
+class PendingFlush:
+    """A flush waiting for the transaction to commit, with the ids for it"""
+
+    def __init__(self, flush, pending, key):
+        self.flush, self.pending, self.key = flush, pending, key
+        self.ids = set()
+
+    def __call__(self):
+        # Ids passed from here on are for another call
+        if self.pending.get(self.key) is self:
+            del self.pending[self.key]
+        self.flush(self.ids)
+
+
+# Per connection, the PendingFlush for each flush and savepoint. Only the
+# on_commit callbacks hold on to them, so when a rollback drops those
+# they drop out of here too.
+pending_flushes = weakref.WeakKeyDictionary()
+
+
+def once_on_commit(flush, ids):
+    """Call flush with ids when the transaction commits, once, together
+    with every other id passed for flush before then
+
+    Deleting a game deletes its events and their signups one signal at a
+    time; this turns a recount per row into one per transaction. Outside
+    a transaction flush runs right away, like transaction.on_commit().
+    """
+    ids = {pk for pk in ids if pk is not None}
+    connection = transaction.get_connection()
+    pending = pending_flushes.setdefault(connection, weakref.WeakValueDictionary())
+    # Only a call made in the same savepoint, which a rollback drops
+    # along with the rows it is for
+    key = (flush, tuple(connection.savepoint_ids))
+    call = pending.get(key)
+    if call is None:
+        call = pending[key] = PendingFlush(flush, pending, key)
+        call.ids.update(ids)
+        transaction.on_commit(call)
+    else:
+        call.ids.update(ids)
+
+
+# The table version each model bumps when it is written. Cached responses
+# and ETags list every table they are built from, nested ones included.
+TABLES = {
+    GameType: 'gametype',
+    Game: 'game',
+    Gamer: 'gamer',
+    Event: 'event',
+    EventGamer: 'eventgamer',
+}
+
+
+@receiver(post_save, sender=GameType)
+@receiver(post_save, sender=Game)
+@receiver(post_save, sender=Gamer)
+@receiver(post_save, sender=Event)
+@receiver(post_save, sender=EventGamer)
+@receiver(post_delete, sender=GameType)
+@receiver(post_delete, sender=Game)
+@receiver(post_delete, sender=Gamer)
+@receiver(post_delete, sender=Event)
+@receiver(post_delete, sender=EventGamer)
+def bump_table_version(sender, **kwargs):
+    bump_table_versions(TABLES[sender])
+
+
+@receiver(bulk_changed)
+def bump_bulk_table_version(sender, **kwargs):
+    bump_table_versions(TABLES[sender])
+
+
+@receiver(m2m_changed, sender=Event.attendees.through)
+def bump_attendees_version(sender, action, **kwargs):
+    """event.attendees.add() and friends skip the EventGamer save signals"""
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        bump_table_versions(TABLES[EventGamer])
+
+
+def recount_attendees(event_ids):
+    """Count the attendees of the events in event_ids again
+
+    levelupapi.signups changes attendee_count along with the attendees.
+    Everything else, like event.attendees.set() and deleting a gamer,
+    lands here through the receivers below, once the transaction commits.
+    """
+    counts = EventGamer.objects.filter(
+        event=OuterRef('pk')
+    ).values('event').annotate(count=Count('pk')).values('count')
+    Event.objects.filter(pk__in=set(event_ids)).update(
+        attendee_count=Coalesce(Subquery(counts), 0))
+
+
+@receiver(post_save, sender=EventGamer)
+@receiver(post_delete, sender=EventGamer)
+def recount_event_attendees(sender, instance, **kwargs):
+    once_on_commit(recount_attendees, [instance.event_id])
+
+
+@receiver(m2m_changed, sender=Event.attendees.through)
+def recount_changed_attendees(sender, instance, action, reverse, pk_set, **kwargs):
+    """The counts of the events attendees were added to or removed from;
+    from a gamer's side, gamer.events, that is every event in pk_set
+    """
+    if not reverse:
+        if action in ('post_add', 'post_remove', 'post_clear'):
+            once_on_commit(recount_attendees, [instance.pk])
+    elif action == 'pre_clear':
+        # The cleared rows are gone by post_clear, so find them now
+        instance._cleared_event_ids = list(instance.events.values_list('pk', flat=True))
+    elif action == 'post_clear':
+        once_on_commit(recount_attendees, instance._cleared_event_ids)
+    elif action in ('post_add', 'post_remove'):
+        once_on_commit(recount_attendees, pk_set)
+
+
+@receiver(post_save, sender=Token)
+@receiver(post_delete, sender=Token)
+def forget_changed_token(sender, instance, **kwargs):
+    forget_tokens([instance.key])
+
+
+@receiver(post_save, sender=User)
+@receiver(post_save, sender=Gamer)
+@receiver(post_delete, sender=Gamer)
+def forget_user_tokens(sender, instance, **kwargs):
+    """Cached tokens carry their user and gamer, which may have changed"""
+    user_id = instance.pk if sender is User else instance.user_id
+    forget_tokens(Token.objects.filter(user_id=user_id).values_list('key', flat=True))
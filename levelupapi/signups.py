@@ -0,0 +1,220 @@
+"""Signing gamers up for events, and taking them off again
+
+Every change to the attendees also changes Event.attendee_count, with
+F() expressions in the same transaction, and signups only go through
+while the event has room for them: fewer attendees than its game has
+players. Both are checked and written in the database, so concurrent
+signups can't overfill an event or lose a count.
+"""
+from django.db import connection, transaction
+from django.db.models import Case, F, OuterRef, Q, Subquery, Value, When
+from levelupapi.models import Event, EventGamer, Game, Gamer
+from levelupapi.signals import bulk_changed
+
+# Pairs handled per statement, keeping well under SQLite's parameter limit
+BATCH_SIZE = 250
+
+JOINED = 'joined'
+ALREADY_JOINED = 'already_joined'
+FULL = 'full'
+LEFT = 'left'
+NOT_JOINED = 'not_joined'
+EVENT_NOT_FOUND = 'event_not_found'
+GAMER_NOT_FOUND = 'gamer_not_found'
+
+
+def batches(pairs):
+    for start in range(0, len(pairs), BATCH_SIZE):
+        yield pairs[start:start + BATCH_SIZE]
+
+
+def existing_ids(model, ids):
+    return set(model.objects.filter(pk__in=set(ids)).values_list('pk', flat=True))
+
+
+def existing_signups(pairs):
+    """The (event id, gamer id) pairs in pairs that are already signed up"""
+    events = {event_id for event_id, _ in pairs}
+    gamers = {gamer_id for _, gamer_id in pairs}
+    return set(EventGamer.objects.filter(
+        event_id__in=events, gamer_id__in=gamers
+    ).values_list('event_id', 'gamer_id'))
+
+
+def has_room(seats):
+    """Events with room for seats more attendees"""
+    players = Game.objects.filter(pk=OuterRef('game_id')).values('number_of_players')
+    return Q(attendee_count__lte=Subquery(players) - seats)
+
+
+def locked_events(event_ids):
+    """The events in event_ids, locked until the transaction ends on
+    databases that lock rows. SQLite has the whole database locked already.
+    """
+    return Event.objects.select_for_update(of=('self',)).filter(pk__in=set(event_ids))
+
+
+def seats_left(event_ids):
+    """{event id: seats left} for the events in event_ids that exist"""
+    return dict(locked_events(event_ids).values_list(
+        'pk', F('game__number_of_players') - F('attendee_count')))
+
+
+def count_attendees(changes):
+    """Add {event id: change in attendees} to each event's attendee_count,
+    in one statement
+    """
+    changes = {event_id: change for event_id, change in changes.items() if change}
+    if not changes:
+        return
+    Event.objects.filter(pk__in=changes).update(attendee_count=F('attendee_count') + Case(
+        *[When(pk=event_id, then=Value(change)) for event_id, change in changes.items()],
+        default=Value(0),
+    ))
+
+
+def signup(event_id, gamer_id):
+    """Sign a gamer up for an event, if it has room
+
+    The signup is a single INSERT that does nothing when the gamer is
+    already signed up, so sending it twice, even at the same moment,
+    signs them up once.
+
+    Returns JOINED when the gamer was signed up, or ALREADY_JOINED, FULL
+    or EVENT_NOT_FOUND when nothing changed.
+    """
+    table = connection.ops.quote_name(EventGamer._meta.db_table)
+    events = connection.ops.quote_name(Event._meta.db_table)
+    with transaction.atomic(), connection.cursor() as db_cursor:
+        db_cursor.execute(
+            f"INSERT INTO {table} (event_id, gamer_id) "
+            f"SELECT id, %s FROM {events} WHERE id = %s "
+            "ON CONFLICT (event_id, gamer_id) DO NOTHING",
+            [gamer_id, event_id])
+        if not db_cursor.rowcount:
+            return ALREADY_JOINED if Event.objects.filter(pk=event_id).exists() else EVENT_NOT_FOUND
+        # Checking for room and taking the seat is one statement, so two
+        # gamers can't both get the last one
+        taken = Event.objects.filter(has_room(1), pk=event_id).update(
+            attendee_count=F('attendee_count') + 1)
+        if not taken:
+            transaction.set_rollback(True)
+            return FULL
+        bulk_changed.send(sender=EventGamer, instances=[
+            EventGamer(event_id=event_id, gamer_id=gamer_id)])
+    return JOINED
+
+
+def leave(event_id, gamer_id):
+    """Take a gamer off an event with a single DELETE
+
+    Returns LEFT when the gamer was taken off, or NOT_JOINED or
+    EVENT_NOT_FOUND when nothing changed.
+    """
+    table = connection.ops.quote_name(EventGamer._meta.db_table)
+    with transaction.atomic(), connection.cursor() as db_cursor:
+        db_cursor.execute(
+            f"DELETE FROM {table} WHERE event_id = %s AND gamer_id = %s",
+            [event_id, gamer_id])
+        # Only the request that really deleted the row counts it
+        if not db_cursor.rowcount:
+            return NOT_JOINED if Event.objects.filter(pk=event_id).exists() else EVENT_NOT_FOUND
+        count_attendees({event_id: -1})
+        bulk_changed.send(sender=EventGamer, instances=[
+            EventGamer(event_id=event_id, gamer_id=gamer_id)])
+    return LEFT
+
+
+def missing(pair, events, gamers):
+    """Why a pair can't be signed up or left, or None when it can"""
+    event_id, gamer_id = pair
+    if event_id not in events:
+        return EVENT_NOT_FOUND
+    if gamer_id not in gamers:
+        return GAMER_NOT_FOUND
+    return None
+
+
+def bulk_signup(pairs):
+    """Sign each (event id, gamer id) pair up, in one transaction
+
+    Returns the result of each pair, in order: JOINED, ALREADY_JOINED,
+    FULL, EVENT_NOT_FOUND or GAMER_NOT_FOUND. Events fill up in the order
+    the pairs were sent.
+    """
+    results = []
+    created = []
+    with transaction.atomic():
+        for batch in batches(pairs):
+            seats = seats_left([event_id for event_id, _ in batch])
+            gamers = existing_ids(Gamer, [gamer_id for _, gamer_id in batch])
+            signed_up = existing_signups(batch)
+
+            new = []
+            joined = dict.fromkeys(seats, 0)
+            for pair in batch:
+                result = missing(pair, seats, gamers)
+                if result is None and pair in signed_up:
+                    result = ALREADY_JOINED
+                elif result is None:
+                    result = JOINED if joined[pair[0]] < seats[pair[0]] else FULL
+                if result == JOINED:
+                    # A pair sent twice is only joined the first time
+                    signed_up.add(pair)
+                    joined[pair[0]] += 1
+                    new.append(EventGamer(event_id=pair[0], gamer_id=pair[1]))
+                results.append(result)
+
+            # The events are locked, so no other request added these rows
+            # since existing_signups looked
+            EventGamer.objects.bulk_create(new)
+            count_attendees(joined)
+            created.extend(new)
+
+        if created:
+            bulk_changed.send(sender=EventGamer, instances=created)
+    return results
+
+
+def bulk_leave(pairs):
+    """Take each (event id, gamer id) pair off its event, deleting each
+    batch with a single statement, in one transaction
+
+    Returns the result of each pair, in order: LEFT, NOT_JOINED,
+    EVENT_NOT_FOUND or GAMER_NOT_FOUND.
+    """
+    results = []
+    deleted = []
+    table = connection.ops.quote_name(EventGamer._meta.db_table)
+    with transaction.atomic(), connection.cursor() as db_cursor:
+        for batch in batches(pairs):
+            events = set(locked_events(
+                [event_id for event_id, _ in batch]).values_list('pk', flat=True))
+            gamers = existing_ids(Gamer, [gamer_id for _, gamer_id in batch])
+            signed_up = existing_signups(batch)
+
+            gone = []
+            left = {}
+            for pair in batch:
+                result = missing(pair, events, gamers)
+                if result is None:
+                    result = LEFT if pair in signed_up else NOT_JOINED
+                if result == LEFT:
+                    signed_up.discard(pair)
+                    gone.append(pair)
+                    left[pair[0]] = left.get(pair[0], 0) - 1
+                results.append(result)
+
+            if gone:
+                where = ' OR '.join(['(event_id = %s AND gamer_id = %s)'] * len(gone))
+                db_cursor.execute(
+                    f"DELETE FROM {table} WHERE {where}",
+                    [value for pair in gone for value in pair])
+                count_attendees(left)
+                deleted.extend(
+                    EventGamer(event_id=event_id, gamer_id=gamer_id)
+                    for event_id, gamer_id in gone)
+
+        if deleted:
+            bulk_changed.send(sender=EventGamer, instances=deleted)
+    return results
@@ -1,19 +1,56 @@
 """View module for handling requests about game types"""
 from django.http import HttpResponseServerError
+from django.db.models import Exists, OuterRef
 from rest_framework.viewsets import ViewSet
 from rest_framework.response import Response
 from rest_framework import serializers, status
-from levelupapi.models import Event, event
-from levelupapi.models.gamer import Gamer
+from levelupapi.models import Event, EventGamer, event
 from levelupapi.models.game import Game
 from django.core.exceptions import ValidationError
 from rest_framework.decorators import action
+from rest_framework.permissions import IsAdminUser
+from levelupapi import signups
+from levelupapi.cache import conditional_response
+from levelupapi.search import search_events
+from levelupapi.views.bulk import (BulkListSerializer, BulkWriteMixin,
+                                   PreloadedPrimaryKeyRelatedField)
+from levelupapi.views.filters import EVENT_ORDERINGS, filter_events, ordering_param
+from levelupapi.views.pagination import IdCursorPagination, SearchPagination
+from levelupapi.views.sparse import SparseFieldsMixin
+
+# Every table a serialized event is built from
+EVENT_TABLES = ('event', 'eventgamer', 'game', 'gamer')
+
+#this is based on event model and checks to make sure the user input is valid    
+class CreateEventSerializer(serializers.ModelSerializer):
+    """JSON serializer for game types
+    """
+    #lets /events/bulk check the games of every event with one query
+    serializer_related_field = PreloadedPrimaryKeyRelatedField
+
+    class Meta:
+        model = Event
+        #fields are a tuple! it must be iterable. if you only have one thing
+        # IT MUST END WITH A COMMA to make it a tuple 
+        fields = ('id', 'game', "description", "date", "time", "organizer","attendees","joined")
+        list_serializer_class = BulkListSerializer
+
 
 #inheriting ViewSet- it uses retrieve, and list, etc. 
 #we are overwriting the retrieve method to do whatever we want
-class EventView(ViewSet):
+class EventView(BulkWriteMixin, ViewSet):
     """Level up game types view"""
+    # /events/bulk validates each event like create does
+    bulk_serializer_class = CreateEventSerializer
+
+    def get_queryset(self, fields=None, expand=None):
+        """Events with everything EventSerializer nests loaded up front,
+        so serializing any number of events costs the same few queries.
+        With ?fields= or ?expand= only what is asked for is loaded.
+        """
+        return EventSerializer.sparse_queryset(Event.objects.all(), fields, expand)
 
+    @conditional_response(tables=EVENT_TABLES)
     def retrieve(self, request, pk):
         """Handle GET requests for single game type
 
@@ -23,41 +60,72 @@ class EventView(ViewSet):
         try:
             #pk = pk left side is the key you want to match from song
             #right side is the side you pass through and ask for
-            event = Event.objects.get(pk=pk)
-            serializer = EventSerializer(event)
+            options = EventSerializer.sparse_options(request)
+            event = self.get_queryset(**options).get(pk=pk)
+            serializer = EventSerializer(event, **options)
             return Response(serializer.data)
         except Event.DoesNotExist as ex:
             return Response({'message': ex.args[0]}, status=status.HTTP_404_NOT_FOUND)
         
 
+    # joined depends on who is asking, so each user gets their own ETag
+    @conditional_response(tables=EVENT_TABLES, per_user=True)
     def list(self, request):
-        """Handle GET requests to get all game types
+        """Handle GET requests to get all game types, filtered and
+        ordered as levelupapi.views.filters describes
 
         Returns:
             Response -- JSON serialized list of game types
         """
-        events = Event.objects.all()
-        gamer = Gamer.objects.get(user=request.auth.user)
-        game = request.query_params.get('game', None)
-        if game is not None:
-            events = events.filter(game_id = game)
-            
-        # Set the `joined` property on every event
-        for event in events:
-            # Check to see if the gamer is in the attendees list on the event
-            event.joined = gamer in event.attendees.all()
+        options = EventSerializer.sparse_options(request)
+        events = self.with_joined(self.get_queryset(**options), request, options)
+        events = filter_events(events, request.query_params)
+        ordering = ordering_param(request.query_params, EVENT_ORDERINGS)
+        if ordering is not None:
+            events = events.order_by(ordering, 'id')
+
+        # ?page_size= or ?cursor= switches on keyset pagination
+        paginator = IdCursorPagination(ordering)
+        if paginator.is_requested(request):
+            return paginator.paginated_response(events, EventSerializer, request, self, **options)
             
         #many =True means we want many fields back, default is false
-        serializer = EventSerializer(events, many=True)
+        serializer = EventSerializer(events, many=True, **options)
         return Response(serializer.data)
     
+    @action(methods=['get'], detail=False)
+    @conditional_response(tables=EVENT_TABLES, per_user=True)
+    def search(self, request):
+        """Handle GET requests to search event descriptions
+
+        Returns:
+            Response -- a page of JSON serialized events, best matches first
+        """
+        options = EventSerializer.sparse_options(request)
+        events = self.with_joined(self.get_queryset(**options), request, options)
+        events = search_events(events, request.query_params.get('q', ''))
+        return SearchPagination().paginated_response(
+            events, EventSerializer, request, self, **options)
+
+    def with_joined(self, events, request, options):
+        """Set the `joined` property on every event in the same query,
+        instead of asking the database about the attendees one event at a time
+        """
+        if options['fields'] is not None and 'joined' not in options['fields']:
+            return events
+        return events.annotate(
+            joined=Exists(
+                EventGamer.objects.filter(event=OuterRef('pk'), gamer=request.gamer)
+            )
+        )
+
     def create(self, request):
         """Handle POST operations
 
         Returns
             Response -- JSON serialized game instance
         """
-        organizer = Gamer.objects.get(user=request.auth.user)
+        organizer = request.gamer
         game = Game.objects.get(pk=request.data["game"])
         serializer = CreateEventSerializer(data=request.data)
         #raise exception -> tells user what they are sending is invalid
@@ -116,33 +184,94 @@ class EventView(ViewSet):
     
     @action(methods=['post'], detail=True)
     def signup(self, request, pk):
-        """Post request for a user to sign up for an event"""
+        """Post request for a user to sign up for an event, while it has room
 
-        gamer = Gamer.objects.get(user=request.auth.user)
-        event = Event.objects.get(pk=pk)
-        #when you do ADD - we are altering and saving to the database
-        #these get and add are kind of like sub queries, getting and changing things in database 
-        event.attendees.add(gamer)
+        Signing up again changes nothing and answers 200 instead of 201.
+        """
+
+        result = signups.signup(pk, request.gamer.id)
+        if result == signups.EVENT_NOT_FOUND:
+            return Response({'message': 'Event not found'}, status=status.HTTP_404_NOT_FOUND)
+        if result == signups.FULL:
+            return Response({'message': 'Event is full'}, status=status.HTTP_409_CONFLICT)
+        if result == signups.ALREADY_JOINED:
+            return Response({'message': 'Gamer already added'}, status=status.HTTP_200_OK)
         return Response({'message': 'Gamer added'}, status=status.HTTP_201_CREATED)
     
     @action(methods=['delete'], detail=True)
     def leave(self, request, pk):
-        """Post request for a user to sign up for an event"""
+        """Delete request for a user to leave an event
 
-        gamer = Gamer.objects.get(user=request.auth.user)
-        event = Event.objects.get(pk=pk)
-        event.attendees.remove(gamer)
+        Leaving an event the user hadn't joined changes nothing and
+        answers 200 instead of 204.
+        """
+
+        result = signups.leave(pk, request.gamer.id)
+        if result == signups.EVENT_NOT_FOUND:
+            return Response({'message': 'Event not found'}, status=status.HTTP_404_NOT_FOUND)
+        if result == signups.NOT_JOINED:
+            return Response({'message': 'Gamer was not signed up'}, status=status.HTTP_200_OK)
         return Response({'message': 'Gamer removed'}, status=status.HTTP_204_NO_CONTENT)   
+
+    @action(methods=['post'], detail=False, url_path='bulk-signup', permission_classes=[IsAdminUser])
+    def bulk_signup(self, request):
+        """Post request to sign many gamers up for many events at once
+
+        Expects {"signups": [{"event": 1, "gamer": 2}, ...]}
+
+        Returns:
+            Response -- the result of each signup, in the order they were sent
+        """
+        pairs = self.signup_pairs(request)
+        results = signups.bulk_signup(pairs)
+        return Response({'results': self.pair_results(pairs, results)})
+
+    @action(methods=['post'], detail=False, url_path='bulk-leave', permission_classes=[IsAdminUser])
+    def bulk_leave(self, request):
+        """Post request to take many gamers off many events at once
+
+        Expects {"signups": [{"event": 1, "gamer": 2}, ...]}
+
+        Returns:
+            Response -- the result of each signup, in the order they were sent
+        """
+        pairs = self.signup_pairs(request)
+        results = signups.bulk_leave(pairs)
+        return Response({'results': self.pair_results(pairs, results)})
+
+    def get_bulk_create_kwargs(self, request):
+        """Events created in bulk are organized by the gamer sending them, like create"""
+        return {'organizer': request.gamer}
+
+    def signup_pairs(self, request):
+        """The (event id, gamer id) pairs sent to a bulk action"""
+        if not isinstance(request.data, dict):
+            raise serializers.ValidationError({'signups': ['Expected an object with a list.']})
+        serializer = SignupSerializer(data=request.data.get('signups'), many=True)
+        serializer.is_valid(raise_exception=True)
+        return [(item['event'], item['gamer']) for item in serializer.validated_data]
+
+    def pair_results(self, pairs, results):
+        return [
+            {'event': event_id, 'gamer': gamer_id, 'result': result}
+            for (event_id, gamer_id), result in zip(pairs, results)
+        ]
     
 #Serializer -> taking data from Django and turning it into something we can use 
 #the data in serializer is like a dictionary   
 #a Serializer is a TRANSLATER - what a want and how I want to see it    
-class EventSerializer(serializers.ModelSerializer):
-    """JSON serializer for game types
+class EventSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    """JSON serializer for game types, trimmed by ?fields= and ?expand=
+
+    Events show how many attendees they have. The attendees themselves
+    are left out unless ?fields= or ?expand= asks for them.
     """
     class Meta:
         model = Event
-        fields = ('id', 'game', "description", "date", "time", "organizer","attendees","joined")
+        fields = ('id', 'game', "description", "date", "time", "organizer", "attendees",
+                  "attendee_count", "joined")
+        default_fields = ('id', 'game', "description", "date", "time", "organizer",
+                          "attendee_count", "joined")
         depth = 1
    #can do __all__ here on event serializer, cant do it below bc we
    #are trying to verify data
@@ -150,12 +279,10 @@ class EventSerializer(serializers.ModelSerializer):
     #SERIALIZERS - this is what i want back, this is how I want it
     #you can put in or leave out whatever you want to see. very cool 
  
- #this is based on event model and checks to make sure the user input is valid    
-class CreateEventSerializer(serializers.ModelSerializer):
-    """JSON serializer for game types
+#plain ids instead of related fields, so checking a thousand signups
+#doesn't look each event and gamer up on its own
+class SignupSerializer(serializers.Serializer):
+    """JSON serializer for one signup in the bulk signup and leave actions
     """
-    class Meta:
-        model = Event
-        #fields are a tuple! it must be iterable. if you only have one thing
-        # IT MUST END WITH A COMMA to make it a tuple 
-        fields = ('id', 'game', "description", "date", "time", "organizer","attendees","joined")
\ No newline at end of file
+    event = serializers.IntegerField()
+    gamer = serializers.IntegerField()
@@ -7,13 +7,44 @@ from rest_framework import serializers, status
 from levelupapi.models import game
 from levelupapi.models.game import Game
 from levelupapi.models.game_type import GameType
-from levelupapi.models.gamer import Gamer
 from django.core.exceptions import ValidationError
+from rest_framework.decorators import action
+from levelupapi.cache import cache_response, conditional_response
+from levelupapi.search import search_games
+from levelupapi.views.bulk import (BulkListSerializer, BulkWriteMixin,
+                                   PreloadedPrimaryKeyRelatedField)
+from levelupapi.views.filters import GAME_ORDERINGS, filter_games, ordering_param
+from levelupapi.views.pagination import IdCursorPagination, SearchPagination
+from levelupapi.views.sparse import SparseFieldsMixin
 
+# Every table a serialized game is built from
+GAME_TABLES = ('game', 'gametype', 'gamer')
 
-class GameView(ViewSet):
+#for the create method fields include
+#anything the client will send up
+class CreateGameSerializer(serializers.ModelSerializer):
+    #lets /games/bulk check the game types of every game with one query
+    serializer_related_field = PreloadedPrimaryKeyRelatedField
+
+    class Meta:
+        model = Game
+        fields = ('id', 'title', 'maker', 'number_of_players', 'skill_level', 'game_type')
+        list_serializer_class = BulkListSerializer
+
+
+class GameView(BulkWriteMixin, ViewSet):
     """Level up game types view"""
+    # /games/bulk validates each game like create does
+    bulk_serializer_class = CreateGameSerializer
 
+    def get_queryset(self, fields=None, expand=None):
+        """Games with the gamer and game type GameSerializer nests
+        joined in, so serializing any number of games is a single query.
+        With ?fields= or ?expand= only what is asked for is loaded.
+        """
+        return GameSerializer.sparse_queryset(Game.objects.all(), fields, expand)
+
+    @conditional_response(tables=GAME_TABLES)
     def retrieve(self, request, pk):
         """Handle GET requests for single game type
 
@@ -21,39 +52,63 @@ class GameView(ViewSet):
             Response -- JSON serialized game type
         """
         try:
-            game = Game.objects.get(pk=pk)
-            serializer = GameSerializer(game)
+            options = GameSerializer.sparse_options(request)
+            game = self.get_queryset(**options).get(pk=pk)
+            serializer = GameSerializer(game, **options)
             return Response(serializer.data)
         except Game.DoesNotExist as ex:
             return Response({'message': ex.args[0]}, status=status.HTTP_404_NOT_FOUND)
         
 
+    @conditional_response(tables=GAME_TABLES)
+    @cache_response('games', tables=GAME_TABLES)
     def list(self, request):
-        """Handle GET requests to get all game types
+        """Handle GET requests to get all game types, filtered and
+        ordered as levelupapi.views.filters describes
 
         Returns:
             Response -- JSON serialized list of game types
         """
-        games = Game.objects.all()
+        options = GameSerializer.sparse_options(request)
+        games = self.get_queryset(**options)
         
         #'type' argument, if you do a fetch call, it needs to match the query parameter
         #kind of like useParams in front end
         #type is what the url is sending in 
         #we make the rules. we chose the work type 
-        game_type = request.query_params.get('type', None)
-        if game_type is not None:
-            games = games.filter(game_type_id=game_type)
+        games = filter_games(games, request.query_params)
+        ordering = ordering_param(request.query_params, GAME_ORDERINGS)
+        if ordering is not None:
+            games = games.order_by(ordering, 'id')
+
+        # ?page_size= or ?cursor= switches on keyset pagination
+        paginator = IdCursorPagination(ordering)
+        if paginator.is_requested(request):
+            return paginator.paginated_response(games, GameSerializer, request, self, **options)
     
-        serializer = GameSerializer(games, many=True)
+        serializer = GameSerializer(games, many=True, **options)
         return Response(serializer.data)
     
+    @action(methods=['get'], detail=False)
+    @conditional_response(tables=GAME_TABLES)
+    def search(self, request):
+        """Handle GET requests to search game titles and makers
+
+        Returns:
+            Response -- a page of JSON serialized games, best matches first
+        """
+        options = GameSerializer.sparse_options(request)
+        games = search_games(self.get_queryset(**options), request.query_params.get('q', ''))
+        return SearchPagination().paginated_response(
+            games, GameSerializer, request, self, **options)
+
     def create(self, request):
         """Handle POST operations
 
         Returns:
             Response -- JSON serialized game instance
         """
-        gamer = Gamer.objects.get(user=request.auth.user)
+        gamer = request.gamer
         #make and instance of it
         serializer = CreateGameSerializer(data=request.data)
         #raise exception=True - this field is required
@@ -93,20 +148,17 @@ class GameView(ViewSet):
         game = Game.objects.get(pk=pk)
         game.delete()
         return Response(None, status=status.HTTP_204_NO_CONTENT)
+
+    def get_bulk_create_kwargs(self, request):
+        """Games created in bulk belong to the gamer sending them, like create"""
+        return {'gamer': request.gamer}
     
     
 
-class GameSerializer(serializers.ModelSerializer):
-    """JSON serializer for game types
+class GameSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    """JSON serializer for game types, trimmed by ?fields= and ?expand=
     """
     class Meta:
         model = Game
         fields = ('id', "gamer", "title", "maker", "number_of_players", "skill_level", 'game_type')
         depth = 1
-        
-#for the create method fields include
-#anything the client will send up
-class CreateGameSerializer(serializers.ModelSerializer):
-    class Meta:
-        model = Game
-        fields = ('id', 'title', 'maker', 'number_of_players', 'skill_level', 'game_type')
\ No newline at end of file
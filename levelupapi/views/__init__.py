@@ -4,4 +4,5 @@ from .game_type import GameTypeSerializer
 from .EventView import EventView
 from .EventView import EventSerializer
 from .GameView import GameSerializer
-from .GameView import GameView
\ No newline at end of file
+from .GameView import GameView
+from .cache_stats import cache_stats_view
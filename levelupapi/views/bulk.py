@@ -0,0 +1,172 @@
+"""Creating and updating many rows in one request"""
+import copy
+
+from django.db import transaction
+from django.db.models import prefetch_related_objects
+from rest_framework import serializers, status
+from rest_framework.decorators import action
+from rest_framework.response import Response
+from levelupapi.signals import bulk_changed
+
+# Rows written per statement and per transaction
+BATCH_SIZE = 1000
+
+
+class PreloadedPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    """A PrimaryKeyRelatedField that BulkListSerializer can hand every
+    related object it needs up front, instead of it querying per item
+    """
+    preloaded = None
+
+    def preload(self, pks):
+        self.preloaded = self.get_queryset().in_bulk(pks)
+
+    def to_internal_value(self, data):
+        if self.preloaded is None:
+            return super().to_internal_value(data)
+        try:
+            return self.preloaded[int(data)]
+        except (TypeError, ValueError, KeyError):
+            # Let the normal lookup come up with the error message
+            return super().to_internal_value(data)
+
+
+class BulkListSerializer(serializers.ListSerializer):
+    """Validates a list of items with one query per related field,
+    rather than one per related field per item
+    """
+
+    def to_internal_value(self, data):
+        if isinstance(data, list):
+            for name, field in self.child.fields.items():
+                if isinstance(field, PreloadedPrimaryKeyRelatedField) and not field.read_only:
+                    field.preload({
+                        item[name] for item in data
+                        if isinstance(item, dict) and isinstance(item.get(name), (int, str))
+                    })
+        try:
+            return super().to_internal_value(data)
+        finally:
+            for field in self.child.fields.values():
+                if isinstance(field, PreloadedPrimaryKeyRelatedField):
+                    field.preloaded = None
+
+
+def batches(items):
+    for start in range(0, len(items), BATCH_SIZE):
+        yield items[start:start + BATCH_SIZE]
+
+
+class BulkWriteMixin:
+    """Adds /<resource>/bulk to a viewset: POST a list to create them all,
+    PATCH a list of partial items, each with its id, to update them all
+
+    bulk_serializer_class is the serializer that validates each item, or
+    override get_bulk_serializer_class() to pick one per request. Its Meta should use BulkListSerializer and
+    PreloadedPrimaryKeyRelatedField, so validation doesn't query per item.
+    Rows are written with bulk_create/bulk_update, BATCH_SIZE at a time,
+    each batch in its own transaction.
+    """
+
+    bulk_serializer_class = None
+
+    def get_bulk_serializer_class(self):
+        assert self.bulk_serializer_class is not None, (
+            f"'{self.__class__.__name__}' should either include a `bulk_serializer_class` "
+            "attribute, or override the `get_bulk_serializer_class()` method."
+        )
+        return self.bulk_serializer_class
+
+    def get_bulk_create_kwargs(self, request):
+        """Values every created row gets, like the single create's save()"""
+        return {}
+
+    @action(methods=['post', 'patch'], detail=False, url_path='bulk')
+    def bulk(self, request):
+        if request.method == 'PATCH':
+            return self.bulk_update(request)
+        return self.bulk_create(request)
+
+    def bulk_create(self, request):
+        """Handle POST requests with a list of rows to create
+
+        Returns:
+            Response -- JSON serialized list of the created rows
+        """
+        serializer_class = self.get_bulk_serializer_class()
+        serializer = serializer_class(data=request.data, many=True)
+        serializer.is_valid(raise_exception=True)
+
+        model = serializer_class.Meta.model
+        extra = self.get_bulk_create_kwargs(request)
+        created = [model(**{**item, **extra}) for item in serializer.validated_data]
+        for batch in batches(created):
+            with transaction.atomic():
+                model.objects.bulk_create(batch)
+                bulk_changed.send(sender=model, instances=batch)
+
+        # Load the many to many fields the response shows in one go
+        many_related = [
+            field.source for field in serializer.child.fields.values()
+            if isinstance(field, serializers.ManyRelatedField)
+        ]
+        prefetch_related_objects(created, *many_related)
+        return Response(
+            serializer_class(created, many=True).data,
+            status=status.HTTP_201_CREATED
+        )
+
+    def bulk_update(self, request):
+        """Handle PATCH requests with a list of partial rows to update
+
+        Returns:
+            Response -- Empty body with 204 status code
+        """
+        if not isinstance(request.data, list):
+            raise serializers.ValidationError('Expected a list of items.')
+        ids = [item.get('id') if isinstance(item, dict) else None for item in request.data]
+        if not all(isinstance(pk, int) for pk in ids):
+            raise serializers.ValidationError('Every item needs an id.')
+        if len(set(ids)) != len(ids):
+            raise serializers.ValidationError('Every item needs a different id.')
+
+        serializer_class = self.get_bulk_serializer_class()
+        model = serializer_class.Meta.model
+        instances = model.objects.in_bulk(ids)
+        unknown = [pk for pk in ids if pk not in instances]
+        if unknown:
+            return Response(
+                {'message': f'No {model._meta.verbose_name} with ids {unknown}'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+
+        serializer = serializer_class(
+            [instances[pk] for pk in ids], data=request.data, many=True, partial=True)
+        serializer.is_valid(raise_exception=True)
+
+        # Updated fields, plus auto_now ones like a save() would set
+        auto_now = [
+            field for field in model._meta.concrete_fields
+            if getattr(field, 'auto_now', False)
+        ]
+        fields = {name for item in serializer.validated_data for name in item}
+        fields.update(field.name for field in auto_now)
+
+        updated = []
+        previous = []
+        for pk, item in zip(ids, serializer.validated_data):
+            instance = instances[pk]
+            previous.append(copy.copy(instance))
+            for name, value in item.items():
+                setattr(instance, name, value)
+            for field in auto_now:
+                field.pre_save(instance, add=False)
+            updated.append(instance)
+
+        for batch, old in zip(batches(updated), batches(previous)):
+            with transaction.atomic():
+                model.objects.bulk_update(batch, fields)
+                # The previous values too, in case a row changed owner
+                bulk_changed.send(sender=model, instances=batch + old)
+
+        return Response(None, status=status.HTTP_204_NO_CONTENT)
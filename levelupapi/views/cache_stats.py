@@ -0,0 +1,16 @@
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+
+from levelupapi.cache import CACHED_ENDPOINTS, cache_stats
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def cache_stats_view(request):
+    '''Reports the response cache hits and misses of each endpoint
+
+    Method arguments:
+      request -- The full HTTP request object
+    '''
+    return Response(cache_stats(CACHED_ENDPOINTS))
@@ -0,0 +1,112 @@
+"""Query string filters, ordering and search for /games and /events
+
+Every filter here turns into a predicate one of the model indexes can
+answer, see tests/test_filter_plans.py. Search is a case insensitive
+prefix match written as a range over LOWER(column), which the
+expression indexes can seek into; LIKE and icontains can't use them.
+SQLite's LOWER() only folds A to Z, so there "É" only matches "É".
+"""
+import datetime
+import string
+
+from django.db import connections
+from django.db.models.functions import Lower
+from rest_framework import serializers
+
+
+def integer_param(params, name):
+    value = params.get(name)
+    if value in (None, ''):
+        return None
+    try:
+        return int(value)
+    except ValueError as ex:
+        raise serializers.ValidationError({name: ['A whole number is required.']}) from ex
+
+
+def date_param(params, name):
+    value = params.get(name)
+    if value in (None, ''):
+        return None
+    try:
+        return datetime.date.fromisoformat(value)
+    except ValueError as ex:
+        raise serializers.ValidationError({name: ['A date like 2022-05-01 is required.']}) from ex
+
+
+ASCII_LOWER = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+
+
+def database_lower(text, vendor):
+    """text lower cased the way LOWER() does it on vendor's databases"""
+    if vendor == 'sqlite':
+        return text.translate(ASCII_LOWER)
+    return text.lower()
+
+
+def prefix_range(prefix, vendor):
+    """The (low, high) bounds of every LOWER(column) that starts with prefix"""
+    prefix = database_lower(prefix, vendor)
+    return prefix, prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+def search(queryset, params, field):
+    """Keep rows whose field starts with ?search=, ignoring case"""
+    prefix = params.get('search', '')
+    if not prefix:
+        return queryset
+    low, high = prefix_range(prefix, connections[queryset.db].vendor)
+    return queryset.alias(**{f'{field}_lower': Lower(field)}).filter(**{
+        f'{field}_lower__gte': low,
+        f'{field}_lower__lt': high,
+    })
+
+
+def ordering_param(params, allowed):
+    """?ordering= as a model field name, with an optional - for descending"""
+    ordering = params.get('ordering')
+    if ordering in (None, ''):
+        return None
+    if ordering.lstrip('-') not in allowed:
+        raise serializers.ValidationError(
+            {'ordering': [f'Choose one of {", ".join(allowed)}, optionally with a -.']})
+    return ordering
+
+
+# What /games and /events can be ordered by. Each one is indexed.
+GAME_ORDERINGS = ('id', 'skill_level', 'number_of_players')
+EVENT_ORDERINGS = ('id', 'date')
+
+
+def filter_games(games, params):
+    """Apply the /games filters
+
+    ?type=, ?maker= and ?players= match exactly, ?skill_level_min= and
+    ?skill_level_max= are inclusive bounds and ?search= matches the
+    start of the title.
+    """
+    filters = {
+        'game_type_id': integer_param(params, 'type'),
+        'number_of_players': integer_param(params, 'players'),
+        'skill_level__gte': integer_param(params, 'skill_level_min'),
+        'skill_level__lte': integer_param(params, 'skill_level_max'),
+        'maker': params.get('maker') or None,
+    }
+    games = games.filter(**{name: value for name, value in filters.items() if value is not None})
+    return search(games, params, 'title')
+
+
+def filter_events(events, params):
+    """Apply the /events filters
+
+    ?game= and ?organizer= match exactly, ?date_after= and ?date_before=
+    are inclusive bounds and ?search= matches the start of the description.
+    """
+    filters = {
+        'game_id': integer_param(params, 'game'),
+        'organizer_id': integer_param(params, 'organizer'),
+        'date__gte': date_param(params, 'date_after'),
+        'date__lte': date_param(params, 'date_before'),
+    }
+    events = events.filter(**{name: value for name, value in filters.items() if value is not None})
+    return search(events, params, 'description')
@@ -4,11 +4,14 @@ from rest_framework.viewsets import ViewSet
 from rest_framework.response import Response
 from rest_framework import serializers, status
 from levelupapi.models import GameType
+from levelupapi.cache import cache_response, conditional_response
+from levelupapi.views.sparse import SparseFieldsMixin
 
 
 class GameTypeView(ViewSet):
     """Level up game types view"""
 
+    @conditional_response(tables=('gametype',))
     def retrieve(self, request, pk):
         """Handle GET requests for single game type
 
@@ -16,24 +19,28 @@ class GameTypeView(ViewSet):
             Response -- JSON serialized game type
         """
         try:
-            game_type = GameType.objects.get(pk=pk)
-            serializer = GameTypeSerializer(game_type)
+            options = GameTypeSerializer.sparse_options(request)
+            game_type = GameTypeSerializer.sparse_queryset(GameType.objects.all(), **options).get(pk=pk)
+            serializer = GameTypeSerializer(game_type, **options)
             return Response(serializer.data)
         except GameType.DoesNotExist as ex:
             return Response({'message': ex.args[0]}, status=status.HTTP_404_NOT_FOUND) 
 
+    @conditional_response(tables=('gametype',))
+    @cache_response('gametypes', tables=('gametype',))
     def list(self, request):
         """Handle GET requests to get all game types
 
         Returns:
             Response -- JSON serialized list of game types
         """
-        game_types = GameType.objects.all()
-        serializer = GameTypeSerializer(game_types, many=True)
+        options = GameTypeSerializer.sparse_options(request)
+        game_types = GameTypeSerializer.sparse_queryset(GameType.objects.all(), **options)
+        serializer = GameTypeSerializer(game_types, many=True, **options)
         return Response(serializer.data)
 
-class GameTypeSerializer(serializers.ModelSerializer):
-    """JSON serializer for game types
+class GameTypeSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    """JSON serializer for game types, trimmed by ?fields=
     """
     class Meta:
         model = GameType
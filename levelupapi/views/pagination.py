@@ -0,0 +1,134 @@
+"""Pagination shared by the list endpoints"""
+import json
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import Cursor, CursorPagination, PageNumberPagination
+
+
+class IdCursorPagination(CursorPagination):
+    """Keyset pagination over the primary key, or over another column and id
+
+    Pages are fetched with `WHERE id > <last id> ORDER BY id LIMIT n`, or
+    with `WHERE (column, id) > (<last value>, <last id>)` when the list is
+    ordered by a column, so a deep page costs the same as the first one
+    however many rows share a value. The cursor holds the whole key of the
+    last row; DRF's own cursors only hold the column and fall back to an
+    OFFSET for ties, which stops working past offset_cutoff.
+
+    It is opt-in: list endpoints only paginate when the client sends
+    `cursor` or `page_size`.
+    """
+    ordering = ('id',)
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 1000
+
+    def __init__(self, ordering=None):
+        if ordering:
+            # Page through another column instead, with ties in id order
+            self.ordering = (ordering, 'id')
+
+    def is_requested(self, request):
+        """Did the client ask for a paginated response?"""
+        return (
+            self.cursor_query_param in request.query_params or
+            self.page_size_query_param in request.query_params
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.page_size = self.get_page_size(request)
+        self.base_url = request.build_absolute_uri()
+        self.cursor = self.decode_cursor(request)
+        reverse = self.cursor is not None and self.cursor.reverse
+
+        ordering = [
+            field[1:] if reverse and field.startswith('-') else
+            f'-{field}' if reverse else field
+            for field in self.ordering
+        ]
+        queryset = queryset.order_by(*ordering)
+        if self.cursor is not None and self.cursor.position is not None:
+            queryset = queryset.filter(self.after(queryset.model, ordering, self.cursor.position))
+
+        # One more than a page tells whether there is another page
+        results = list(queryset[:self.page_size + 1])
+        self.page = results[:self.page_size]
+        more = len(results) > self.page_size
+        if reverse:
+            self.page.reverse()
+            # A reversed cursor came from the page after this one
+            self.has_next, self.has_previous = True, more
+        else:
+            self.has_next = more
+            self.has_previous = self.cursor is not None and self.cursor.position is not None
+        return self.page
+
+    def after(self, model, ordering, position):
+        """The rows after position, the key of a row in ordering
+
+        (a, b) > (x, y) is written out as a > x OR (a = x AND b > y), which
+        works for mixed directions and on every database.
+        """
+        try:
+            values = json.loads(position)
+            if len(values) != len(ordering):
+                raise ValueError(position)
+            values = [
+                model._meta.get_field(field.lstrip('-')).to_python(value)
+                for field, value in zip(ordering, values)
+            ]
+        except (TypeError, ValueError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+        condition = Q()
+        for field, value in reversed(list(zip(ordering, values))):
+            name = field.lstrip('-')
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            later = Q(**{f'{name}__{lookup}': value})
+            condition = later if not condition else later | Q(**{name: value}) & condition
+        return condition
+
+    def position(self, instance):
+        """The key of instance, for a cursor"""
+        return json.dumps([
+            str(getattr(instance, field.lstrip('-'))) for field in self.ordering
+        ], separators=(',', ':'))
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        position = self.position(self.page[-1]) if self.page else self.cursor.position
+        return self.encode_cursor(Cursor(offset=0, reverse=False, position=position))
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        position = self.position(self.page[0]) if self.page else self.cursor.position
+        return self.encode_cursor(Cursor(offset=0, reverse=True, position=position))
+
+    def paginated_response(self, queryset, serializer_class, request, view, **kwargs):
+        """Serialize a single page of queryset with the next/previous links,
+        passing any other keyword arguments on to the serializer
+        """
+        page = self.paginate_queryset(queryset, request, view=view)
+        serializer = serializer_class(page, many=True, **kwargs)
+        return self.get_paginated_response(serializer.data)
+
+
+class SearchPagination(PageNumberPagination):
+    """Numbered pages for search results
+
+    Results are ordered by rank, not id, so they can't be paged with a
+    cursor; all the matches are ranked on every request anyway.
+    """
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+    def paginated_response(self, queryset, serializer_class, request, view, **kwargs):
+        """Serialize a single page of queryset with the count and links"""
+        page = self.paginate_queryset(queryset, request, view=view)
+        serializer = serializer_class(page, many=True, **kwargs)
+        return self.get_paginated_response(serializer.data)
@@ -0,0 +1,116 @@
+"""?fields= and ?expand= for the serializers behind the list and detail endpoints"""
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch
+from rest_framework import serializers
+
+
+def split_param(request, name):
+    """The comma separated values of a query parameter, or None if it wasn't sent"""
+    if name not in request.query_params:
+        return None
+    return [value.strip() for value in request.query_params[name].split(',') if value.strip()]
+
+
+class SparseFieldsMixin:
+    """ModelSerializer mixin that returns only the fields a client asks for
+
+    `?fields=id,description` keeps just those fields. `?expand=game` nests
+    the game and returns every other relation as ids. Without either
+    parameter the output is what Meta.fields and Meta.depth say it is.
+    Meta.default_fields, when there is one, are the fields shown without
+    ?fields=; the rest of Meta.fields can still be asked for, and
+    expanding a relation shows it.
+
+    The view passes the parsed parameters to the serializer and to
+    sparse_queryset(), which leaves out the columns, joins and prefetches
+    the trimmed fields would have needed.
+    """
+
+    def __init__(self, *args, fields=None, expand=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.only_fields = fields
+        self.expand = expand
+
+    @classmethod
+    def model_field(cls, name):
+        try:
+            return cls.Meta.model._meta.get_field(name)
+        except FieldDoesNotExist:
+            return None
+
+    @classmethod
+    def relations(cls):
+        """The names in Meta.fields that nest another model"""
+        return [
+            name for name in cls.Meta.fields
+            if getattr(cls.model_field(name), 'is_relation', False)
+        ]
+
+    @classmethod
+    def selected_fields(cls, fields=None, expand=None):
+        """The names of the fields to show"""
+        if fields is not None:
+            return fields
+        default = list(getattr(cls.Meta, 'default_fields', cls.Meta.fields))
+        return default + [name for name in expand or () if name not in default]
+
+    @classmethod
+    def sparse_options(cls, request):
+        """The fields and expand arguments asked for in the query string
+
+        Raises:
+            ValidationError -- for names the serializer doesn't have, which
+            the view turns into a 400
+        """
+        fields = split_param(request, 'fields')
+        expand = split_param(request, 'expand')
+        errors = {}
+        if fields is not None and set(fields) - set(cls.Meta.fields):
+            errors['fields'] = [
+                f'Unknown fields: {", ".join(sorted(set(fields) - set(cls.Meta.fields)))}'
+            ]
+        if expand is not None and set(expand) - set(cls.relations()):
+            errors['expand'] = [
+                f'Cannot expand: {", ".join(sorted(set(expand) - set(cls.relations())))}'
+            ]
+        if errors:
+            raise serializers.ValidationError(errors)
+        return {'fields': fields, 'expand': expand}
+
+    @classmethod
+    def sparse_queryset(cls, queryset, fields=None, expand=None):
+        """queryset loading only what serializing fields and expand needs"""
+        columns, joins, prefetches = [], [], []
+        for name in cls.selected_fields(fields, expand):
+            field = cls.model_field(name)
+            if field is None:
+                # Properties and annotations, the view takes care of those
+                continue
+            expanded = field.is_relation and (expand is None or name in expand)
+            if field.many_to_many:
+                # Ids only need the join table, not the related rows
+                prefetches.append(name if expanded else Prefetch(
+                    name, queryset=field.related_model.objects.only('pk')))
+            else:
+                columns.append(name)
+                if expanded:
+                    joins.append(name)
+
+        if fields is not None:
+            queryset = queryset.only('pk', *columns)
+        if joins:
+            queryset = queryset.select_related(*joins)
+        if prefetches:
+            queryset = queryset.prefetch_related(*prefetches)
+        return queryset
+
+    def get_fields(self):
+        fields = super().get_fields()
+        selected = set(self.selected_fields(self.only_fields, self.expand))
+        fields = {name: field for name, field in fields.items() if name in selected}
+        if self.expand is not None:
+            for name in self.relations():
+                if name in fields and name not in self.expand:
+                    fields[name] = serializers.PrimaryKeyRelatedField(
+                        read_only=True, many=self.model_field(name).many_to_many)
+        return fields
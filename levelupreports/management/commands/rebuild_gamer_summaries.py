@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from levelupreports.summaries import rebuild_gamer_summaries
+
+
+class Command(BaseCommand):
+    help = 'Recount the gamer summaries behind /reports/gamersummaries from scratch'
+
+    def handle(self, *args, **options):
+        count = rebuild_gamer_summaries()
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {count} gamer summaries'))
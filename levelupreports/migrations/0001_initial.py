@@ -0,0 +1,43 @@
+# Generated by Django 4.0.4 on 2026-10-18 14:56
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('levelupapi', '0003_event_attendees'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GamerSummary',
+            fields=[
+                ('gamer', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='summary', serialize=False, to='levelupapi.gamer')),
+                ('full_name', models.CharField(max_length=301)),
+                ('games_owned', models.PositiveIntegerField(default=0)),
+                ('events_organized', models.PositiveIntegerField(default=0)),
+                ('events_attended', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        # Count everything that already exists, like rebuild_gamer_summaries
+        migrations.RunSQL(
+            sql="""
+                INSERT INTO levelupreports_gamersummary
+                    (gamer_id, full_name, games_owned, events_organized, events_attended)
+                SELECT
+                    gr.id,
+                    u.first_name || ' ' || u.last_name,
+                    (SELECT COUNT(*) FROM levelupapi_game g WHERE g.gamer_id = gr.id),
+                    (SELECT COUNT(*) FROM levelupapi_event e WHERE e.organizer_id = gr.id),
+                    (SELECT COUNT(*) FROM levelupapi_eventgamer eg WHERE eg.gamer_id = gr.id)
+                FROM levelupapi_gamer gr
+                JOIN auth_user u
+                    ON u.id = gr.user_id
+            """,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
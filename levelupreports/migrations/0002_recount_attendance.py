@@ -0,0 +1,24 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('levelupapi', '0004_indexes'),
+        ('levelupreports', '0001_initial'),
+    ]
+
+    operations = [
+        # levelupapi 0004 deleted duplicate signups, recount what they attend
+        migrations.RunSQL(
+            sql="""
+                UPDATE levelupreports_gamersummary
+                SET events_attended = (
+                    SELECT COUNT(*)
+                    FROM levelupapi_eventgamer eg
+                    WHERE eg.gamer_id = levelupreports_gamersummary.gamer_id
+                )
+            """,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
@@ -0,0 +1 @@
+from .gamer_summary import GamerSummary
@@ -0,0 +1,13 @@
+from django.db import models
+
+
+class GamerSummary(models.Model):
+    """Per gamer totals for the reports, kept up to date by
+    levelupreports.signals so reading them never joins the big tables
+    """
+    gamer = models.OneToOneField("levelupapi.Gamer", on_delete=models.CASCADE,
+                                 primary_key=True, related_name='summary')
+    full_name = models.CharField(max_length=301)
+    games_owned = models.PositiveIntegerField(default=0)
+    events_organized = models.PositiveIntegerField(default=0)
+    events_attended = models.PositiveIntegerField(default=0)
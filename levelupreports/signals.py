@@ -0,0 +1,97 @@
+"""Refresh the gamer summaries whenever the rows they count change
+
+The gamers are collected as the rows change and refreshed once, when the
+transaction commits.
+"""
+from django.contrib.auth.models import User
+from django.db.models.signals import m2m_changed, post_delete, post_init, post_save, pre_save
+from django.dispatch import receiver
+from levelupapi.models import Event, EventGamer, Game, Gamer
+from levelupapi.signals import bulk_changed, once_on_commit
+from levelupreports.summaries import refresh_gamer_summaries
+
+# The column on each model that points at the gamer it is counted for
+GAMER_FIELDS = {
+    Game: 'gamer_id',
+    Event: 'organizer_id',
+    EventGamer: 'gamer_id',
+}
+
+
+def refresh_later(gamer_ids):
+    once_on_commit(refresh_gamer_summaries, gamer_ids)
+
+
+@receiver(post_init, sender=Game)
+@receiver(post_init, sender=Event)
+def remember_loaded_gamer(sender, instance, **kwargs):
+    # Not getattr(), which would load a deferred field
+    instance._loaded_gamer_id = instance.__dict__.get(GAMER_FIELDS[sender])
+
+
+@receiver(pre_save, sender=Game)
+@receiver(pre_save, sender=Event)
+def remember_previous_gamer(sender, instance, **kwargs):
+    """Note who a game or event belonged to before an update, so they
+    are recounted too if it changes hands
+
+    Rows read from the database remember that when they are loaded. Only
+    one built with the pk of an existing row, or loaded without the
+    field, has to look it up.
+    """
+    instance._previous_gamer_id = None
+    if instance.pk is None:
+        return
+    if not instance._state.adding and instance._loaded_gamer_id is not None:
+        instance._previous_gamer_id = instance._loaded_gamer_id
+        return
+    instance._previous_gamer_id = sender.objects.filter(
+        pk=instance.pk
+    ).values_list(GAMER_FIELDS[sender], flat=True).first()
+
+
+@receiver(post_save, sender=Game)
+@receiver(post_save, sender=Event)
+@receiver(post_save, sender=EventGamer)
+@receiver(post_delete, sender=Game)
+@receiver(post_delete, sender=Event)
+@receiver(post_delete, sender=EventGamer)
+def refresh_owner_summary(sender, instance, **kwargs):
+    gamer_id = getattr(instance, GAMER_FIELDS[sender])
+    refresh_later([gamer_id, getattr(instance, '_previous_gamer_id', None)])
+    # What the row holds now, for the next save
+    instance._loaded_gamer_id = gamer_id
+
+
+@receiver(bulk_changed)
+def refresh_bulk_summaries(sender, instances, **kwargs):
+    if sender in GAMER_FIELDS:
+        field = GAMER_FIELDS[sender]
+        refresh_later(getattr(instance, field) for instance in instances)
+
+
+@receiver(m2m_changed, sender=Event.attendees.through)
+def refresh_attendee_summaries(sender, instance, action, reverse, pk_set, **kwargs):
+    """event.attendees.add() and friends skip the EventGamer save signals"""
+    if action == 'pre_clear':
+        # The cleared rows are gone by post_clear, so find them now
+        if reverse:
+            instance._cleared_gamer_ids = [instance.pk]
+        else:
+            instance._cleared_gamer_ids = list(
+                instance.attendees.values_list('pk', flat=True))
+    elif action == 'post_clear':
+        refresh_later(instance._cleared_gamer_ids)
+    elif action in ('post_add', 'post_remove'):
+        refresh_later([instance.pk] if reverse else pk_set)
+
+
+@receiver(post_save, sender=Gamer)
+def refresh_new_gamer_summary(sender, instance, **kwargs):
+    refresh_later([instance.pk])
+
+
+@receiver(post_save, sender=User)
+def refresh_renamed_gamer_summary(sender, instance, **kwargs):
+    """The summaries keep a copy of the gamer's full name"""
+    refresh_later(Gamer.objects.filter(user=instance).values_list('pk', flat=True))
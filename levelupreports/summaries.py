@@ -0,0 +1,54 @@
+"""Keeps the levelupreports_gamersummary table in step with levelupapi"""
+from django.db import connection, transaction
+
+# Counts everything for the gamers matched by the WHERE clause in one
+# statement. Each count is an indexed lookup on a foreign key.
+SUMMARY_SELECT_SQL = """
+    SELECT
+        gr.id,
+        u.first_name || ' ' || u.last_name,
+        (SELECT COUNT(*) FROM levelupapi_game g WHERE g.gamer_id = gr.id),
+        (SELECT COUNT(*) FROM levelupapi_event e WHERE e.organizer_id = gr.id),
+        (SELECT COUNT(*) FROM levelupapi_eventgamer eg WHERE eg.gamer_id = gr.id)
+    FROM levelupapi_gamer gr
+    JOIN auth_user u
+        ON u.id = gr.user_id
+"""
+
+REFRESH_BATCH_SIZE = 500
+
+SUMMARY_INSERT_SQL = """
+    INSERT INTO levelupreports_gamersummary
+        (gamer_id, full_name, games_owned, events_organized, events_attended)
+""" + SUMMARY_SELECT_SQL
+
+
+def refresh_gamer_summaries(gamer_ids):
+    """Recount the summaries of the given gamers
+
+    Called whenever a game, event or signup changes, with the gamers it
+    belongs to. Gamers that no longer exist just lose their summary.
+    """
+    gamer_ids = sorted({gamer_id for gamer_id in gamer_ids if gamer_id is not None})
+    with transaction.atomic(), connection.cursor() as db_cursor:
+        # Keep each IN list well under the database's parameter limit
+        for start in range(0, len(gamer_ids), REFRESH_BATCH_SIZE):
+            batch = gamer_ids[start:start + REFRESH_BATCH_SIZE]
+            placeholders = ', '.join(['%s'] * len(batch))
+            db_cursor.execute(
+                f"DELETE FROM levelupreports_gamersummary WHERE gamer_id IN ({placeholders})",
+                batch)
+            db_cursor.execute(
+                f"{SUMMARY_INSERT_SQL} WHERE gr.id IN ({placeholders})",
+                batch)
+
+
+def rebuild_gamer_summaries():
+    """Throw away every summary and count them all again
+
+    Returns the number of summaries written.
+    """
+    with transaction.atomic(), connection.cursor() as db_cursor:
+        db_cursor.execute("DELETE FROM levelupreports_gamersummary")
+        db_cursor.execute(SUMMARY_INSERT_SQL)
+        return db_cursor.rowcount
@@ -1,8 +1,10 @@
 from django.urls import path
 from .views import UserGameList
 from .views import UserEventList
+from .views import GamerSummaryList
 
 urlpatterns = [
     path('reports/usergames', UserGameList.as_view()),
     path('reports/userevents', UserEventList.as_view()),
-]
\ No newline at end of file
+    path('reports/gamersummaries', GamerSummaryList.as_view()),
+]
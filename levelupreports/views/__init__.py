@@ -1,2 +1,3 @@
 from .users.gamesbyuser import UserGameList
-from .users.eventsbyuser import UserEventList
\ No newline at end of file
+from .users.eventsbyuser import UserEventList
+from .users.gamersummaries import GamerSummaryList
@@ -1,7 +1,198 @@
-def dict_fetch_all(cursor):
-    """Return all rows from a cursor as a list of dictionaries"""
-    columns = [col[0] for col in cursor.description]
-    return [
-        dict(zip(columns, row))
-        for row in cursor.fetchall()
+import csv
+from collections import namedtuple
+from functools import lru_cache
+from itertools import groupby
+from operator import attrgetter
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import DEFAULT_DB_ALIAS, connections, router
+from django.http import HttpResponseBadRequest, StreamingHttpResponse
+from django.template.loader import get_template, render_to_string
+
+# The machine readable formats a report can be downloaded in
+REPORT_FORMATS = {
+    'json': 'application/json',
+    'csv': 'text/csv',
+    'ndjson': 'application/x-ndjson',
+}
+
+
+def report_connection():
+    """The connection to run a report's SQL on
+
+    Raw SQL doesn't go through the database routers the way the ORM does,
+    so this asks them: under levelup.routers.reading() that is the read
+    database, when there is one.
+    """
+    return connections[router.db_for_read(None) or DEFAULT_DB_ALIAS]
+
+
+@lru_cache(maxsize=64)
+def row_type(columns):
+    """A namedtuple class with a field for each of the columns
+
+    Classes are cached, so every query with the same columns shares one.
+    """
+    return namedtuple('Row', columns, rename=True)
+
+
+def row_fetch_all(cursor):
+    """Return all rows from a cursor as a list of namedtuples
+
+    A namedtuple row costs a fraction of a dictionary or a model instance
+    to build and hold, and templates read its columns the same way,
+    e.g. {{ game.title }}.
+    """
+    return list(row_fetch_many(cursor, size=None))
+
+
+def row_fetch_many(cursor, size=1000):
+    """Yield the rows from a cursor as namedtuples, fetching them in
+    batches of `size` so the whole result set is never held in memory.
+    A size of None fetches everything at once.
+    """
+    make_row = row_type(tuple(col[0] for col in cursor.description))._make
+    while True:
+        rows = cursor.fetchall() if size is None else cursor.fetchmany(size)
+        if not rows:
+            return
+        yield from map(make_row, rows)
+        if size is None:
+            return
+
+
+def group_by_user(rows, key, items_name):
+    """Group flat report rows into one dictionary per user
+
+    Users are looked up in a dictionary keyed on the `key` column, so this
+    is a single pass over the rows. Users come out in the order they first
+    appear in the rows.
+
+    Arguments:
+      rows -- iterable of rows with a `full_name` column
+      key -- the column that identifies the user, e.g. 'gamer_id'
+      items_name -- the key for each user's list of rows, e.g. 'games'
+    """
+    get_key = attrgetter(key)
+    users = {}
+    for row in rows:
+        user_id = get_key(row)
+        user_dict = users.get(user_id)
+        if user_dict is None:
+            user_dict = users[user_id] = {
+                key: user_id,
+                "full_name": row.full_name,
+                items_name: []
+            }
+        user_dict[items_name].append(row)
+    return list(users.values())
+
+
+def iter_group_by_user(rows, key, items_name):
+    """Like group_by_user, but yields each user as soon as their rows end
+
+    The rows must be ordered by the `key` column, so each user's rows are
+    next to each other and only one user is held in memory at a time.
+    """
+    for user_id, user_rows in groupby(rows, key=attrgetter(key)):
+        user_rows = list(user_rows)
+        yield {
+            key: user_id,
+            "full_name": user_rows[0].full_name,
+            items_name: user_rows
+        }
+
+
+def stream_report(title, user_template, users):
+    """Render a report page piece by piece for a StreamingHttpResponse
+
+    Arguments:
+      title -- the heading of the page
+      user_template -- the template that renders one user's section
+      users -- iterable of user dictionaries, like iter_group_by_user yields
+    """
+    yield render_to_string('users/report_header.html', {"title": title})
+    template = get_template(user_template)
+    for user in users:
+        yield template.render({"user": user})
+    yield render_to_string('users/report_footer.html')
+
+
+def report_format(request):
+    """The format the client wants a report in, from ?format= or the
+    Accept header. Anything other than REPORT_FORMATS means the HTML page.
+    """
+    fmt = request.GET.get('format')
+    if fmt is not None:
+        return fmt
+    accepted = [
+        media_type.split(';')[0].strip()
+        for media_type in request.headers.get('Accept', '').split(',')
     ]
+    for fmt, content_type in REPORT_FORMATS.items():
+        if content_type in accepted:
+            return fmt
+    return 'html'
+
+
+def rows_response(request, sql):
+    """Stream the rows of a report query as JSON, CSV or NDJSON
+
+    Returns None when the client asked for the HTML page, so the view can
+    carry on rendering it. Rows are written as they come off the cursor,
+    without grouping or templates, so downloads of any size use the same
+    small amount of memory.
+    """
+    fmt = report_format(request)
+    if fmt == 'html':
+        return None
+    if fmt not in REPORT_FORMATS:
+        return HttpResponseBadRequest(
+            f"Unknown format '{fmt}', use one of: html, {', '.join(REPORT_FORMATS)}")
+
+    writers = {'json': write_json, 'csv': write_csv, 'ndjson': write_ndjson}
+    return StreamingHttpResponse(
+        stream_query(sql, writers[fmt]),
+        content_type=f'{REPORT_FORMATS[fmt]}; charset=utf-8'
+    )
+
+
+def stream_query(sql, write):
+    """Run sql and yield its rows encoded by write"""
+    with report_connection().cursor() as db_cursor:
+        db_cursor.execute(sql)
+        columns = [col[0] for col in db_cursor.description]
+        yield from write(columns, row_fetch_many(db_cursor))
+
+
+def write_json(columns, rows):
+    """Encode rows as a JSON array of objects, one row at a time"""
+    encoder = DjangoJSONEncoder()
+    separator = '['
+    for row in rows:
+        yield separator + encoder.encode(dict(zip(columns, row)))
+        separator = ','
+    yield '[]' if separator == '[' else ']'
+
+
+def write_ndjson(columns, rows):
+    """Encode rows as newline delimited JSON objects"""
+    encoder = DjangoJSONEncoder()
+    for row in rows:
+        yield encoder.encode(dict(zip(columns, row))) + '\n'
+
+
+class EchoBuffer:
+    """A file-like object that hands back what is written to it, so
+    csv.writer can be used to build one line at a time
+    """
+    def write(self, value):
+        return value
+
+
+def write_csv(columns, rows):
+    """Encode rows as CSV with a header line of the column names"""
+    writer = csv.writer(EchoBuffer())
+    yield writer.writerow(columns)
+    for row in rows:
+        yield writer.writerow(row)
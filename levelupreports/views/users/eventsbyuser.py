@@ -1,37 +1,51 @@
 """Module for generating games by user report"""
 from django.shortcuts import render
-from django.db import connection
+from django.http import StreamingHttpResponse
 from django.views import View
-from levelupreports.views.helpers import dict_fetch_all
-from levelupapi.models.event import Event
+from levelupreports.views.helpers import (group_by_user, iter_group_by_user,
+                                          report_connection, row_fetch_all,
+                                          row_fetch_many, rows_response,
+                                          stream_report)
+
+# All events along with the organizer's full name and the game title.
+# Ordered by organizer so the streaming report can group as it reads.
+USER_EVENTS_SQL = """
+    SELECT
+        e.id,
+        e.description,
+        e.date,
+        e.time,
+        e.organizer_id,
+        e.game_id,
+        u.first_name || " " || u.last_name AS full_name,
+        g.title
+    FROM levelupapi_event e
+    JOIN levelupapi_game g
+        ON e.game_id = g.id
+    JOIN levelupapi_gamer gr
+        ON gr.id = e.organizer_id
+    JOIN auth_user u 
+        ON u.id = gr.user_id
+    ORDER BY e.organizer_id, e.id
+"""
 
 
 class UserEventList(View):
     def get(self, request):
-        with connection.cursor() as db_cursor:
+        # ?format=json, csv or ndjson (or the matching Accept header)
+        # streams the raw rows for dashboards and other jobs
+        response = rows_response(request, USER_EVENTS_SQL)
+        if response is not None:
+            return response
+
+        # ?stream=1 sends the page as it is rendered instead of building it all first
+        if request.GET.get('stream'):
+            return StreamingHttpResponse(self.stream(), content_type='text/html; charset=utf-8')
 
-            # TODO: Write a query to get all games along with 
-            # the gamer first name, last name, and id
-            db_cursor.execute("""
-            SELECT
-                e.id,
-                e.description,
-                e.date,
-                e.time,
-                e.organizer_id,
-                e.game_id,
-                u.first_name || " " || u.last_name AS full_name,
-                g.title
-            FROM levelupapi_event e
-            JOIN levelupapi_game g
-                ON e.game_id = g.id
-            JOIN levelupapi_gamer gr
-                ON gr.id = g.gamer_id
-            JOIN auth_user u 
-                ON u.id = e.organizer_id
-            """)
-            # Pass the db_cursor to the dict_fetch_all function to turn the fetch_all() response into a dictionary
-            dataset = dict_fetch_all(db_cursor)
+        with report_connection().cursor() as db_cursor:
+            db_cursor.execute(USER_EVENTS_SQL)
+            # Pass the db_cursor to the row_fetch_all function to turn the fetch_all() response into rows
+            dataset = row_fetch_all(db_cursor)
 
             # Take the flat data from the dataset, and build the
             # following data structure for each gamer.
@@ -52,38 +66,9 @@ class UserEventList(View):
             #   }
             # ]
 
-            events_by_user = []
+            # Group the rows by user in one pass over the dataset
+            events_by_user = group_by_user(dataset, 'organizer_id', 'events')
 
-            for row in dataset:
-                # TODO: Create a dictionary called game that includes 
-               
-                event = Event(
-                    row['id'],
-                    row['description'],
-                    row['date'],
-                    row['time'],
-                    row['game_id'],
-                    row['organizer_id'])
-                
-                
-                # See if the gamer has been added to the games_by_user list already
-                user_dict = None
-                for user_event in events_by_user:
-                    if user_event['organizer_id'] == row['organizer_id']:
-                        user_dict = user_event
-                
-                
-                if user_dict:
-                    # If the user_dict is already in the games_by_user list, append the game to the games list
-                    user_dict['events'].append(event)
-                else:
-                    # If the user is not on the games_by_user list, create and add the user to the list
-                    events_by_user.append({
-                        "organizer_id": row['organizer_id'],
-                        "full_name": row['full_name'],
-                        "events": [event]
-                    })
-        
         # The template string must match the file name of the html template
         template = 'users/list_with_events.html'
         
@@ -92,4 +77,12 @@ class UserEventList(View):
             "userevent_list": events_by_user
         }
 
-        return render(request, template, context)
\ No newline at end of file
+        return render(request, template, context)
+
+    def stream(self):
+        """Render the report one organizer at a time, reading the rows in batches"""
+        with report_connection().cursor() as db_cursor:
+            db_cursor.execute(USER_EVENTS_SQL)
+            events_by_user = iter_group_by_user(
+                row_fetch_many(db_cursor), 'organizer_id', 'events')
+            yield from stream_report('User Events', 'users/user_events.html', events_by_user)
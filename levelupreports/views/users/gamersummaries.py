@@ -0,0 +1,40 @@
+"""Module for generating the gamer summary report"""
+from django.shortcuts import render
+from django.views import View
+from levelupreports.views.helpers import report_connection, row_fetch_all, rows_response
+
+# The summaries are kept up to date as games, events and signups change,
+# so this reads one table instead of joining the games and events
+GAMER_SUMMARIES_SQL = """
+    SELECT
+        gamer_id,
+        full_name,
+        games_owned,
+        events_organized,
+        events_attended
+    FROM levelupreports_gamersummary
+    ORDER BY gamer_id
+"""
+
+
+class GamerSummaryList(View):
+    def get(self, request):
+        # ?format=json, csv or ndjson (or the matching Accept header)
+        # streams the raw rows for dashboards and other jobs
+        response = rows_response(request, GAMER_SUMMARIES_SQL)
+        if response is not None:
+            return response
+
+        with report_connection().cursor() as db_cursor:
+            db_cursor.execute(GAMER_SUMMARIES_SQL)
+            summaries = row_fetch_all(db_cursor)
+
+        # The template string must match the file name of the html template
+        template = 'users/list_with_summaries.html'
+
+        # The context will be a dictionary that the template can access to show data
+        context = {
+            "gamersummary_list": summaries
+        }
+
+        return render(request, template, context)
@@ -1,35 +1,49 @@
 """Module for generating games by user report"""
 from django.shortcuts import render
-from django.db import connection
+from django.http import StreamingHttpResponse
 from django.views import View
-from levelupreports.views.helpers import dict_fetch_all
-from levelupapi.models.game import Game
+from levelupreports.views.helpers import (group_by_user, iter_group_by_user,
+                                          report_connection, row_fetch_all,
+                                          row_fetch_many, rows_response,
+                                          stream_report)
+
+# All games along with the gamer first name, last name, and id.
+# Ordered by gamer so the streaming report can group as it reads.
+USER_GAMES_SQL = """
+    SELECT
+        g.id,
+        g.title,
+        g.maker,
+        g.number_of_players,
+        g.skill_level,
+        g.game_type_id,
+        g.gamer_id,
+        u.first_name || " " || u.last_name AS full_name
+    FROM levelupapi_game g
+    JOIN levelupapi_gamer gr
+        ON gr.id = g.gamer_id
+    JOIN auth_user u 
+        ON u.id = gr.user_id
+    ORDER BY g.gamer_id, g.id
+"""
 
 
 class UserGameList(View):
     def get(self, request):
-        with connection.cursor() as db_cursor:
+        # ?format=json, csv or ndjson (or the matching Accept header)
+        # streams the raw rows for dashboards and other jobs
+        response = rows_response(request, USER_GAMES_SQL)
+        if response is not None:
+            return response
+
+        # ?stream=1 sends the page as it is rendered instead of building it all first
+        if request.GET.get('stream'):
+            return StreamingHttpResponse(self.stream(), content_type='text/html; charset=utf-8')
 
-            # TODO: Write a query to get all games along with 
-            # the gamer first name, last name, and id
-            db_cursor.execute("""
-            SELECT
-                g.id,
-                g.title,
-                g.maker,
-                g.number_of_players,
-                g.skill_level,
-                g.game_type_id,
-                g.gamer_id,
-                u.first_name || " " || u.last_name AS full_name
-            FROM levelupapi_game g
-            JOIN levelupapi_gamer gr
-                ON gr.id = g.gamer_id
-            JOIN auth_user u 
-                ON u.id = gr.user_id   
-            """)
-            # Pass the db_cursor to the dict_fetch_all function to turn the fetch_all() response into a dictionary
-            dataset = dict_fetch_all(db_cursor)
+        with report_connection().cursor() as db_cursor:
+            db_cursor.execute(USER_GAMES_SQL)
+            # Pass the db_cursor to the row_fetch_all function to turn the fetch_all() response into rows
+            dataset = row_fetch_all(db_cursor)
 
             # Take the flat data from the dataset, and build the
             # following data structure for each gamer.
@@ -60,38 +74,9 @@ class UserGameList(View):
             #   },
             # ]
 
-            games_by_user = []
+            # Group the rows by user in one pass over the dataset
+            games_by_user = group_by_user(dataset, 'gamer_id', 'games')
 
-            for row in dataset:
-                # TODO: Create a dictionary called game that includes 
-                # the name, description, number_of_players, maker,
-                # game_type_id, and skill_level from the row dictionary
-                game = Game(
-                    row['title'],
-                    row['number_of_players'],
-                    row['maker'],
-                    row['game_type_id'],
-                    row['skill_level'])
-                
-                
-                # See if the gamer has been added to the games_by_user list already
-                user_dict = None
-                for user_game in games_by_user:
-                    if user_game['gamer_id'] == row['gamer_id']:
-                        user_dict = user_game
-                
-                
-                if user_dict:
-                    # If the user_dict is already in the games_by_user list, append the game to the games list
-                    user_dict['games'].append(game)
-                else:
-                    # If the user is not on the games_by_user list, create and add the user to the list
-                    games_by_user.append({
-                        "gamer_id": row['gamer_id'],
-                        "full_name": row['full_name'],
-                        "games": [game]
-                    })
-        
         # The template string must match the file name of the html template
         template = 'users/list_with_games.html'
         
@@ -101,3 +86,11 @@ class UserGameList(View):
         }
 
         return render(request, template, context)
+
+    def stream(self):
+        """Render the report one gamer at a time, reading the rows in batches"""
+        with report_connection().cursor() as db_cursor:
+            db_cursor.execute(USER_GAMES_SQL)
+            games_by_user = iter_group_by_user(
+                row_fetch_many(db_cursor), 'gamer_id', 'games')
+            yield from stream_report('User Games', 'users/user_games.html', games_by_user)
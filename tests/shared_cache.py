@@ -0,0 +1,23 @@
+import tempfile
+
+from django.test import override_settings
+
+
+class SharedCacheMixin:
+    """Keep the cache in files, like a cache every worker process shares
+
+    levelupapi.cache only sends ETags when the table versions are shared,
+    and levelupapi.authentication only caches tokens in a shared cache.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        directory = tempfile.TemporaryDirectory()
+        cls.addClassCleanup(directory.cleanup)
+        shared = override_settings(CACHES={'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': directory.name,
+        }})
+        shared.enable()
+        cls.addClassCleanup(shared.disable)
+        super().setUpClass()
@@ -0,0 +1,81 @@
+import json
+
+from django.http import StreamingHttpResponse
+from django.test import TestCase
+from rest_framework.authtoken.models import Token
+from levelup.handlers import StreamingASGIHandler
+from levelupapi.models import Event, Game, Gamer
+from tests.shared_cache import SharedCacheMixin
+
+
+class AsgiTests(SharedCacheMixin, TestCase):
+
+    # Add any fixtures you want to run to build the test database
+    fixtures = ['users', 'tokens', 'gamers', 'game_types', 'games', 'events']
+
+    def setUp(self):
+        gamer = Gamer.objects.first()
+        # The async client takes headers without the HTTP_ prefix
+        self.headers = {'Authorization': f'Token {Token.objects.get(user=gamer.user).key}'}
+        self.events = list(Event.objects.order_by('id').values_list('id', flat=True))
+        self.games = list(Game.objects.order_by('id').values_list('id', flat=True))
+
+    async def test_list_and_retrieve(self):
+        """The list and detail endpoints answer through the async client"""
+        response = await self.async_client.get('/events', **self.headers)
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(self.events, [event['id'] for event in json.loads(response.content)])
+
+        response = await self.async_client.get(f'/games/{self.games[0]}', **self.headers)
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(self.games[0], json.loads(response.content)['id'])
+
+        response = await self.async_client.get('/gametypes', **self.headers)
+        self.assertEqual(200, response.status_code)
+
+    async def test_etags(self):
+        """Conditional requests still get a 304"""
+        response = await self.async_client.get('/games', **self.headers)
+        response = await self.async_client.get(
+            '/games', **{'If-None-Match': response['ETag']}, **self.headers)
+
+        self.assertEqual(304, response.status_code)
+
+    async def send(self, response):
+        """The body StreamingASGIHandler sends for response, chunk by chunk"""
+        sent = []
+
+        async def send(message):
+            sent.append(message)
+
+        await StreamingASGIHandler().send_response(response, send)
+        self.assertEqual('http.response.start', sent[0]['type'])
+        self.assertEqual({'type': 'http.response.body'}, sent[-1])
+        return [message['body'] for message in sent[1:-1]]
+
+    async def test_streamed_report(self):
+        """Streamed reports read the database outside the event loop"""
+        response = await self.async_client.get('/reports/usergames?format=ndjson')
+
+        self.assertEqual(200, response.status_code)
+        rows = [json.loads(line) for line in b''.join(await self.send(response)).splitlines()]
+        self.assertEqual(self.games, [row['id'] for row in rows])
+
+    async def test_streaming_is_not_buffered(self):
+        """Each chunk is sent before the next one is made"""
+        size = StreamingASGIHandler.chunk_size
+        made = []
+
+        def parts():
+            for part in (b'a', b'b', b'c'):
+                made.append(part)
+                yield part * size
+
+        sent = []
+
+        async def send(message):
+            sent.append(b''.join(made))
+
+        await StreamingASGIHandler().send_response(StreamingHttpResponse(parts()), send)
+        # The start, a message per part and the end
+        self.assertEqual([b'', b'a', b'ab', b'abc', b'abc'], sent)
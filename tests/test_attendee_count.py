@@ -0,0 +1,106 @@
+from django.contrib.auth.models import User
+from django.db import DatabaseError, transaction
+from rest_framework import status
+from rest_framework.test import APITransactionTestCase
+from rest_framework.authtoken.models import Token
+from levelupapi.models import Event, EventGamer, Gamer
+
+
+class AttendeeCountTests(APITransactionTestCase):
+
+    # Add any fixtures you want to run to build the test database
+    fixtures = ['users', 'tokens', 'gamers', 'game_types', 'games', 'events']
+
+    def setUp(self):
+        # Grab the first Gamer object from the database and add their token to the headers
+        self.gamer = Gamer.objects.first()
+        self.login(self.gamer)
+        # The second event's game is for two players
+        self.event = Event.objects.get(pk=2)
+
+    def login(self, gamer):
+        token, _ = Token.objects.get_or_create(user=gamer.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+
+    def new_gamer(self, username):
+        return Gamer.objects.create(user=User.objects.create_user(username=username), bio='')
+
+    def count(self):
+        self.event.refresh_from_db()
+        return self.event.attendee_count
+
+    def test_signup_and_leave(self):
+        """Joining and leaving change the count, doing either twice doesn't"""
+        for code in (status.HTTP_201_CREATED, status.HTTP_200_OK):
+            response = self.client.post(f'/events/{self.event.id}/signup')
+            self.assertEqual(code, response.status_code)
+            self.assertEqual(1, self.count())
+
+        response = self.client.get(f'/events/{self.event.id}')
+        self.assertEqual(1, response.data['attendee_count'])
+
+        for code in (status.HTTP_204_NO_CONTENT, status.HTTP_200_OK):
+            response = self.client.delete(f'/events/{self.event.id}/leave')
+            self.assertEqual(code, response.status_code)
+            self.assertEqual(0, self.count())
+
+    def test_full_event(self):
+        """Signups past the game's number of players are turned away"""
+        self.event.attendees.add(self.new_gamer('first'), self.new_gamer('second'))
+
+        response = self.client.post(f'/events/{self.event.id}/signup')
+
+        self.assertEqual(status.HTTP_409_CONFLICT, response.status_code)
+        self.assertEqual(2, self.count())
+        self.assertFalse(self.event.attendees.filter(pk=self.gamer.pk).exists())
+
+    def test_missing_event(self):
+        response = self.client.post('/events/999/signup')
+        self.assertEqual(status.HTTP_404_NOT_FOUND, response.status_code)
+        response = self.client.delete('/events/999/leave')
+        self.assertEqual(status.HTTP_404_NOT_FOUND, response.status_code)
+
+    def test_other_changes_are_recounted(self):
+        """Attendees changed without the signup endpoints are counted too"""
+        other = self.new_gamer('other')
+        self.event.attendees.set([self.gamer, other])
+        self.assertEqual(2, self.count())
+
+        EventGamer.objects.filter(gamer=other).delete()
+        self.assertEqual(1, self.count())
+
+        self.gamer.events.clear()
+        self.assertEqual(0, self.count())
+
+    def test_after_a_rollback(self):
+        """A recount dropped by a rollback doesn't swallow the next one"""
+        for rolled_back in [True, False]:
+            try:
+                with transaction.atomic():
+                    EventGamer.objects.create(event=self.event, gamer=self.gamer)
+                    if rolled_back:
+                        raise DatabaseError
+            except DatabaseError:
+                pass
+            self.assertEqual(0 if rolled_back else 1, self.count())
+
+        # Inside a savepoint
+        with transaction.atomic():
+            try:
+                with transaction.atomic():
+                    self.event.attendees.clear()
+                    raise DatabaseError
+            except DatabaseError:
+                pass
+            self.event.attendees.add(self.new_gamer('other'))
+        self.assertEqual(2, self.count())
+
+    def test_saving_a_stale_event(self):
+        """Saving an event loaded before a signup keeps the signup's count"""
+        stale = Event.objects.get(pk=self.event.pk)
+        self.client.post(f'/events/{self.event.id}/signup')
+
+        stale.description = 'Charades night'
+        stale.save()
+
+        self.assertEqual(1, self.count())
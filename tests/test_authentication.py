@@ -0,0 +1,82 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APITestCase
+from rest_framework.authtoken.models import Token
+from levelupapi.models import Gamer
+from tests.shared_cache import SharedCacheMixin
+
+
+class AuthenticationTests(SharedCacheMixin, APITestCase):
+
+    # Add any fixtures you want to run to build the test database
+    fixtures = ['users', 'tokens', 'gamers', 'game_types', 'games', 'events']
+
+    def setUp(self):
+        cache.clear()
+        # Grab the first Gamer object from the database and add their token to the headers
+        self.gamer = Gamer.objects.first()
+        self.token = Token.objects.get(user=self.gamer.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {self.token.key}")
+
+    def auth_queries(self, url):
+        """The SQL run to authenticate a request to url"""
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(url)
+        return [
+            q['sql'] for q in queries.captured_queries
+            if 'authtoken_token' in q['sql'] or 'levelupapi_gamer' in q['sql']
+        ]
+
+    def test_one_query_then_cached(self):
+        """Token, user and gamer come back in one query, then from the cache"""
+        queries = self.auth_queries('/gametypes')
+        self.assertEqual(1, len(queries))
+        self.assertIn('levelupapi_gamer', queries[0])
+
+        self.assertEqual([], self.auth_queries('/gametypes'))
+
+    @override_settings(CACHES={'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+    def test_local_cache_not_used(self):
+        """A cache only this process sees can't be told about deleted tokens"""
+        self.auth_queries('/gametypes')
+        self.assertEqual(1, len(self.auth_queries('/gametypes')))
+
+    def test_request_gamer(self):
+        """Views use the gamer found by authentication"""
+        response = self.client.post('/games', {
+            "title": "Clue",
+            "maker": "Milton Bradley",
+            "skill_level": 5,
+            "number_of_players": 6,
+            "game_type": 1,
+        }, format='json')
+
+        self.assertEqual(status.HTTP_201_CREATED, response.status_code)
+        self.assertEqual(self.gamer.id, self.gamer.game_set.get(title='Clue').gamer_id)
+
+    def test_invalid_token(self):
+        self.client.credentials(HTTP_AUTHORIZATION="Token not-a-real-token")
+        response = self.client.get('/gametypes')
+        self.assertEqual(status.HTTP_401_UNAUTHORIZED, response.status_code)
+
+    def test_deleted_token(self):
+        """Deleting a cached token logs it out straight away"""
+        self.client.get('/gametypes')
+        self.token.delete()
+
+        response = self.client.get('/gametypes')
+        self.assertEqual(status.HTTP_401_UNAUTHORIZED, response.status_code)
+
+    def test_deactivated_user(self):
+        """Deactivating a user logs them out straight away"""
+        self.client.get('/gametypes')
+        user = self.gamer.user
+        user.is_active = False
+        user.save()
+
+        response = self.client.get('/gametypes')
+        self.assertEqual(status.HTTP_401_UNAUTHORIZED, response.status_code)
@@ -0,0 +1,96 @@
+from django.contrib.auth.models import User
+from rest_framework import status
+from rest_framework.test import APITransactionTestCase
+from rest_framework.authtoken.models import Token
+from levelupapi.models import Event, EventGamer, Gamer
+from levelupreports.models import GamerSummary
+from tests.shared_cache import SharedCacheMixin
+
+
+class BulkSignupTests(SharedCacheMixin, APITransactionTestCase):
+
+    # Add any fixtures you want to run to build the test database
+    fixtures = ['users', 'tokens', 'gamers', 'game_types', 'games', 'events']
+
+    def setUp(self):
+        # Grab the first Gamer object from the database and add their token to the headers
+        self.gamer = Gamer.objects.first()
+        self.gamer.user.is_staff = True
+        self.gamer.user.save()
+        token = Token.objects.get(user=self.gamer.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+
+        # A few more gamers to sign up
+        self.gamers = [self.gamer] + [
+            Gamer.objects.create(user=User.objects.create_user(username=f'gamer{i}'), bio='')
+            for i in range(3)
+        ]
+        self.events = list(Event.objects.all())
+
+    def post(self, url, pairs):
+        return self.client.post(url, {
+            'signups': [{'event': event, 'gamer': gamer} for event, gamer in pairs]
+        }, format='json')
+
+    def test_bulk_signup(self):
+        """Every pair is signed up while its event has room, and each gets
+        its own result
+        """
+        self.events[0].attendees.add(self.gamer)
+        pairs = [(event.id, gamer.id) for event in self.events for gamer in self.gamers]
+        pairs += [(pairs[5]), (999, self.gamer.id), (self.events[0].id, 999)]
+
+        response = self.post('/events/bulk-signup', pairs)
+
+        self.assertEqual(status.HTTP_200_OK, response.status_code)
+        results = [item['result'] for item in response.data['results']]
+        self.assertEqual(['already_joined'] + ['joined'] * 3, results[:4])
+        # The second event's game is for two players
+        self.assertEqual(['joined', 'joined', 'full', 'full'], results[4:8])
+        self.assertEqual(['already_joined', 'event_not_found', 'gamer_not_found'], results[8:])
+        self.assertEqual(6, EventGamer.objects.count())
+        self.assertEqual([4, 2], [event.attendee_count for event in Event.objects.order_by('id')])
+        self.assertEqual(2, GamerSummary.objects.get(gamer=self.gamers[1]).events_attended)
+
+    def test_bulk_leave(self):
+        """Signed up pairs are removed, the rest are reported back"""
+        for event in self.events:
+            event.attendees.add(*self.gamers)
+        pairs = [(self.events[0].id, gamer.id) for gamer in self.gamers]
+        pairs += [pairs[0], (999, self.gamer.id)]
+
+        response = self.post('/events/bulk-leave', pairs)
+
+        self.assertEqual(status.HTTP_200_OK, response.status_code)
+        results = [item['result'] for item in response.data['results']]
+        self.assertEqual(['left'] * 4 + ['not_joined', 'event_not_found'], results)
+        self.assertEqual(0, self.events[0].attendees.count())
+        self.assertEqual(4, self.events[1].attendees.count())
+        self.assertEqual([0, 4], [event.attendee_count for event in Event.objects.order_by('id')])
+        self.assertEqual(1, GamerSummary.objects.get(gamer=self.gamers[1]).events_attended)
+
+    def test_bulk_signup_invalidates_etag(self):
+        """Bulk changes show up in the events list straight away"""
+        etag = self.client.get('/events')['ETag']
+
+        self.post('/events/bulk-signup', [(self.events[0].id, self.gamer.id)])
+
+        response = self.client.get('/events', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(status.HTTP_200_OK, response.status_code)
+        self.assertTrue(response.data[0]['joined'])
+
+    def test_bulk_signup_validation(self):
+        response = self.client.post('/events/bulk-signup', {'signups': [{'event': 'x'}]}, format='json')
+        self.assertEqual(status.HTTP_400_BAD_REQUEST, response.status_code)
+
+        # The list on its own, without the object around it
+        response = self.client.post('/events/bulk-signup', [{'event': 1, 'gamer': 1}], format='json')
+        self.assertEqual(status.HTTP_400_BAD_REQUEST, response.status_code)
+        self.assertIn('signups', response.data)
+
+    def test_bulk_signup_admin_only(self):
+        self.gamer.user.is_staff = False
+        self.gamer.user.save()
+
+        response = self.post('/events/bulk-signup', [(self.events[0].id, self.gamer.id)])
+        self.assertEqual(status.HTTP_403_FORBIDDEN, response.status_code)
@@ -0,0 +1,96 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APITransactionTestCase
+from rest_framework.authtoken.models import Token
+from levelupapi.models import Event, Game, Gamer
+from levelupapi.views.GameView import CreateGameSerializer
+from levelupreports.models import GamerSummary
+
+
+class BulkWriteTests(APITransactionTestCase):
+
+    # Add any fixtures you want to run to build the test database
+    fixtures = ['users', 'tokens', 'gamers', 'game_types', 'games', 'events']
+
+    def setUp(self):
+        # Grab the first Gamer object from the database and add their token to the headers
+        self.gamer = Gamer.objects.first()
+        token = Token.objects.get(user=self.gamer.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+
+    def test_bulk_create_games(self):
+        """A list of games is created with a fixed number of queries"""
+        games = [
+            {
+                "title": f"Game {i}",
+                "maker": "Milton Bradley",
+                "skill_level": 5,
+                "number_of_players": 6,
+                "game_type": i % 3 + 1,
+            }
+            for i in range(50)
+        ]
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post('/games/bulk', games, format='json')
+
+        self.assertEqual(status.HTTP_201_CREATED, response.status_code)
+        self.assertLess(len(queries.captured_queries), 15)
+
+        created = Game.objects.filter(title__startswith='Game ').order_by('id')
+        self.assertEqual(50, len(created))
+        self.assertEqual(CreateGameSerializer(created, many=True).data, response.data)
+        self.assertTrue(all(game.gamer_id == self.gamer.id for game in created))
+        self.assertEqual(52, GamerSummary.objects.get(gamer=self.gamer).games_owned)
+
+    def test_bulk_create_events(self):
+        """Events created in bulk are organized by the gamer sending them"""
+        game = Game.objects.first()
+        events = [
+            {"game": game.id, "description": f"Event {i}", "organizer": self.gamer.id}
+            for i in range(10)
+        ]
+
+        response = self.client.post('/events/bulk', events, format='json')
+
+        self.assertEqual(status.HTTP_201_CREATED, response.status_code)
+        self.assertEqual(10, Event.objects.filter(description__startswith='Event ').count())
+        self.assertEqual([], response.data[0]['attendees'])
+        self.assertEqual(12, GamerSummary.objects.get(gamer=self.gamer).events_organized)
+
+    def test_bulk_create_validation(self):
+        """Nothing is created if any game is invalid"""
+        games = [
+            {"title": "Good", "maker": "M", "skill_level": 1, "number_of_players": 2, "game_type": 1},
+            {"title": "Bad", "maker": "M", "skill_level": 1, "number_of_players": 2, "game_type": 99},
+        ]
+
+        response = self.client.post('/games/bulk', games, format='json')
+
+        self.assertEqual(status.HTTP_400_BAD_REQUEST, response.status_code)
+        self.assertEqual({}, response.data[0])
+        self.assertIn('game_type', response.data[1])
+        self.assertFalse(Game.objects.filter(title='Good').exists())
+
+    def test_bulk_update_games(self):
+        """Only the fields sent are changed, on every game sent"""
+        games = list(Game.objects.order_by('id'))
+
+        response = self.client.patch('/games/bulk', [
+            {"id": games[0].id, "title": "Renamed"},
+            {"id": games[1].id, "skill_level": 9, "game_type": 3},
+        ], format='json')
+
+        self.assertEqual(status.HTTP_204_NO_CONTENT, response.status_code)
+        for game in games:
+            game.refresh_from_db()
+        self.assertEqual(("Renamed", 2), (games[0].title, games[0].skill_level))
+        self.assertEqual(("Charades", 9, 3), (games[1].title, games[1].skill_level, games[1].game_type_id))
+
+    def test_bulk_update_unknown_id(self):
+        response = self.client.patch('/games/bulk', [{"id": 999, "title": "Nope"}], format='json')
+        self.assertEqual(status.HTTP_404_NOT_FOUND, response.status_code)
+
+        response = self.client.patch('/games/bulk', [{"title": "Nope"}], format='json')
+        self.assertEqual(status.HTTP_400_BAD_REQUEST, response.status_code)
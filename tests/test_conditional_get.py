@@ -0,0 +1,78 @@
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APITestCase
+from rest_framework.authtoken.models import Token
+from levelupapi.models import Event, Game, Gamer
+from tests.shared_cache import SharedCacheMixin
+
+
+class ConditionalGetTests(SharedCacheMixin, APITestCase):
+
+    # Add any fixtures you want to run to build the test database
+    fixtures = ['users', 'tokens', 'gamers', 'game_types', 'games', 'events']
+
+    def setUp(self):
+        # Grab the first Gamer object from the database and add their token to the headers
+        self.gamer = Gamer.objects.first()
+        token = Token.objects.get(user=self.gamer.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+
+    def test_not_modified(self):
+        """Sending back the ETag of an unchanged response gets a 304"""
+        urls = ['/games', f'/games/{Game.objects.first().id}', '/gametypes', '/gametypes/1',
+                '/events', f'/events/{Event.objects.first().id}']
+        for url in urls:
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertEqual(status.HTTP_200_OK, response.status_code)
+                etag = response['ETag']
+
+                with CaptureQueriesContext(connection) as queries:
+                    response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+                self.assertEqual(status.HTTP_304_NOT_MODIFIED, response.status_code)
+                self.assertEqual(etag, response['ETag'])
+                self.assertEqual(b'', response.content)
+                # Nothing but authentication touches the database
+                self.assertEqual([], [
+                    q['sql'] for q in queries.captured_queries
+                    if 'authtoken_token' not in q['sql']
+                ])
+
+    def test_changes_change_etag(self):
+        """Writes to any table a response is built from change its ETag"""
+        etag = self.client.get('/events')['ETag']
+
+        # Joining an event changes the attendees and joined
+        event = Event.objects.first()
+        self.client.post(f'/events/{event.id}/signup')
+        response = self.client.get('/events', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(status.HTTP_200_OK, response.status_code)
+        self.assertNotEqual(etag, response['ETag'])
+        etag = response['ETag']
+
+        # Events nest their game
+        game = event.game
+        game.title = 'Monopoly Deluxe'
+        game.save()
+        response = self.client.get('/events', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(status.HTTP_200_OK, response.status_code)
+
+    def test_etag_per_query(self):
+        """Different query parameters have different ETags"""
+        self.assertNotEqual(
+            self.client.get('/games')['ETag'],
+            self.client.get('/games?type=1')['ETag']
+        )
+
+    @override_settings(CACHES={'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+    def test_no_etags_without_shared_cache(self):
+        """A cache of its own per process would hand out stale 304s"""
+        response = self.client.get('/games')
+        self.assertNotIn('ETag', response)
+
+        response = self.client.get('/games', HTTP_IF_NONE_MATCH='*')
+        self.assertEqual(status.HTTP_200_OK, response.status_code)
@@ -0,0 +1,248 @@
+import asyncio
+import os
+import sqlite3
+import tempfile
+import threading
+from pathlib import Path
+from unittest import mock
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db import OperationalError, connections, router
+from django.db.utils import ConnectionHandler
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory, SimpleTestCase
+from levelup.backends.pool import ConnectionPool
+from levelup.database import database_from_env, databases_from_env
+from levelup.routers import ReadDatabaseMiddleware
+from levelupapi.models import Event
+
+
+class DatabaseSettingsTests(SimpleTestCase):
+
+    def test_defaults(self):
+        """Without any variables it is SQLite in WAL mode with kept connections"""
+        database = database_from_env({}, Path('/app'))
+
+        self.assertEqual({
+            'ENGINE': 'levelup.backends.sqlite3',
+            'NAME': Path('/app/db.sqlite3'),
+            'CONN_MAX_AGE': 60,
+            'CONN_HEALTH_CHECKS': False,
+            'OPTIONS': {'timeout': 5},
+            'TRANSACTION_MODE': 'IMMEDIATE',
+            'PRAGMAS': {
+                'journal_mode': 'WAL', 'synchronous': 'NORMAL', 'cache_size': -20000,
+                'mmap_size': 268435456, 'temp_store': 'MEMORY',
+            },
+        }, database)
+
+    def test_read_database(self):
+        """The read database is default again, read only on SQLite"""
+        self.assertEqual(['default'], list(databases_from_env({}, Path('/app'))))
+
+        databases = databases_from_env({'DATABASE_READ_CONNECTION': '1'}, Path('/app'))
+        read = databases['read']
+        self.assertEqual(databases['default']['NAME'], read['NAME'])
+        self.assertEqual(1, read['PRAGMAS']['query_only'])
+        self.assertEqual('DEFERRED', read['TRANSACTION_MODE'])
+        self.assertNotIn('query_only', databases['default']['PRAGMAS'])
+        self.assertEqual({'MIRROR': 'default'}, read['TEST'])
+
+        databases = databases_from_env({
+            'DATABASE_ENGINE': 'postgresql', 'DATABASE_HOST': 'db',
+            'DATABASE_READ_CONNECTION': '1', 'DATABASE_READ_HOST': 'replica',
+        }, Path('/app'))
+        self.assertEqual('db', databases['default']['HOST'])
+        self.assertEqual('replica', databases['read']['HOST'])
+
+    def test_server_database_with_pool(self):
+        """A pool turns off per thread connections"""
+        database = database_from_env({
+            'DATABASE_ENGINE': 'postgresql', 'DATABASE_NAME': 'levelup',
+            'DATABASE_HOST': 'db', 'DATABASE_CONN_MAX_AGE': 'none',
+            'DATABASE_HEALTH_CHECKS': '1', 'DATABASE_POOL_SIZE': '8',
+        }, Path('/app'))
+
+        self.assertEqual('levelup.backends.postgresql', database['ENGINE'])
+        self.assertEqual('db', database['HOST'])
+        self.assertEqual(0, database['CONN_MAX_AGE'])
+        self.assertTrue(database['CONN_HEALTH_CHECKS'])
+        self.assertEqual({'SIZE': 8, 'TIMEOUT': 10, 'MAX_AGE': None}, database['POOL'])
+        self.assertNotIn('PRAGMAS', database)
+
+        with self.assertRaises(ImproperlyConfigured):
+            database_from_env({'DATABASE_ENGINE': 'django.db.backends.mysql',
+                               'DATABASE_POOL_SIZE': '8'}, Path('/app'))
+
+
+class ConnectionManagementTests(SimpleTestCase):
+
+    def wrapper(self, alias, read=False, **environ):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        databases = databases_from_env({
+            'DATABASE_NAME': os.path.join(directory.name, 'db.sqlite3'),
+            'DATABASE_READ_CONNECTION': '1', **environ}, Path())
+        database = databases['read' if read else 'default']
+        wrapper = ConnectionHandler({'default': database, alias: database}).create_connection(alias)
+        self.addCleanup(wrapper.close)
+        return wrapper
+
+    def test_pragmas(self):
+        """New SQLite connections get WAL journaling and the busy timeout"""
+        wrapper = self.wrapper('pragmas', SQLITE_BUSY_TIMEOUT='2')
+        with wrapper.cursor() as cursor:
+            cursor.execute('PRAGMA journal_mode')
+            self.assertEqual('wal', cursor.fetchone()[0])
+            cursor.execute('PRAGMA busy_timeout')
+            self.assertEqual(2000, cursor.fetchone()[0])
+            cursor.execute('PRAGMA synchronous')
+            self.assertEqual(1, cursor.fetchone()[0])
+
+    def test_transactions_take_the_write_lock(self):
+        """Transactions start with BEGIN IMMEDIATE, so other writers wait for them"""
+        wrapper = self.wrapper('immediate')
+        other = sqlite3.connect(wrapper.settings_dict['NAME'], timeout=0)
+        self.addCleanup(other.close)
+
+        wrapper.ensure_connection()
+        # What atomic() does on SQLite
+        wrapper._start_transaction_under_autocommit()  # pylint: disable=protected-access
+        with self.assertRaisesMessage(sqlite3.OperationalError, 'database is locked'):
+            other.execute('BEGIN IMMEDIATE')
+        wrapper.connection.rollback()
+
+    def test_read_connection_is_read_only(self):
+        wrapper = self.wrapper('reader', read=True)
+        with wrapper.cursor() as cursor:
+            cursor.execute('SELECT 1')
+            with self.assertRaisesMessage(OperationalError, 'readonly database'):
+                cursor.execute('CREATE TABLE written (id integer)')
+
+    def test_pool_reuses_connections(self):
+        """Closing gives the connection back to the pool for the next user"""
+        wrapper = self.wrapper('pooled', DATABASE_POOL_SIZE='2')
+        wrapper.ensure_connection()
+        raw = wrapper.connection
+        wrapper.close()
+        self.assertIsNone(wrapper.connection)
+
+        wrapper.ensure_connection()
+        self.assertIs(raw, wrapper.connection)
+
+    def test_pool_failed_rollback(self):
+        """A connection that can't roll back on close is dropped, and its
+        place in the pool freed
+        """
+        wrapper = self.wrapper('dropped', DATABASE_POOL_SIZE='1')
+        wrapper.ensure_connection()
+        raw = wrapper.connection
+        broken = mock.Mock(wraps=raw)
+        broken.rollback.side_effect = sqlite3.OperationalError('disk I/O error')
+        wrapper.connection = broken
+
+        wrapper.close()
+        broken.close.assert_called_once_with()
+
+        wrapper.ensure_connection()
+        self.assertIsNot(raw, wrapper.connection)
+        with wrapper.cursor() as cursor:
+            cursor.execute('SELECT 1')
+
+    def test_pool_health_checks(self):
+        """A pooled connection that stopped working is replaced"""
+        wrapper = self.wrapper('checked', DATABASE_POOL_SIZE='1', DATABASE_HEALTH_CHECKS='1')
+        wrapper.ensure_connection()
+        raw = wrapper.connection
+        wrapper.close()
+        raw.close()
+
+        wrapper.ensure_connection()
+        self.assertIsNot(raw, wrapper.connection)
+        with wrapper.cursor() as cursor:
+            cursor.execute('SELECT 1')
+
+    def test_health_checks(self):
+        """A kept connection is checked once a request, before its first query"""
+        wrapper = self.wrapper('kept', DATABASE_HEALTH_CHECKS='1')
+        wrapper.ensure_connection()
+        raw = wrapper.connection
+
+        with mock.patch.object(wrapper, 'raw_is_usable', return_value=True) as checked:
+            # A request: Django calls this when it starts and ends
+            wrapper.close_if_unusable_or_obsolete()
+            for _ in range(3):
+                with wrapper.cursor() as cursor:
+                    cursor.execute('SELECT 1')
+            wrapper.close_if_unusable_or_obsolete()
+        self.assertEqual(1, checked.call_count)
+        self.assertIs(raw, wrapper.connection)
+
+        raw.close()
+        with wrapper.cursor() as cursor:
+            cursor.execute('SELECT 1')
+        self.assertIsNot(raw, wrapper.connection)
+
+    def test_pool_size(self):
+        """No more than SIZE connections are handed out at once"""
+        pool = ConnectionPool(1, timeout=0.01)
+        raw = pool.checkout(lambda: sqlite3.connect(':memory:'))
+
+        with self.assertRaisesMessage(OperationalError, 'All 1 pooled database connections'):
+            pool.checkout(lambda: sqlite3.connect(':memory:'))
+
+        released = threading.Timer(0.05, pool.checkin, [raw])
+        released.start()
+        pool.timeout = 5
+        self.assertIs(raw, pool.checkout(lambda: sqlite3.connect(':memory:')))
+        released.join()
+
+
+@mock.patch.dict(connections.settings, {'read': connections.settings['default']})
+class ReadDatabaseRoutingTests(SimpleTestCase):
+
+    def routed(self, method, response=None):
+        """The database an Event query goes to while the view runs"""
+        used = []
+
+        def view(request):
+            used.append(router.db_for_read(Event))
+            return response or HttpResponse()
+
+        ReadDatabaseMiddleware(view)(getattr(RequestFactory(), method)('/events'))
+        return used[0]
+
+    def test_get_requests_read_from_read_database(self):
+        self.assertEqual('read', self.routed('get'))
+        self.assertEqual('read', self.routed('head'))
+        self.assertEqual('default', router.db_for_read(Event))
+
+    def test_writing_requests_stay_on_default(self):
+        self.assertEqual('default', self.routed('post'))
+        self.assertEqual('default', self.routed('delete'))
+        self.assertEqual('default', router.db_for_write(Event))
+
+    async def test_async_requests(self):
+        """Under ASGI the middleware runs async, without a thread of its own"""
+        async def view(request):
+            return HttpResponse(router.db_for_read(Event))
+
+        middleware = ReadDatabaseMiddleware(view)
+        self.assertTrue(asyncio.iscoroutinefunction(middleware))
+        response = await middleware(RequestFactory().get('/events'))
+        self.assertEqual(b'read', response.content)
+        response = await middleware(RequestFactory().post('/events'))
+        self.assertEqual(b'default', response.content)
+
+    def test_streamed_responses(self):
+        """Streamed reports keep reading from the read database"""
+        def chunks():
+            yield router.db_for_read(Event).encode()
+
+        response = StreamingHttpResponse(chunks())
+        self.routed('get', response)
+        self.assertEqual(b'read', b''.join(response.streaming_content))
+
+    def test_nothing_migrates_the_read_database(self):
+        self.assertFalse(router.allow_migrate('read', 'levelupapi'))
+        self.assertTrue(router.allow_migrate('default', 'levelupapi'))
@@ -1,7 +1,9 @@
 from rest_framework import status
 from rest_framework.test import APITestCase
 from rest_framework.authtoken.models import Token
-from levelupapi.models import Game, Gamer
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from levelupapi.models import Event, Game, Gamer
 from levelupapi.views.EventView import CreateEventSerializer, EventSerializer
 
 class EventTests(APITestCase):
@@ -46,4 +48,32 @@ class EventTests(APITestCase):
         expected = CreateGameSerializer(new_game)
 
         # Now we can test that the expected ouput matches what was actually returned
-        self.assertEqual(expected.data, response.data)
\ No newline at end of file
+        self.assertEqual(expected.data, response.data)
+
+    def test_list_events_joined(self):
+        """Test list events sets joined for the current gamer"""
+        event = Event.objects.first()
+        event.attendees.add(self.gamer)
+
+        response = self.client.get('/events')
+
+        self.assertEqual(status.HTTP_200_OK, response.status_code)
+        joined = {e['id']: e['joined'] for e in response.data}
+        self.assertTrue(joined[event.id])
+        self.assertEqual(1, sum(joined.values()))
+
+    def test_list_events_joined_query_count(self):
+        """The joined check should be part of the list query, not one query per event"""
+        game = Game.objects.first()
+        Event.objects.bulk_create([
+            Event(game=game, description=f'Event {i}', organizer=self.gamer)
+            for i in range(20)
+        ])
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(f'/events?game={game.id}')
+
+        self.assertEqual(status.HTTP_200_OK, response.status_code)
+        self.assertEqual(21, len(response.data))
+        joined_queries = [q for q in queries.captured_queries if 'EXISTS' in q['sql']]
+        self.assertEqual(1, len(joined_queries))
@@ -0,0 +1,68 @@
+import csv
+import gzip
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.core.management import call_command
+from rest_framework.test import APITestCase
+from levelupapi.models import Event, EventGamer, Game, Gamer, GameType
+
+
+class ExportCommandTests(APITestCase):
+
+    # Add any fixtures you want to run to build the test database
+    fixtures = ['users', 'tokens', 'gamers', 'game_types', 'games', 'events']
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        event = Event.objects.first()
+        event.attendees.add(Gamer.objects.first())
+
+    def run_export(self, *args):
+        out = StringIO()
+        call_command('export_levelup', self.directory.name, *args, stdout=out)
+        return out.getvalue()
+
+    def path(self, name):
+        return os.path.join(self.directory.name, name)
+
+    def test_export_ndjson(self):
+        """Every table is written as one JSON object per line, in id order"""
+        out = self.run_export('--chunk-size', '2')
+
+        for name, model in [('gametypes', GameType), ('gamers', Gamer), ('games', Game),
+                            ('events', Event), ('eventgamers', EventGamer)]:
+            with self.subTest(name=name):
+                self.assertIn(f'Exported {model.objects.count()} {name}', out)
+                with open(self.path(f'{name}.ndjson'), encoding='utf-8') as file:
+                    rows = [json.loads(line) for line in file]
+                self.assertEqual(list(model.objects.order_by('id').values_list('id', flat=True)),
+                                 [row['id'] for row in rows])
+
+        with open(self.path('events.ndjson'), encoding='utf-8') as file:
+            event = json.loads(file.readline())
+        first = Event.objects.order_by('id').first()
+        self.assertEqual({
+            'id': first.id, 'game': first.game_id, 'description': first.description,
+            'date': first.date.isoformat(), 'time': first.time.isoformat(),
+            'organizer': first.organizer_id,
+        }, event)
+
+    def test_export_gzipped_csv_round_trips(self):
+        """Exported games can be imported again"""
+        self.run_export('--only', 'games', '--format', 'csv', '--gzip')
+
+        self.assertEqual(['games.csv.gz'], os.listdir(self.directory.name))
+        with gzip.open(self.path('games.csv.gz'), 'rt', encoding='utf-8') as file:
+            rows = list(csv.DictReader(file))
+        self.assertEqual(Game.objects.count(), len(rows))
+
+        games = list(Game.objects.order_by('id').values(
+            'title', 'maker', 'number_of_players', 'skill_level', 'game_type', 'gamer'))
+        Game.objects.all().delete()
+        call_command('import_levelup', 'games', self.path('games.csv.gz'), stdout=StringIO())
+        self.assertEqual(games, list(Game.objects.order_by('id').values(
+            'title', 'maker', 'number_of_players', 'skill_level', 'game_type', 'gamer')))
@@ -0,0 +1,60 @@
+import datetime
+import json
+from decimal import Decimal
+from unittest import mock
+
+from rest_framework import status
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APITestCase
+from rest_framework.authtoken.models import Token
+from levelupapi.fastjson import FastJSONRenderer
+from levelupapi.models import Event, Gamer
+
+
+class FastJSONTests(APITestCase):
+
+    # Add any fixtures you want to run to build the test database
+    fixtures = ['users', 'tokens', 'gamers', 'game_types', 'games', 'events']
+
+    def setUp(self):
+        # Grab the first Gamer object from the database and add their token to the headers
+        self.gamer = Gamer.objects.first()
+        token = Token.objects.get(user=self.gamer.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+
+    def test_event_dates_and_times(self):
+        """Event dates and times come out as the same ISO 8601 strings as before"""
+        event = Event.objects.get(pk=1)
+        response = self.client.get('/events/1?fields=id,date,time')
+
+        self.assertIsInstance(response.accepted_renderer, FastJSONRenderer)
+        self.assertEqual(
+            {'id': 1, 'date': event.date.isoformat(), 'time': event.time.isoformat()},
+            json.loads(response.content))
+
+    def test_same_output_as_drf(self):
+        """orjson and the standard renderer write the same JSON"""
+        data = {
+            'text': 'Pokémon "night"', 'number': 1.5, 'price': Decimal('2.50'),
+            'date': datetime.date(2022, 5, 1), 'time': datetime.time(15, 30),
+            'utc': datetime.datetime(2022, 5, 1, 15, 30, tzinfo=datetime.timezone.utc),
+            'nested': [{'id': 1}, None, True],
+        }
+        expected = JSONRenderer().render(data)
+
+        self.assertEqual(json.loads(expected), json.loads(FastJSONRenderer().render(data)))
+        with mock.patch('levelupapi.fastjson.orjson', None):
+            self.assertEqual(expected, FastJSONRenderer().render(data))
+
+    def test_parser(self):
+        """Request bodies are parsed, and bad JSON is a 400"""
+        response = self.client.post('/games', data=json.dumps({
+            "title": "Pokémon", "maker": "Nintendo", "skill_level": 2,
+            "number_of_players": 2, "game_type": 1,
+        }), content_type='application/json')
+        self.assertEqual(status.HTTP_201_CREATED, response.status_code)
+        self.assertEqual('Pokémon', response.data['title'])
+
+        response = self.client.post('/games', data='{"title": ', content_type='application/json')
+        self.assertEqual(status.HTTP_400_BAD_REQUEST, response.status_code)
+        self.assertIn('JSON parse error', response.data['detail'])
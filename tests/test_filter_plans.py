@@ -0,0 +1,57 @@
+from django.http import QueryDict
+from rest_framework.test import APITestCase
+from levelupapi.views.EventView import EventView
+from levelupapi.views.GameView import GameView
+from levelupapi.views.filters import filter_events, filter_games
+
+# Every supported filter and ordering, with the index it has to use
+GAME_PLANS = {
+    'type=1': 'game_game_type_id_idx',
+    'players=4': 'game_players_idx',
+    'skill_level_min=2&skill_level_max=4': 'game_skill_level_idx',
+    'maker=Hasbro': 'game_maker_idx',
+    'search=Cl': 'game_title_lower_idx',
+    'ordering=skill_level': 'game_skill_level_idx',
+    'ordering=-number_of_players': 'game_players_idx',
+}
+EVENT_PLANS = {
+    'game=1': 'event_game_id_idx',
+    'organizer=1': 'organizer_id',
+    'date_after=2022-05-01&date_before=2022-06-01': 'event_date_idx',
+    'search=Fun': 'event_description_lower_idx',
+    'ordering=-date': 'event_date_idx',
+}
+
+
+class FilterPlanTests(APITestCase):
+
+    # Add any fixtures you want to run to build the test database
+    fixtures = ['users', 'tokens', 'gamers', 'game_types', 'games', 'events']
+
+    def assertUsesIndex(self, queryset, table, index):
+        plan = queryset.explain()
+        lines = [line for line in plan.splitlines() if f' {table} ' in f'{line} ']
+        self.assertTrue(lines, plan)
+        self.assertIn('USING', lines[0], plan)
+        self.assertIn(index, lines[0], plan)
+
+    def plan_queryset(self, view, filter_rows, query):
+        params = QueryDict(query)
+        queryset = filter_rows(view.get_queryset(), params)
+        if 'ordering' in params:
+            queryset = queryset.order_by(params['ordering'], 'id')
+        return queryset
+
+    def test_game_filters_use_indexes(self):
+        """Every /games filter and ordering is answered from an index"""
+        for query, index in GAME_PLANS.items():
+            with self.subTest(query=query):
+                queryset = self.plan_queryset(GameView(), filter_games, query)
+                self.assertUsesIndex(queryset, 'levelupapi_game', index)
+
+    def test_event_filters_use_indexes(self):
+        """Every /events filter and ordering is answered from an index"""
+        for query, index in EVENT_PLANS.items():
+            with self.subTest(query=query):
+                queryset = self.plan_queryset(EventView(), filter_events, query)
+                self.assertUsesIndex(queryset, 'levelupapi_event', index)
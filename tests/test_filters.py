@@ -0,0 +1,100 @@
+from rest_framework import status
+from rest_framework.test import APITestCase
+from rest_framework.authtoken.models import Token
+from levelupapi.models import Game, Gamer
+
+
+class FilterTests(APITestCase):
+
+    # Add any fixtures you want to run to build the test database
+    fixtures = ['users', 'tokens', 'gamers', 'game_types', 'games', 'events']
+
+    def setUp(self):
+        # Grab the first Gamer object from the database and add their token to the headers
+        self.gamer = Gamer.objects.first()
+        token = Token.objects.get(user=self.gamer.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+        Game.objects.create(game_type_id=1, title='Clue', maker='Hasbro', gamer=self.gamer,
+                            number_of_players=6, skill_level=4)
+
+    def titles(self, url):
+        response = self.client.get(url)
+        self.assertEqual(status.HTTP_200_OK, response.status_code, response.data)
+        results = response.data['results'] if 'results' in response.data else response.data
+        return [game['title'] for game in results]
+
+    def test_game_filters(self):
+        """Games filter by players, skill level range, maker and title prefix"""
+        self.assertEqual(['Clue'], self.titles('/games?players=6'))
+        self.assertEqual(['Monopoly', 'Charades'], self.titles('/games?skill_level_max=3'))
+        self.assertEqual(['Clue'], self.titles('/games?skill_level_min=3&skill_level_max=4'))
+        self.assertEqual(['Charades'], self.titles('/games?maker=My Brain'))
+        self.assertEqual(['Charades', 'Clue'], self.titles('/games?search=c'))
+        self.assertEqual(['Clue'], self.titles('/games?search=CLU&type=1'))
+
+    def test_non_ascii_search(self):
+        """Searches lower case the way the database does"""
+        Game.objects.create(game_type_id=1, title='Élan', maker='Hasbro', gamer=self.gamer,
+                            number_of_players=2, skill_level=1)
+        self.assertEqual(['Élan'], self.titles('/games?search=Élan'))
+        self.assertEqual(['Élan'], self.titles('/games?search=ÉLAN'))
+
+    def test_game_ordering(self):
+        """Games can be ordered, and paged through in that order"""
+        self.assertEqual(['Clue', 'Monopoly', 'Charades'],
+                         self.titles('/games?ordering=-number_of_players'))
+        self.assertEqual(['Monopoly', 'Charades'],
+                         self.titles('/games?ordering=skill_level&page_size=2'))
+
+        response = self.client.get('/games?ordering=skill_level&page_size=2')
+        self.assertEqual(['Clue'], self.titles(response.data['next']))
+
+    def test_ordering_with_many_ties(self):
+        """Pages stay whole past the first thousand games sharing a value"""
+        Game.objects.bulk_create([
+            Game(game_type_id=1, title=f'Game {i}', maker='Maker', gamer=self.gamer,
+                 number_of_players=4, skill_level=7)
+            for i in range(1500)
+        ])
+        expected = list(Game.objects.order_by('-skill_level', 'id').values_list('id', flat=True))
+
+        url, pages, ids = '/games?ordering=-skill_level&page_size=100', [], []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(status.HTTP_200_OK, response.status_code)
+            pages.append(response.data)
+            ids.extend(game['id'] for game in response.data['results'])
+            url = response.data['next']
+        self.assertEqual(expected, ids)
+
+        # and back again
+        response = self.client.get(pages[-1]['previous'])
+        self.assertEqual(pages[-2]['results'], response.data['results'])
+        self.assertEqual(pages[-1]['results'][:1],
+                         self.client.get(response.data['next']).data['results'][:1])
+
+    def test_event_filters(self):
+        """Events filter by organizer, date range and description prefix"""
+        def descriptions(url):
+            response = self.client.get(url)
+            self.assertEqual(status.HTTP_200_OK, response.status_code, response.data)
+            return [event['description'] for event in response.data]
+
+        self.assertEqual(2, len(descriptions(f'/events?organizer={self.gamer.id}')))
+        self.assertEqual([], descriptions('/events?organizer=2'))
+        self.assertEqual(["Let's play a game of charades!"],
+                         descriptions('/events?date_before=2022-05-01'))
+        self.assertEqual(["Let's play some classic Monopoly"],
+                         descriptions('/events?date_after=2022-05-02&date_before=2022-05-31'))
+        self.assertEqual(["Let's play some classic Monopoly", "Let's play a game of charades!"],
+                         descriptions("/events?search=let's play&ordering=-date"))
+
+    def test_bad_parameters(self):
+        """Values that can't be filtered on are a 400"""
+        for url, name in [('/games?players=many', 'players'),
+                          ('/games?ordering=title', 'ordering'),
+                          ('/events?date_after=yesterday', 'date_after')]:
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertEqual(status.HTTP_400_BAD_REQUEST, response.status_code)
+                self.assertIn(name, response.data)
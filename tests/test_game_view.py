@@ -117,4 +117,25 @@ class GameTests(APITestCase):
         # Test that it was deleted by trying to _get_ the game
         # The response should return a 404
         response = self.client.get(url)
-        self.assertEqual(status.HTTP_404_NOT_FOUND, response.status_code)
\ No newline at end of file
+        self.assertEqual(status.HTTP_404_NOT_FOUND, response.status_code)
+
+    def test_list_games_paginated(self):
+        """Test walking the games list one page at a time"""
+        game = Game.objects.first()
+        Game.objects.bulk_create([
+            Game(game_type=game.game_type, title=f'Game {i}', maker='Maker',
+                 gamer=self.gamer, number_of_players=4, skill_level=1)
+            for i in range(5)
+        ])
+
+        url = '/games?page_size=3'
+        ids = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(status.HTTP_200_OK, response.status_code)
+            self.assertLessEqual(len(response.data['results']), 3)
+            ids.extend(g['id'] for g in response.data['results'])
+            url = response.data['next']
+
+        # Every game shows up exactly once, in primary key order
+        self.assertEqual(list(Game.objects.order_by('id').values_list('id', flat=True)), ids)
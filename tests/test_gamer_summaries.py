@@ -0,0 +1,98 @@
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APITransactionTestCase
+from rest_framework.authtoken.models import Token
+from levelupapi.models import Event, Game, Gamer
+from levelupreports.models import GamerSummary
+
+
+class GamerSummaryTests(APITransactionTestCase):
+
+    # Add any fixtures you want to run to build the test database
+    fixtures = ['users', 'tokens', 'gamers', 'game_types', 'games', 'events']
+
+    def setUp(self):
+        # Grab the first Gamer object from the database and add their token to the headers
+        self.gamer = Gamer.objects.first()
+        token = Token.objects.get(user=self.gamer.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+
+    def assertSummary(self, games_owned, events_organized, events_attended):
+        summary = GamerSummary.objects.get(gamer=self.gamer)
+        self.assertEqual(
+            (games_owned, events_organized, events_attended),
+            (summary.games_owned, summary.events_organized, summary.events_attended)
+        )
+
+    def test_summary_follows_writes(self):
+        """Creating, joining, leaving and deleting keep the counts right"""
+        self.assertSummary(2, 2, 0)
+
+        response = self.client.post('/games', {
+            "title": "Clue",
+            "maker": "Milton Bradley",
+            "skill_level": 5,
+            "number_of_players": 6,
+            "game_type": 1,
+        }, format='json')
+        self.assertEqual(status.HTTP_201_CREATED, response.status_code)
+        self.assertSummary(3, 2, 0)
+
+        event = Event.objects.first()
+        self.client.post(f'/events/{event.id}/signup')
+        self.assertSummary(3, 2, 1)
+
+        self.client.delete(f'/events/{event.id}/leave')
+        self.assertSummary(3, 2, 0)
+
+        # Deleting a game takes its events with it
+        event.attendees.add(self.gamer)
+        self.client.delete(f'/games/{event.game_id}')
+        self.assertSummary(2, 1, 0)
+
+    def test_summary_follows_name_changes(self):
+        """The copied full name is updated with the user"""
+        user = self.gamer.user
+        user.first_name = 'Caroline'
+        user.save()
+
+        self.assertEqual('Caroline Belk', GamerSummary.objects.get(gamer=self.gamer).full_name)
+
+    def test_summary_follows_new_owner(self):
+        """A game changing hands is recounted for both gamers, without
+        looking up who had it before
+        """
+        other = Gamer.objects.create(user=User.objects.create_user(username='other'), bio='')
+        game = Game.objects.filter(gamer=self.gamer).first()
+        game.gamer = other
+
+        with CaptureQueriesContext(connection) as queries:
+            game.save()
+
+        self.assertFalse([q for q in queries.captured_queries if q['sql'].startswith('SELECT')])
+        self.assertSummary(1, 2, 0)
+        self.assertEqual(1, GamerSummary.objects.get(gamer=other).games_owned)
+
+    def test_rebuild_matches(self):
+        """A full rebuild agrees with the incrementally kept summaries"""
+        Game.objects.first().delete()
+        before = list(GamerSummary.objects.values())
+
+        call_command('rebuild_gamer_summaries', stdout=StringIO())
+
+        self.assertEqual(before, list(GamerSummary.objects.values()))
+
+    def test_summary_report(self):
+        """The report reads the summary table with a single query"""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/reports/gamersummaries')
+
+        self.assertEqual(status.HTTP_200_OK, response.status_code)
+        self.assertEqual(1, len(queries.captured_queries))
+        self.assertIn('levelupreports_gamersummary', queries.captured_queries[0]['sql'])
+        self.assertEqual(2, response.context['gamersummary_list'][0].games_owned)
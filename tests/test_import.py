@@ -0,0 +1,92 @@
+import gzip
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.core.cache import cache
+from rest_framework.test import APITransactionTestCase
+from levelupapi.models import Event, Game, Gamer
+from levelupreports.models import GamerSummary
+
+
+class ImportCommandTests(APITransactionTestCase):
+
+    # Add any fixtures you want to run to build the test database
+    fixtures = ['users', 'tokens', 'gamers', 'game_types', 'games', 'events']
+
+    def setUp(self):
+        self.gamer = Gamer.objects.first()
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def write(self, name, content):
+        path = os.path.join(self.directory.name, name)
+        opener = gzip.open if name.endswith('.gz') else open
+        with opener(path, 'wt', encoding='utf-8') as file:
+            file.write(content)
+        return path
+
+    def run_import(self, *args):
+        out, err = StringIO(), StringIO()
+        call_command('import_levelup', *args, stdout=out, stderr=err)
+        return out.getvalue(), err.getvalue()
+
+    def test_import_games_csv(self):
+        """Games import in batches, resolving game types and gamers by name"""
+        rows = ''.join(
+            f'Game {i},Maker,4,2,Board game,{self.gamer.user.username}\n' for i in range(7)
+        )
+        path = self.write('games.csv', 'title,maker,number_of_players,skill_level,'
+                                       'game_type_label,gamer_username\n' + rows)
+        before = Game.objects.count()
+
+        out, _ = self.run_import('games', path, '--batch-size', '3')
+
+        self.assertIn('Imported 7 games', out)
+        self.assertEqual(before + 7, Game.objects.count())
+        game = Game.objects.get(title='Game 6')
+        self.assertEqual((1, self.gamer.id), (game.game_type_id, game.gamer_id))
+        # Bulk inserts still reach the summaries
+        self.assertEqual(9, GamerSummary.objects.get(gamer=self.gamer).games_owned)
+
+    def test_import_events_ndjson_gzip(self):
+        """Gzipped NDJSON events import and bump the events table version"""
+        game = Game.objects.first()
+        version = cache.get('levelup:version:event')
+        path = self.write('events.ndjson.gz', '\n'.join(
+            json.dumps({'game': game.id, 'description': f'Night {i}', 'organizer': self.gamer.id})
+            for i in range(3)
+        ))
+
+        self.run_import('events', path)
+
+        self.assertEqual(3, Event.objects.filter(description__startswith='Night').count())
+        self.assertNotEqual(version, cache.get('levelup:version:event'))
+
+    def test_invalid_row_stops_import(self):
+        """A bad row stops the import and names its line"""
+        path = self.write('events.ndjson', '\n'.join([
+            json.dumps({'game': 1, 'description': 'Good', 'organizer': self.gamer.id}),
+            json.dumps({'game': 999, 'description': 'Bad', 'organizer': self.gamer.id}),
+        ]))
+
+        with self.assertRaisesMessage(CommandError, 'Line 2: no game 999'):
+            self.run_import('events', path, '--batch-size', '1')
+        self.assertTrue(Event.objects.filter(description='Good').exists())
+
+    def test_skip_invalid(self):
+        """With --skip-invalid bad rows are reported and the rest imported"""
+        path = self.write('games.csv', 'title,maker,number_of_players,skill_level,'
+                                       'game_type,gamer\n'
+                                       'Good,Maker,4,2,1,1\n'
+                                       'Bad,Maker,four,2,1,1\n'
+                                       'Nobody,Maker,4,2,1,999\n')
+
+        out, err = self.run_import('games', path, '--skip-invalid')
+
+        self.assertIn('Imported 1 games, skipped 2', out)
+        self.assertIn('Skipped line 3: number_of_players must be a whole number', err)
+        self.assertIn('Skipped line 4: no gamer 999', err)
@@ -0,0 +1,116 @@
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APITestCase
+from rest_framework.authtoken.models import Token
+from levelupapi.models import Event, EventGamer, Game, Gamer
+
+# The most queries each endpoint is allowed to run, no matter how many rows
+# it returns. If a change makes one of these tests fail, look for a relation
+# that is being loaded lazily inside the serializer before raising the number.
+QUERY_BUDGETS = {
+    '/games': 2,
+    '/games?page_size=10': 2,
+    '/games/{game}': 2,
+    '/events': 2,
+    '/events?page_size=10': 2,
+    '/events/{event}': 2,
+    '/events?fields=id,description,joined': 2,
+    '/events?expand=': 2,
+    '/events?expand=attendees': 3,
+    '/gametypes': 2,
+}
+
+# DELETE /games/<id>, whatever it takes with it
+CASCADING_DELETE_BUDGET = 13
+
+
+class QueryCountTests(APITestCase):
+
+    # Add any fixtures you want to run to build the test database
+    fixtures = ['users', 'tokens', 'gamers', 'game_types', 'games', 'events']
+
+    def setUp(self):
+        # Grab the first Gamer object from the database and add their token to the headers
+        self.gamer = Gamer.objects.first()
+        token = Token.objects.get(user=self.gamer.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+
+        # Add enough rows that a query per object would blow every budget
+        game = Game.objects.first()
+        Game.objects.bulk_create([
+            Game(game_type=game.game_type, title=f'Game {i}', maker='Maker',
+                 gamer=self.gamer, number_of_players=4, skill_level=1)
+            for i in range(25)
+        ])
+        Event.objects.bulk_create([
+            Event(game=game, description=f'Event {i}', organizer=self.gamer)
+            for i in range(25)
+        ])
+        # Attendee counts are recounted when the transaction commits
+        with self.captureOnCommitCallbacks(execute=True):
+            for event in Event.objects.all():
+                event.attendees.add(self.gamer)
+
+    def assertMaxQueries(self, url, budget):
+        """Request the url and fail if it ran more than budget queries"""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+
+        self.assertEqual(status.HTTP_200_OK, response.status_code)
+        self.assertLessEqual(
+            len(queries.captured_queries), budget,
+            f'{url} ran {len(queries.captured_queries)} queries:\n' +
+            '\n'.join(q['sql'] for q in queries.captured_queries)
+        )
+        return response
+
+    def test_query_budgets(self):
+        """Every endpoint stays within its query budget"""
+        ids = {
+            'game': Game.objects.first().id,
+            'event': Event.objects.first().id,
+        }
+        for url, budget in QUERY_BUDGETS.items():
+            with self.subTest(url=url):
+                self.assertMaxQueries(url.format(**ids), budget)
+
+    def test_event_list_nests_everything(self):
+        """The events list still embeds the game and organizer, and counts
+        the attendees without loading them
+        """
+        response = self.assertMaxQueries('/events', QUERY_BUDGETS['/events'])
+
+        self.assertEqual(Event.objects.count(), len(response.data))
+        for event in response.data:
+            self.assertIsInstance(event['game'], dict)
+            self.assertIsInstance(event['organizer'], dict)
+            self.assertEqual(1, event['attendee_count'])
+            self.assertNotIn('attendees', event)
+
+    def test_cascading_delete(self):
+        """Deleting a game takes a fixed number of queries however many
+        events and signups go with it, the recounts they need included
+        """
+        game = Game.objects.first()
+        gamers = [self.gamer] + [
+            Gamer.objects.create(user=User.objects.create_user(username=f'gamer{i}'), bio='')
+            for i in range(2)
+        ]
+        events = Event.objects.bulk_create([
+            Event(game=game, description=f'Event {i}', organizer=self.gamer) for i in range(51)
+        ])
+        EventGamer.objects.bulk_create([
+            EventGamer(event=event, gamer=gamer) for event in events for gamer in gamers
+        ])
+
+        with CaptureQueriesContext(connection) as queries, \
+                self.captureOnCommitCallbacks(execute=True):
+            response = self.client.delete(f'/games/{game.id}')
+
+        self.assertEqual(status.HTTP_204_NO_CONTENT, response.status_code)
+        self.assertLessEqual(
+            len(queries.captured_queries), CASCADING_DELETE_BUDGET,
+            '\n'.join(q['sql'] for q in queries.captured_queries))
+        self.assertFalse(Event.objects.filter(game=game).exists())
@@ -0,0 +1,143 @@
+import csv
+import io
+import json
+from pathlib import Path
+from unittest import mock
+
+from django.db import connections
+from django.test import TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from levelup.database import databases_from_env
+from levelupapi.models import Event, Game, Gamer
+from levelupreports.views.helpers import group_by_user, iter_group_by_user, row_type
+
+
+class ReportTests(TestCase):
+
+    # Add any fixtures you want to run to build the test database
+    fixtures = ['users', 'tokens', 'gamers', 'game_types', 'games', 'events']
+
+    def test_group_by_user(self):
+        """Rows are grouped per user, in the order users first appear"""
+        Row = row_type(('gamer_id', 'full_name', 'title'))
+        rows = [Row(2, 'B', 'One'), Row(1, 'A', 'Two'), Row(2, 'B', 'Three')]
+
+        grouped = group_by_user(rows, 'gamer_id', 'games')
+
+        self.assertEqual([
+            {'gamer_id': 2, 'full_name': 'B', 'games': [rows[0], rows[2]]},
+            {'gamer_id': 1, 'full_name': 'A', 'games': [rows[1]]},
+        ], grouped)
+
+    def test_user_games_report(self):
+        """Every game shows up under its gamer"""
+        response = self.client.get('/reports/usergames')
+
+        self.assertEqual(200, response.status_code)
+        users = response.context['usergame_list']
+        self.assertEqual([Gamer.objects.first().id], [u['gamer_id'] for u in users])
+        self.assertEqual(
+            sorted(Game.objects.values_list('title', flat=True)),
+            sorted(game.title for game in users[0]['games'])
+        )
+
+    def test_user_events_report(self):
+        """Every event shows up under its organizer"""
+        response = self.client.get('/reports/userevents')
+
+        self.assertEqual(200, response.status_code)
+        users = response.context['userevent_list']
+        self.assertEqual(1, len(users))
+        self.assertEqual(Event.objects.count(), len(users[0]['events']))
+
+    def test_streamed_reports_match(self):
+        """The streamed pages have the same content as the rendered ones"""
+        for url in ['/reports/usergames', '/reports/userevents']:
+            with self.subTest(url=url):
+                rendered = self.client.get(url)
+                streamed = self.client.get(f'{url}?stream=1')
+
+                self.assertTrue(streamed.streaming)
+                page = b''.join(streamed.streaming_content)
+                self.assertEqual(rendered.content.split(), page.split())
+
+    def test_iter_group_by_user(self):
+        """Ordered rows are grouped without looking ahead more than one user"""
+        Row = row_type(('gamer_id', 'full_name', 'title'))
+        rows = [Row(1, 'A', 'One'), Row(1, 'A', 'Two'), Row(2, 'B', 'Three')]
+
+        grouped = iter_group_by_user(iter(rows), 'gamer_id', 'games')
+
+        self.assertEqual({'gamer_id': 1, 'full_name': 'A', 'games': rows[:2]}, next(grouped))
+        self.assertEqual({'gamer_id': 2, 'full_name': 'B', 'games': rows[2:]}, next(grouped))
+
+    def test_report_formats(self):
+        """The games report can be downloaded as JSON, NDJSON and CSV"""
+        titles = sorted(Game.objects.values_list('title', flat=True))
+
+        response = self.client.get('/reports/usergames?format=json')
+        self.assertEqual('application/json; charset=utf-8', response['Content-Type'])
+        rows = json.loads(b''.join(response.streaming_content))
+        self.assertEqual(titles, sorted(row['title'] for row in rows))
+
+        response = self.client.get('/reports/usergames', HTTP_ACCEPT='application/x-ndjson')
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(titles, sorted(json.loads(line)['title'] for line in lines))
+
+        response = self.client.get('/reports/usergames?format=csv')
+        rows = list(csv.DictReader(io.StringIO(b''.join(response.streaming_content).decode())))
+        self.assertEqual(titles, sorted(row['title'] for row in rows))
+
+    def test_report_formats_empty(self):
+        """An empty report is still valid JSON and CSV"""
+        Event.objects.all().delete()
+
+        response = self.client.get('/reports/userevents?format=json')
+        self.assertEqual([], json.loads(b''.join(response.streaming_content)))
+
+        response = self.client.get('/reports/userevents?format=csv')
+        header = b''.join(response.streaming_content).decode().strip()
+        self.assertEqual('id,description,date,time,organizer_id,game_id,full_name,title', header)
+
+    def test_report_unknown_format(self):
+        """Asking for a format that doesn't exist is a bad request"""
+        response = self.client.get('/reports/userevents?format=xml')
+        self.assertEqual(400, response.status_code)
+
+
+class ReadDatabaseReportTests(TransactionTestCase):
+    """Reports with DATABASE_READ_CONNECTION=1
+
+    The rows are committed, not kept in TestCase's transaction, so the
+    read database's own connection sees them.
+    """
+
+    fixtures = ['users', 'tokens', 'gamers', 'game_types', 'games', 'events']
+
+    def setUp(self):
+        read = databases_from_env({
+            'DATABASE_NAME': connections['default'].settings_dict['NAME'],
+            'DATABASE_READ_CONNECTION': '1'}, Path())['read']
+        patcher = mock.patch.dict(connections.settings, {'read': read})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.close_read_database)
+
+    def close_read_database(self):
+        connections['read'].close()
+        del connections['read']
+
+    def test_reports_run_on_read_database(self):
+        """The raw report SQL is routed like the ORM's reads"""
+        for url in ['/reports/usergames', '/reports/userevents?stream=1',
+                    '/reports/gamersummaries?format=csv']:
+            with self.subTest(url=url), \
+                    CaptureQueriesContext(connections['default']) as default, \
+                    CaptureQueriesContext(connections['read']) as read:
+                response = self.client.get(url)
+                if response.streaming:
+                    b''.join(response.streaming_content)
+
+                self.assertEqual(200, response.status_code)
+                self.assertEqual(1, len(read))
+                self.assertEqual([], default.captured_queries)
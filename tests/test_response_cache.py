@@ -0,0 +1,95 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APITestCase
+from rest_framework.authtoken.models import Token
+from levelupapi.cache import get_cache
+from levelupapi.models import Game, Gamer, GameType
+
+
+class ResponseCacheTests(APITestCase):
+
+    # Add any fixtures you want to run to build the test database
+    fixtures = ['users', 'tokens', 'gamers', 'game_types', 'games', 'events']
+
+    def setUp(self):
+        get_cache().clear()
+        # Grab the first Gamer object from the database and add their token to the headers
+        self.gamer = Gamer.objects.first()
+        token = Token.objects.get(user=self.gamer.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+
+    def get_queries(self, url):
+        """The response to url, and the SQL it ran besides authentication"""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(status.HTTP_200_OK, response.status_code)
+        return response, [
+            q['sql'] for q in queries.captured_queries
+            if 'authtoken_token' not in q['sql']
+        ]
+
+    def test_cached_list(self):
+        """The second request for a list is answered without querying"""
+        first, queries = self.get_queries('/games')
+        self.assertEqual(1, len(queries))
+
+        second, queries = self.get_queries('/games')
+        self.assertEqual([], queries)
+        self.assertEqual(first.data, second.data)
+
+        # Different query parameters are a different response
+        filtered, queries = self.get_queries('/games?type=1')
+        self.assertEqual(1, len(queries))
+        self.assertEqual(Game.objects.filter(game_type_id=1).count(), len(filtered.data))
+
+    def test_writes_invalidate(self):
+        """Creating, updating and deleting through the API drop cached lists"""
+        self.client.get('/games')
+
+        self.client.post('/games', {
+            "title": "Clue",
+            "maker": "Milton Bradley",
+            "skill_level": 5,
+            "number_of_players": 6,
+            "game_type": 1,
+        }, format='json')
+        response, queries = self.get_queries('/games')
+        self.assertEqual(1, len(queries))
+        self.assertIn('Clue', [game['title'] for game in response.data])
+
+        game = Game.objects.get(title='Clue')
+        self.client.delete(f'/games/{game.id}')
+        response, queries = self.get_queries('/games')
+        self.assertNotIn('Clue', [game['title'] for game in response.data])
+
+    def test_nested_changes_invalidate(self):
+        """Renaming a game type drops the cached game types and games"""
+        self.client.get('/games')
+        self.client.get('/gametypes')
+
+        game_type = GameType.objects.first()
+        game_type.label = 'Tabletop'
+        game_type.save()
+
+        response, _ = self.get_queries('/gametypes')
+        self.assertIn('Tabletop', [t['label'] for t in response.data])
+        response, _ = self.get_queries('/games')
+        self.assertIn('Tabletop', [g['game_type']['label'] for g in response.data])
+
+    def test_cache_stats(self):
+        """Admins can see the hits and misses of every cached endpoint"""
+        self.client.get('/gametypes')
+        self.client.get('/gametypes')
+        self.client.get('/gametypes')
+
+        response = self.client.get('/cachestats')
+        self.assertEqual(status.HTTP_403_FORBIDDEN, response.status_code)
+
+        user = self.gamer.user
+        user.is_staff = True
+        user.save()
+        response = self.client.get('/cachestats')
+        self.assertEqual(status.HTTP_200_OK, response.status_code)
+        self.assertEqual({'hits': 2, 'misses': 1}, response.data['gametypes'])
+        self.assertEqual({'hits': 0, 'misses': 0}, response.data['games'])
@@ -0,0 +1,80 @@
+from unittest import mock
+
+from rest_framework import status
+from rest_framework.test import APITestCase
+from rest_framework.authtoken.models import Token
+from levelupapi.models import Event, Game, Gamer
+
+
+class SearchTests(APITestCase):
+
+    # Add any fixtures you want to run to build the test database
+    fixtures = ['users', 'tokens', 'gamers', 'game_types', 'games', 'events']
+
+    def setUp(self):
+        # Grab the first Gamer object from the database and add their token to the headers
+        self.gamer = Gamer.objects.first()
+        token = Token.objects.get(user=self.gamer.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+        Game.objects.create(game_type_id=1, title='Monopoly Junior', maker='Hasbro',
+                            gamer=self.gamer, number_of_players=4, skill_level=1)
+        Game.objects.create(game_type_id=1, title='Clue', maker='Monopoly Games Inc',
+                            gamer=self.gamer, number_of_players=6, skill_level=3)
+
+    def search(self, url):
+        response = self.client.get(url)
+        self.assertEqual(status.HTTP_200_OK, response.status_code, response.data)
+        return response
+
+    def titles(self, url):
+        return [game['title'] for game in self.search(url).data['results']]
+
+    def test_games_ranked(self):
+        """Title matches rank above maker matches, and the last word is a prefix"""
+        titles = self.titles('/games/search?q=monop')
+
+        self.assertEqual({'Monopoly', 'Monopoly Junior'}, set(titles[:2]))
+        self.assertEqual('Clue', titles[2])
+        self.assertEqual(['Monopoly Junior'], self.titles('/games/search?q=junior monopoly'))
+        self.assertEqual([], self.titles('/games/search?q="*'))
+
+    def test_index_follows_writes(self):
+        """Updates, bulk writes and deletes are searchable straight away"""
+        game = Game.objects.get(title='Clue')
+        game.title = 'Cluedo'
+        game.save()
+        Game.objects.filter(title='Charades').update(title='Pictionary')
+        Game.objects.bulk_create([
+            Game(game_type_id=1, title='Pictionary Air', maker='Mattel', gamer=self.gamer,
+                 number_of_players=4, skill_level=1),
+        ])
+        Game.objects.get(title='Monopoly Junior').delete()
+
+        self.assertEqual(['Cluedo'], self.titles('/games/search?q=cluedo'))
+        self.assertEqual(['Pictionary', 'Pictionary Air'], self.titles('/games/search?q=pict'))
+        self.assertEqual(['Monopoly', 'Cluedo'], self.titles('/games/search?q=monopoly'))
+
+    def test_paginated(self):
+        """Results come a page at a time with the total count"""
+        response = self.search('/games/search?q=monopoly&page_size=1&fields=id,title')
+
+        self.assertEqual(3, response.data['count'])
+        self.assertEqual(1, len(response.data['results']))
+        self.assertEqual({'id', 'title'}, set(response.data['results'][0]))
+        self.assertIsNotNone(response.data['next'])
+
+    def test_events(self):
+        """Events are searched by description"""
+        response = self.search('/events/search?q=classic')
+
+        self.assertEqual([Event.objects.get(description__contains='classic').id],
+                         [event['id'] for event in response.data['results']])
+        self.assertFalse(response.data['results'][0]['joined'])
+
+    def test_fallback(self):
+        """Databases without FTS5 match substrings instead"""
+        with mock.patch('levelupapi.search.use_fts', return_value=False):
+            self.assertEqual(['Monopoly', 'Monopoly Junior', 'Clue'],
+                             self.titles('/games/search?q=monop'))
+            response = self.search('/events/search?q=charades')
+        self.assertEqual(1, response.data['count'])
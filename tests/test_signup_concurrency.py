@@ -0,0 +1,103 @@
+import os
+import tempfile
+import threading
+from pathlib import Path
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connections
+from django.test import SimpleTestCase
+from levelup.database import database_from_env
+from levelupapi import signups
+from levelupapi.models import Event, EventGamer, Game, Gamer, GameType
+
+THREADS = 8
+
+
+class SignupConcurrencyTests(SimpleTestCase):
+    """Signups racing each other on a file backed SQLite database
+
+    The test database lives in memory, where connections share one cache
+    and don't wait for each other's locks, so these tests point default
+    at a file of their own. Only threads started after that connect to
+    it, which is why all the database work, setup included, runs in
+    threads.
+    """
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        database = database_from_env(
+            {'DATABASE_NAME': os.path.join(directory.name, 'db.sqlite3')}, Path())
+        patcher = mock.patch.dict(connections.settings, {'default': database})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.event_id, self.gamer_ids = self.in_thread(self.seed)
+
+    def in_thread(self, work):
+        return self.race(work, threads=1)[0]
+
+    def race(self, work, threads=THREADS):
+        """Run work in threads all at once, the result of each"""
+        start = threading.Barrier(threads)
+        results = [None] * threads
+        errors = []
+
+        def run(index):
+            try:
+                start.wait()
+                results[index] = work(index)
+            except Exception as ex:  # pylint: disable=broad-except
+                errors.append(ex)
+            finally:
+                connections.close_all()
+
+        workers = [threading.Thread(target=run, args=(i,)) for i in range(threads)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        if errors:
+            raise errors[0]
+        return results
+
+    def seed(self, _):
+        call_command('migrate', verbosity=0)
+        gamers = [
+            Gamer.objects.create(user=User.objects.create_user(username=f'gamer{i}'), bio='')
+            for i in range(THREADS)
+        ]
+        game = Game.objects.create(
+            game_type=GameType.objects.create(label='Board game'), title='Clue',
+            maker='Hasbro', gamer=gamers[0], number_of_players=3, skill_level=2)
+        event = Event.objects.create(game=game, description='Clue night', organizer=gamers[0])
+        return event.id, [gamer.id for gamer in gamers]
+
+    def attendees(self, _):
+        event = Event.objects.get(pk=self.event_id)
+        rows = EventGamer.objects.filter(event_id=self.event_id).count()
+        return event.attendee_count, rows
+
+    def test_same_gamer(self):
+        """Eight signups from one gamer sign them up once"""
+        results = self.race(lambda _: signups.signup(self.event_id, self.gamer_ids[0]))
+
+        self.assertEqual(1, results.count(signups.JOINED))
+        self.assertEqual(THREADS - 1, results.count(signups.ALREADY_JOINED))
+        self.assertEqual((1, 1), self.in_thread(self.attendees))
+
+        results = self.race(lambda _: signups.leave(self.event_id, self.gamer_ids[0]))
+
+        self.assertEqual(1, results.count(signups.LEFT))
+        self.assertEqual(THREADS - 1, results.count(signups.NOT_JOINED))
+        self.assertEqual((0, 0), self.in_thread(self.attendees))
+
+    def test_last_seats(self):
+        """Eight gamers going for three seats, three get them"""
+        results = self.race(lambda i: signups.signup(self.event_id, self.gamer_ids[i]))
+
+        self.assertEqual(3, results.count(signups.JOINED))
+        self.assertEqual(THREADS - 3, results.count(signups.FULL))
+        self.assertEqual((3, 3), self.in_thread(self.attendees))
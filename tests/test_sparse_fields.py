@@ -0,0 +1,96 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APITestCase
+from rest_framework.authtoken.models import Token
+from levelupapi.models import Event, Game, Gamer
+
+
+class SparseFieldsTests(APITestCase):
+
+    # Add any fixtures you want to run to build the test database
+    fixtures = ['users', 'tokens', 'gamers', 'game_types', 'games', 'events']
+
+    def setUp(self):
+        # Grab the first Gamer object from the database and add their token to the headers
+        self.gamer = Gamer.objects.first()
+        token = Token.objects.get(user=self.gamer.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+        # Attendee counts are recounted when the transaction commits
+        with self.captureOnCommitCallbacks(execute=True):
+            Event.objects.first().attendees.add(self.gamer)
+
+    def get(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(status.HTTP_200_OK, response.status_code, response.data)
+        # Leave out authentication, only the queries building the response matter here
+        sql = [q['sql'] for q in queries.captured_queries if 'authtoken' not in q['sql']]
+        return response, sql
+
+    def test_event_fields(self):
+        """?fields= trims the payload and the SELECT list, with no joins or prefetches"""
+        response, sql = self.get('/events?fields=id,description')
+
+        self.assertEqual(Event.objects.count(), len(response.data))
+        for event in response.data:
+            self.assertEqual({'id', 'description'}, set(event))
+        self.assertEqual(1, len(sql), sql)
+        self.assertNotIn('JOIN', sql[0])
+        self.assertNotIn('organizer_id', sql[0])
+
+    def test_event_expand(self):
+        """?expand= nests only the relations asked for, the rest are ids"""
+        response, sql = self.get('/events?expand=game')
+
+        event = next(e for e in response.data if e['id'] == Event.objects.first().id)
+        self.assertEqual(Event.objects.first().game.title, event['game']['title'])
+        self.assertEqual(self.gamer.id, event['organizer'])
+        self.assertEqual(1, event['attendee_count'])
+        self.assertIn('joined', event)
+        # The organizer id comes from the event row without loading the gamer
+        self.assertNotIn('"levelupapi_gamer"."bio"', ' '.join(sql))
+
+    def test_event_attendees(self):
+        """Attendees are only shown when they are asked for"""
+        event = Event.objects.first()
+        response, _ = self.get(f'/events/{event.id}')
+        self.assertNotIn('attendees', response.data)
+
+        response, _ = self.get(f'/events/{event.id}?expand=attendees')
+        self.assertEqual([self.gamer.id], [a['id'] for a in response.data['attendees']])
+        self.assertEqual(event.game_id, response.data['game'])
+
+    def test_event_detail(self):
+        """The detail endpoint takes the same parameters"""
+        event = Event.objects.first()
+        response, _ = self.get(f'/events/{event.id}?fields=id,game,attendees&expand=')
+
+        self.assertEqual({'id': event.id, 'game': event.game_id,
+                          'attendees': [self.gamer.id]}, response.data)
+
+    def test_game_and_game_type_fields(self):
+        """Games and game types can be trimmed too"""
+        response, sql = self.get('/games?fields=id,title,game_type&expand=game_type')
+        game = Game.objects.order_by('id').first()
+        self.assertEqual({'id': game.id, 'title': game.title, 'game_type': {
+            'id': game.game_type.id, 'label': game.game_type.label,
+        }}, response.data[0])
+        self.assertNotIn('"levelupapi_gamer"', sql[0])
+
+        response, _ = self.get('/gametypes?fields=label')
+        self.assertEqual({'label'}, set(response.data[0]))
+
+    def test_paginated(self):
+        """Trimmed fields work with keyset pagination"""
+        response, _ = self.get('/games?fields=id&page_size=1')
+        self.assertEqual([{'id': Game.objects.order_by('id').first().id}],
+                         response.data['results'])
+
+    def test_unknown_fields(self):
+        """Asking for fields a serializer doesn't have is a 400"""
+        response = self.client.get('/events?fields=id,secret&expand=description')
+
+        self.assertEqual(status.HTTP_400_BAD_REQUEST, response.status_code)
+        self.assertEqual(['Unknown fields: secret'], response.data['fields'])
+        self.assertEqual(['Cannot expand: description'], response.data['expand'])